@@ -0,0 +1,75 @@
+"""
+Micro-benchmark: description and owner-fallback checks on synthetic IT Role
+Services frames of 10k / 100k / 1M rows.
+
+Compares the old row-wise versions (a Python loop over meaningful_description()
+and DataFrame.apply(axis=1) over the owner columns) with the column masks in
+excel_checks, and asserts both give identical results. The description mask
+is itself a loop over meaningful_description() (pandas .str was slower), so
+only the owner fallback is expected to gain. Run from the repo
+root (row counts optional):
+
+    PYTHONPATH=src python benchmarks/bench_excel_checks.py [ROWS ...]
+"""
+from __future__ import annotations
+
+import random
+import sys
+import time
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from daisy.excel_checks import any_non_empty, meaningful_description, meaningful_description_mask
+
+OWNER_COLS = ["IT Role Owner", "cust_owner", "Application Owner"]
+DESCRIPTIONS = ["", "  ", "tbd", "n/a", "...", "short", "Role for SAP finance postings", "  padded description  ", None, 12345678]
+
+
+def _frame(n: int, seed: int = 11) -> pd.DataFrame:
+    rnd = random.Random(seed)
+    names = [f"ROLE_{i}" for i in range(n)]
+    desc = [rnd.choice(DESCRIPTIONS) for _ in range(n)]
+    for i in range(0, n, 17):
+        desc[i] = f" {names[i].lower()} "  # same as the display name
+    owners = {c: [rnd.choice(["", " ", None, "jdoe"]) for _ in range(n)] for c in OWNER_COLS}
+    return pd.DataFrame({"Display name": names, "Description": desc, **owners})
+
+
+def _desc_rowwise(df: pd.DataFrame) -> pd.Series:
+    ok = []
+    for dn, desc in zip(df["Display name"].fillna(""), df["Description"].fillna("")):
+        ok.append(meaningful_description(str(desc), str(dn)))
+    return pd.Series(ok, index=df.index)
+
+
+def _owner_rowwise(df: pd.DataFrame) -> pd.Series:
+    return df[OWNER_COLS].fillna("").astype(str).apply(lambda r: any(v.strip() for v in r), axis=1)
+
+
+def _time(fn, *args) -> tuple:
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main() -> None:
+    sizes: List[int] = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    print(f"{'rows':>9}  {'check':<12} {'row-wise':>10} {'vectorized':>11} {'speedup':>8}")
+    for n in sizes:
+        df = _frame(n)
+        old_d, t_old_d = _time(_desc_rowwise, df)
+        new_d, t_new_d = _time(meaningful_description_mask, df["Display name"], df["Description"])
+        assert np.array_equal(old_d.to_numpy(dtype=bool), new_d.to_numpy(dtype=bool)), "description masks differ"
+
+        old_o, t_old_o = _time(_owner_rowwise, df)
+        new_o, t_new_o = _time(any_non_empty, df, OWNER_COLS)
+        assert np.array_equal(old_o.to_numpy(dtype=bool), new_o.to_numpy(dtype=bool)), "owner masks differ"
+
+        print(f"{n:>9}  {'description':<12} {t_old_d:>9.3f}s {t_new_d:>10.3f}s {t_old_d / max(t_new_d, 1e-9):>7.1f}x")
+        print(f"{n:>9}  {'owner':<12} {t_old_o:>9.3f}s {t_new_o:>10.3f}s {t_old_o / max(t_new_o, 1e-9):>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
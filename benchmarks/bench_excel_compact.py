@@ -0,0 +1,114 @@
+"""
+Benchmark: default vs compact (--excel-compact) column load of a synthetic
+"Entitlement Services.xlsx" export (ROWS x 20 columns) plus the configured
+Entitlement Services checks on the loaded frame.
+
+Each mode runs in a fresh interpreter, so neither inherits the other's heap.
+It reports load and check time, process peak RSS (high-water mark reset
+after start-up, Linux) and the frame's own size, and asserts both modes give
+the same findings. Run from the repo root (row count optional, default
+500,000):
+
+    PYTHONPATH=src python benchmarks/bench_excel_compact.py [ROWS]
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+WIDTH = 20
+COLUMNS = ["Display name", "Description", "SoD Area", "Tier Level", "Functional Area", "Entitlement Owner"]
+EXPORT = "Entitlement Services.xlsx"
+
+
+def _write_export(p: Path, rows: int) -> None:
+    from openpyxl import Workbook  # type: ignore
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    extra = [f"Attribute {k}" for k in range(WIDTH - len(COLUMNS))]
+    ws.append(COLUMNS + extra)
+    for i in range(rows):
+        ws.append(
+            [
+                f"ENT_{i:07d}",
+                "tbd" if i % 101 == 0 else f"Grants access to resource group {i % 997}",
+                f"SOD{i % 13}" if i % 37 else None,
+                i % 4,
+                f"FA{i % 7}",
+                f"owner{i % 250}@example.com",
+            ]
+            + [f"value {i % 11}-{k}" for k in range(len(extra))]
+        )
+    wb.save(p)
+
+
+def _child(path: str, compact: bool) -> None:
+    from daisy.excel_checks import evaluate_check_plan, read_excel_columns
+    from daisy.rules import load_rules
+    from daisy.workbook_cache import peak_rss_bytes, reset_peak_rss
+
+    plan = load_rules(None).excel_checks[EXPORT]
+    columns = list(dict.fromkeys(plan.columns + ["Functional Area", "Entitlement Owner"]))
+    exact = reset_peak_rss()
+    t0 = time.perf_counter()
+    df = read_excel_columns(Path(path), columns, compact=compact)
+    t_load = time.perf_counter() - t0
+    findings = evaluate_check_plan(plan, df)
+    t_checks = time.perf_counter() - t0 - t_load
+    peak = peak_rss_bytes() or 0
+    print(
+        json.dumps(
+            {
+                "load_sec": t_load,
+                "checks_sec": t_checks,
+                "peak_rss_mb": peak / (1 << 20),
+                "peak_rss_exact": exact,
+                "frame_mb": df.memory_usage(deep=True).sum() / (1 << 20),
+                "dtypes": {c: str(t) for c, t in df.dtypes.items()},
+                "findings": {k: [f.failing_rows, str(f.sample_rows)] for k, f in findings.items()},
+            }
+        )
+    )
+
+
+def _run(path: Path, compact: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", str(path), "1" if compact else "0"],
+        check=True,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    with tempfile.TemporaryDirectory() as td:
+        p = Path(td) / EXPORT
+        _write_export(p, rows)
+        size_mb = p.stat().st_size / (1 << 20)
+        default = _run(p, compact=False)
+        compact = _run(p, compact=True)
+
+    assert default["findings"] == compact["findings"], "findings differ"
+    print(f"rows={rows} cols={WIDTH} loaded={len(COLUMNS)} file={size_mb:.1f} MB")
+    for name, r in (("default", default), ("compact", compact)):
+        print(
+            f"{name:<8}: load {r['load_sec']:7.2f} s  checks {r['checks_sec']:6.2f} s  "
+            f"peak RSS {r['peak_rss_mb']:8.1f} MB  frame {r['frame_mb']:7.1f} MB"
+        )
+    print("compact dtypes:", ", ".join(f"{c}={t}" for c, t in compact["dtypes"].items()))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3] == "1")
+    else:
+        main()
@@ -0,0 +1,76 @@
+"""
+Micro-benchmark: multi-label page scan (find_pages_containing_any) on a
+synthetic 200-page DAC text, for 10 / 50 / 200 / 1,000 labels.
+
+Compares the per-needle C substring search find_pages_containing_any uses
+with one compiled alternation regex per page (re.finditer with a lookahead,
+so overlapping labels are all reported), and asserts both find the same
+pages. Python's re tries the alternatives one after another at every
+position, so neither stays flat as labels are added; the substring search
+is the faster of the two at every size. Run from the repo root:
+
+    PYTHONPATH=src python benchmarks/bench_needle_scan.py
+"""
+from __future__ import annotations
+
+import random
+import re
+import time
+from typing import Dict, List
+
+from daisy.pdf_reader import PageText, find_pages_containing_any
+
+PAGES = 200
+LABEL_COUNTS = (10, 50, 200, 1000)
+
+
+class _Doc:
+    def __init__(self, pages: List[str]):
+        self._pages = [PageText.from_text(t) for t in pages]
+
+    def page_count(self) -> int:
+        return len(self._pages)
+
+    def page(self, i: int) -> PageText:
+        return self._pages[i]
+
+
+def _words(rnd: random.Random, n: int) -> List[str]:
+    return ["".join(rnd.choice("abcdefghijklmnop") for _ in range(rnd.randint(3, 9))) for _ in range(n)]
+
+
+def _regex_scan(doc: _Doc, needles: List[str]) -> Dict[str, List[int]]:
+    keys = [n.lower() for n in needles]
+    rx = re.compile("(?=(" + "|".join(re.escape(k) for k in sorted(set(keys), key=len, reverse=True)) + "))")
+    # A label found at a position also reports the labels that are its prefixes
+    prefixes = {k: [p for p in set(keys) if k.startswith(p)] for k in set(keys)}
+    res: Dict[str, List[int]] = {n: [] for n in needles}
+    for i in range(doc.page_count()):
+        found = set()
+        for m in rx.finditer(doc.page(i).lower):
+            found.update(prefixes[m.group(1)])
+        for n, k in zip(needles, keys):
+            if k in found:
+                res[n].append(i)
+    return res
+
+
+def main() -> None:
+    rnd = random.Random(7)
+    vocab = _words(rnd, 3000)
+    doc = _Doc(["\n".join(" ".join(rnd.choice(vocab) for _ in range(12)) for _ in range(50)) for _ in range(PAGES)])
+    print(f"pages={PAGES} chars={sum(len(doc.page(i).text) for i in range(PAGES)):,}")
+    print(f"{'labels':>8}  {'substring':>10}  {'regex':>10}")
+    for k in LABEL_COUNTS:
+        needles = list(dict.fromkeys(" ".join(rnd.sample(vocab, 2)) for _ in range(k)))
+        t0 = time.perf_counter()
+        got = find_pages_containing_any(doc, needles, True)
+        t1 = time.perf_counter()
+        want = _regex_scan(doc, needles)
+        t2 = time.perf_counter()
+        assert got == want, "scans differ"
+        print(f"{len(needles):>8}  {t1 - t0:>9.4f}s  {t2 - t1:>9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
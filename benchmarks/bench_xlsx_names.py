@@ -0,0 +1,72 @@
+"""
+Micro-benchmark: referenced-XLSX filename scan on a synthetic 2,000-page DAC text.
+
+Compares the old whole-text regex passes (XLSX_ANY_RE) with the streaming
+XlsxNameScanner. Run from the repo root:
+
+    PYTHONPATH=src python benchmarks/bench_xlsx_names.py
+"""
+from __future__ import annotations
+
+import random
+import re
+import time
+from pathlib import Path
+from typing import List
+
+from daisy.pdf_reader import XLSX_ANY_RE, XLSX_IN_QUOTES_RE, scan_referenced_xlsx_filenames
+
+PAGES = 2000
+WORDS = ["the", "entitlement", "access", "review", "role", "owner", "asset", "data", "export", "service", "A1", "v2.0"]
+
+
+def _synthetic_pages(n: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    pages: List[str] = []
+    for i in range(n):
+        lines = []
+        for _ in range(40):
+            lines.append(" ".join(rnd.choice(WORDS) for _ in range(10)))
+        if i % 50 == 0:
+            lines.append(f'See ("APP_{i}_Entitlement Services.xlsx") and APP_{i}_All')
+            lines.append("Entitlements.xlsx for details.")
+        pages.append("\n".join(lines))
+    # a filename wrapped across a page break
+    pages[10] += "\nAPP_wrapped_IT Role"
+    pages[11] = "Services.xlsx\n" + pages[11]
+    return pages
+
+
+def _regex_passes(text: str) -> List[str]:
+    text = re.sub(r"\s+", " ", text)
+    out: List[str] = []
+    seen = set()
+    for rx in (XLSX_IN_QUOTES_RE, XLSX_ANY_RE):
+        for m in rx.finditer(text):
+            name = re.sub(r"\s+", " ", Path(m.group(1)).name).strip()
+            if name.lower().endswith(".xlsx") and name.lower() not in seen:
+                seen.add(name.lower())
+                out.append(name)
+    return out
+
+
+def main() -> None:
+    pages = _synthetic_pages(PAGES)
+    chars = sum(len(p) for p in pages)
+
+    t0 = time.perf_counter()
+    old = _regex_passes("\n".join(pages))
+    t_old = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    new = scan_referenced_xlsx_filenames(pages)
+    t_new = time.perf_counter() - t0
+
+    assert new == old, "scanner output differs from regex passes"
+    print(f"pages={PAGES} chars={chars} names={len(new)}")
+    print(f"regex passes : {t_old * 1000:8.1f} ms")
+    print(f"stream scan  : {t_new * 1000:8.1f} ms  ({t_old / max(t_new, 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: full first-sheet load vs column-projected streaming load on a
+synthetic wide "All Entitlements.xlsx" export (ROWS x 60 columns).
+
+Reports parse time and process peak RSS (high-water mark reset before each
+load, Linux) of both loaders and checks that the projected frame equals the
+same columns of the full one. Run from the repo root (row count optional,
+default 10,000):
+
+    PYTHONPATH=src python benchmarks/bench_xlsx_projection.py [ROWS]
+"""
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Tuple
+
+import pandas as pd
+
+from daisy.excel_checks import read_excel_columns, read_excel_first_sheet
+from daisy.workbook_cache import peak_rss_bytes, reset_peak_rss
+
+WIDTH = 60
+COLUMNS = ["Display name", "Description", "SoD Area", "Tier Level", "Functional Area", "DBG Functional Area"]
+
+
+def _write_export(p: Path, rows: int) -> None:
+    from openpyxl import Workbook  # type: ignore
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    extra = [f"Attribute {k}" for k in range(WIDTH - len(COLUMNS))]
+    ws.append(COLUMNS + extra)
+    for i in range(rows):
+        ws.append(
+            [f"ENT_{i:07d}", f"Grants access to resource group {i % 997}", f"SOD{i % 13}", i % 4, f"FA{i % 7}", ""]
+            + [f"value {i % 101}-{k}" for k in range(len(extra))]
+        )
+    wb.save(p)
+
+
+def _measure(fn: Callable[[], pd.DataFrame]) -> Tuple[pd.DataFrame, float, float]:
+    reset_peak_rss()
+    t0 = time.perf_counter()
+    df = fn()
+    sec = time.perf_counter() - t0
+    return df, sec, (peak_rss_bytes() or 0) / (1 << 20)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as td:
+        p = Path(td) / "All Entitlements.xlsx"
+        _write_export(p, rows)
+        size_mb = p.stat().st_size / (1 << 20)
+
+        # projected first, so the full frame's pages are not part of its peak
+        proj, t_proj, m_proj = _measure(lambda: read_excel_columns(p, COLUMNS))
+        full, t_full, m_full = _measure(lambda: read_excel_first_sheet(p))
+
+    pd.testing.assert_frame_equal(full[COLUMNS], proj, check_column_type=False)
+    print(f"rows={rows} cols={WIDTH} projected={len(COLUMNS)} file={size_mb:.1f} MB")
+    print(f"full sheet : {t_full:7.2f} s  peak RSS {m_full:8.1f} MB")
+    print(f"projected  : {t_proj:7.2f} s  peak RSS {m_proj:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,52 +3,89 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any, Union
 
-import pandas as pd
 import re
 
 from .models import CheckResult, SectionResult, ReviewResult
-from .pdf_reader import PdfDoc, find_referenced_xlsx_filenames
+from .pdf_reader import (
+    PdfDoc,
+    PdfProbe,
+    PageText,
+    classify_probe_pages,
+    find_pages_containing_any,
+    probe_pdf,
+    scan_referenced_xlsx_filenames,
+)
 from .util import find_first_value_after_labels, extract_yes_no, list_existing_files
 from .excel_checks import (
-    read_excel_first_sheet,
-    check_required_columns_non_empty,
-    check_meaningful_descriptions,
+    ColumnStream,
+    ExcelCheckFinding,
+    RowCheck,
+    StreamResult,
+    check_plan_row_checks,
+    evaluate_check_plan,
+    non_empty_series,
+    open_column_stream,
+    run_row_checks,
 )
-from .rules import load_rules, Rules
-from .ocr import ocr_pdf_pages_best_effort
+from .rules import ExcelCheckPlan, ExcelColumnRule, ExcelThresholdRule, load_rules, Rules
+from .ocr import add_startup_estimate, merge_backend_stats, ocr_pdf_pages_best_effort
+from .ocr_preprocess import PreprocessConfig
+from .dac_cache import dac_cache_key, load_dac_cache, save_dac_cache
+from .digest import file_sha256
+from .workbook_cache import WorkbookCache, peak_rss_bytes, peak_rss_growth
 
 
 class _PdfOverlayView:
     """
     Overlay OCR text for specific pages when base PDF text is empty/weak.
     Preserves PdfDoc interface used by validate().
+
+    prepend=True (label-region OCR): the OCR "<label>\n<value>" blocks go in
+    front of a page's own text lines, so the extractors see them first.
+
+    Reads base pages from the PdfDoc page store; the merged per-page view is
+    built once and kept in its own store.
     """
 
-    def __init__(self, base: PdfDoc, ocr_pages: Dict[int, str]):
+    def __init__(self, base: PdfDoc, ocr_pages: Dict[int, str], prepend: bool = False):
         self._base = base
+        self._prepend = bool(prepend)
         self._ocr_pages = {int(k): (v or "") for k, v in (ocr_pages or {}).items()}
+        self._pages: Dict[int, PageText] = {}
+        self._needle_hits: Dict[Tuple[Tuple[str, ...], bool], Dict[str, List[int]]] = {}
 
     def page_count(self) -> int:
         return self._base.page_count()
 
-    def page_lines(self, i: int) -> List[str]:
-        base_lines = self._base.page_lines(i)
-        base_text = "\n".join(base_lines).strip()
+    def page(self, i: int) -> PageText:
+        entry = self._pages.get(i)
+        if entry is not None:
+            return entry
 
+        base = self._base.page(i)
+        lines = base.lines
         ocr_text = (self._ocr_pages.get(i) or "").strip()
-        if not base_text and ocr_text:
-            return [ln for ln in ocr_text.splitlines() if ln.strip()]
+        if ocr_text and (self._prepend or not "\n".join(lines).strip()):
+            ocr_lines = [ln for ln in ocr_text.splitlines() if ln.strip()]
+            lines = ocr_lines + list(lines) if self._prepend else ocr_lines
 
-        return base_lines
+        text = "\n".join(lines)
+        entry = PageText.from_text(text, lines)
+        self._pages[i] = entry
+        return entry
+
+    def page_lines(self, i: int) -> List[str]:
+        return list(self.page(i).lines)
+
+    def ocr_text(self, i: int) -> str:
+        return self._ocr_pages.get(i, "")
 
     def all_text(self) -> str:
-        chunks: List[str] = []
-        for i in range(self.page_count()):
-            chunks.append("\n".join(self.page_lines(i)))
-        return "\n".join(chunks)
+        return "\n".join(self.page(i).text for i in range(self.page_count()))
 
     def find_pages_containing(self, needle: str, case_insensitive: bool = True) -> List[int]:
         if not needle:
@@ -56,12 +93,20 @@ class _PdfOverlayView:
         n = needle.lower() if case_insensitive else needle
         out: List[int] = []
         for i in range(self.page_count()):
-            t = "\n".join(self.page_lines(i))
-            hay = t.lower() if case_insensitive else t
+            entry = self.page(i)
+            hay = entry.lower if case_insensitive else entry.text
             if n in hay:
                 out.append(i)
         return out
 
+    def find_pages_containing_any(self, needles: List[str], case_insensitive: bool = True) -> Dict[str, List[int]]:
+        key = (tuple(needles or []), bool(case_insensitive))
+        hit = self._needle_hits.get(key)
+        if hit is None:
+            hit = find_pages_containing_any(self, key[0], case_insensitive)
+            self._needle_hits[key] = hit
+        return {k: list(v) for k, v in hit.items()}
+
 
 # =============================================================================
 # Public API (CLI + backward compatible test API)
@@ -79,8 +124,30 @@ def validate(
     tesseract_cmd: Optional[str] = None,
     ocr_lang: str = "eng",
     ocr_dpi: int = 200,
+    ocr_dpi_ladder: Optional[List[int]] = None,  # adaptive DPI, e.g. [150, 300]; overrides ocr_dpi
     ocr_max_pages: int = 2,
     ocr_pages: Optional[List[int]] = None,
+    ocr_workers: int = 1,
+    ocr_grayscale: bool = False,
+    ocr_mode: str = "page",  # DAC OCR: "page" (full pages) or "region" (label regions only)
+    ocr_preprocess: bool = False,  # binarize / deskew / crop pages before tesseract
+    ocr_backend: str = "page",  # "page" | "batch" | "api" | "auto" (see ocr.OcrBackend)
+    ocr_dedupe: bool = False,  # evidence OCR: reuse text of perceptually identical pages
+    ocr_incremental: bool = False,  # DAC OCR page by page until all fields are found
+    # Parallel page text extraction for large PDFs (process pool)
+    workers: int = 1,
+    # Persistent DAC cache (<cache_dir>/dac, else <out_dir>/dac_cache; needs one of them)
+    dac_cache: bool = True,
+    dac_sha256: Optional[str] = None,
+    # Shared cache dir (OCR + DAC caches across runs); None = per-run caches under out_dir
+    cache_dir: Optional[Union[Path, str]] = None,
+    # Opt-in: parsed evidence workbooks on disk (<cache_dir>/xlsx, else <out_dir>/xlsx_cache);
+    # the in-run memo (one parse per workbook) is always on
+    workbook_cache: bool = False,
+    # Excel checks on streamed row chunks, stopping once the outcome is settled
+    excel_stream: bool = False,
+    # Repeating text columns of loaded exports as categoricals
+    excel_compact: bool = False,
     # Debug
     debug_extract: bool = False,
     # --- Backward compatible args used by tests in this repo ---
@@ -107,6 +174,7 @@ def validate(
     rules_path_p = Path(rules_path) if rules_path else None
 
     rules: Rules = load_rules(rules_path_p)
+    preprocess = PreprocessConfig() if ocr_preprocess else None
 
     debug_log: List[Dict[str, Any]] = []
 
@@ -115,118 +183,119 @@ def validate(
             return
         debug_log.append({"event": event, **kv})
 
+    # Per-worker page extraction timings (only filled when workers > 1)
+    extract_timings: List[Dict[str, Any]] = []
+
     # -------------------------------------------------------------------------
-    # DAC PDF load + OPTIONAL OCR OVERLAY
+    # DAC PDF load + OPTIONAL OCR OVERLAY + field extraction
+    # (skipped entirely on a persistent DAC cache hit)
     # -------------------------------------------------------------------------
-    pdf_base = PdfDoc(dac_pdf)
-    base_text = (pdf_base.all_text() or "").strip()
-    base_chars = len(base_text)
-
-    dac_ocr_meta: Dict[str, Any] = {
-        "ocr_enabled": bool(ocr),
-        "ocr_attempted": False,
-        "ocr_succeeded": False,
-        "base_text_chars": int(base_chars),
-        "text_chars_after_ocr": int(base_chars),
-        "ocr_pages_requested": ocr_pages,
-    }
-
-    pdf = pdf_base
-    min_chars = int(getattr(rules.pdf_evidence, "min_text_chars", 200))
-
-    # IMPORTANT CHANGE:
-    # If user explicitly provided --ocr-pages, we OCR those pages even if base text is already above min_chars.
-    user_forced_pages = bool(ocr_pages and len(ocr_pages) > 0)
-    should_ocr_dac = bool(ocr) and (base_chars < min_chars or user_forced_pages)
-
-    if should_ocr_dac:
+    shared_cache_dir = Path(cache_dir) if cache_dir else None
+    if shared_cache_dir is not None:
+        ocr_cache_dir = shared_cache_dir / "ocr"
+        dac_cache_dir: Optional[Path] = (shared_cache_dir / "dac") if dac_cache else None
+    else:
+        ocr_cache_dir = (out_dir_final if out_dir_final else Path("out")) / "ocr_cache"
+        dac_cache_dir = (out_dir_final / "dac_cache") if (out_dir_final and dac_cache) else None
+    if shared_cache_dir is not None:
+        xlsx_cache_dir: Optional[Path] = (shared_cache_dir / "xlsx") if workbook_cache else None
+    else:
+        xlsx_cache_dir = (out_dir_final / "xlsx_cache") if (out_dir_final and workbook_cache) else None
+    # Every section reads its exports through this, so each workbook is parsed once
+    workbooks = WorkbookCache(xlsx_cache_dir, compact=excel_compact)
+    excel_stream_stats: Dict[str, Any] = {}
+    dac_cache_stats: Dict[str, Any] = {"enabled": dac_cache_dir is not None, "hit": False}
+    dac_cache_key_: Optional[str] = None
+    cached: Optional[Dict[str, Any]] = None
+
+    # --debug-extract needs the extraction events, so it always re-reads the DAC
+    if dac_cache_dir is not None and debug_extract:
+        dac_cache_stats["skipped"] = "debug_extract"
+    elif dac_cache_dir is not None:
         try:
-            cache_dir = (out_dir_final if out_dir_final else Path("out")) / "ocr_cache"
-
-            # Targeted DAC OCR selection
-            pages_to_ocr: Optional[List[int]] = None
-            if user_forced_pages:
-                pages_to_ocr = sorted(set(int(x) for x in ocr_pages or [] if isinstance(x, int) and x >= 0))
-                dbg("dac_ocr_pages_source", source="user", pages=pages_to_ocr)
-            else:
-                if base_chars > 0:
-                    needles = [
-                        "CMS Product ID",
-                        "IT Asset ID",
-                        "IT Asset Name",
-                        "Application is",
-                        "SoD relevant",
-                        "Functional Area",
-                        "upload the entitlement",
-                        "Is Application a",
-                        "critical and",
-                        "important function",
-                    ]
-                    cand: List[int] = []
-                    for n in needles:
-                        cand.extend(pdf_base.find_pages_containing(n, True))
-                    cand = sorted(set(cand))
-                    if cand:
-                        pages_to_ocr = cand[: max(1, int(ocr_max_pages))]
-                        dbg("dac_ocr_pages_source", source="auto_from_text", candidates=cand, chosen=pages_to_ocr)
-
-                if not pages_to_ocr:
-                    pages_to_ocr = list(range(0, min(int(ocr_max_pages), pdf_base.page_count())))
-                    dbg("dac_ocr_pages_source", source="fallback_first_pages", chosen=pages_to_ocr)
-
-            ocr_page_map, meta = ocr_pdf_pages_best_effort(
-                dac_pdf,
-                cache_dir,
-                tesseract_cmd=tesseract_cmd,
-                lang=ocr_lang,
-                dpi=ocr_dpi,
-                max_pages=ocr_max_pages,
-                pages=pages_to_ocr,
+            dac_cache_key_ = dac_cache_key(
+                dac_sha256 or file_sha256(dac_pdf),
+                ocr={
+                    "enabled": bool(ocr),
+                    "lang": ocr_lang,
+                    "dpi": int(ocr_dpi),
+                    "dpi_ladder": list(ocr_dpi_ladder or []),
+                    "max_pages": int(ocr_max_pages),
+                    "pages": list(ocr_pages or []),
+                    "min_text_chars": int(getattr(rules.pdf_evidence, "min_text_chars", 200)),
+                    "grayscale": bool(ocr_grayscale),
+                    "mode": ocr_mode,
+                    "incremental": bool(ocr_incremental),
+                    "preprocess": preprocess.cache_id() if preprocess is not None else None,
+                },
             )
-
-            dac_ocr_meta.update(meta)
-            dac_ocr_meta["ocr_attempted"] = True
-
-            ocr_text_total = int(sum(len(v or "") for v in ocr_page_map.values()))
-            text_after = base_chars + ocr_text_total
-            dac_ocr_meta["text_chars_after_ocr"] = int(text_after)
-            dac_ocr_meta["ocr_succeeded"] = bool(ocr_text_total > 0 and meta.get("ocr_succeeded") is True)
-            dac_ocr_meta["ocr_pages_used"] = sorted(list(ocr_page_map.keys()))
-
-            dbg("dac_ocr_result", base_chars=base_chars, ocr_text_chars=ocr_text_total, pages_used=dac_ocr_meta.get("ocr_pages_used"))
-
-            if ocr_page_map and ocr_text_total > 0:
-                pdf = _PdfOverlayView(pdf_base, ocr_page_map)
-
+            cached = load_dac_cache(dac_cache_dir, dac_cache_key_)
         except Exception as e:
-            dac_ocr_meta["error"] = f"{type(e).__name__}: {e}"
-            dbg("dac_ocr_error", error=dac_ocr_meta["error"])
-
-    all_text = pdf.all_text()
-    referenced_xlsx = find_referenced_xlsx_filenames(all_text)
+            dac_cache_stats["error"] = f"{type(e).__name__}: {e}"
+        dac_cache_stats["key"] = dac_cache_key_
+
+    if cached is not None:
+        pdf_base = PdfDoc.from_page_texts(dac_pdf, cached["pages"])
+        dac_ocr_meta: Dict[str, Any] = _replayed_dac_ocr_meta(cached["dac_ocr"])
+        referenced_xlsx: List[str] = list(cached["referenced_xlsx"])
+        fields: Dict[str, Optional[str]] = dict(cached["fields"])
+        dac_cache_stats["hit"] = True
+        dbg("dac_cache_hit", key=dac_cache_key_)
+    else:
+        pdf_base, pdf, dac_ocr_meta = _load_dac_with_ocr(
+            dac_pdf,
+            rules=rules,
+            ocr_cache_dir=ocr_cache_dir,
+            ocr=ocr,
+            tesseract_cmd=tesseract_cmd,
+            ocr_lang=ocr_lang,
+            ocr_dpi=ocr_dpi,
+            ocr_dpi_ladder=ocr_dpi_ladder,
+            ocr_max_pages=ocr_max_pages,
+            ocr_pages=ocr_pages,
+            ocr_workers=ocr_workers,
+            ocr_grayscale=ocr_grayscale,
+            ocr_mode=ocr_mode,
+            ocr_incremental=ocr_incremental,
+            ocr_preprocess=preprocess,
+            ocr_backend=ocr_backend,
+            workers=workers,
+            dbg=dbg,
+        )
+        if pdf_base.worker_timings:
+            extract_timings.append({"file": str(dac_pdf), "chunks": pdf_base.worker_timings})
+        all_text = pdf.all_text()
+        referenced_xlsx = scan_referenced_xlsx_filenames(pdf.page(i).text for i in range(pdf.page_count()))
+        fields = _extract_dac_fields(pdf, all_text, dbg)
+
+        # Failed OCR (e.g. tesseract missing) is not cached, so a later run can retry it
+        if dac_cache_dir is not None and dac_cache_key_ and _dac_ocr_cacheable(dac_ocr_meta, pdf):
+            try:
+                save_dac_cache(
+                    dac_cache_dir,
+                    dac_cache_key_,
+                    pages=[pdf.page(i) for i in range(pdf.page_count())],
+                    dac_ocr=dac_ocr_meta,
+                    referenced_xlsx=referenced_xlsx,
+                    fields=fields,
+                )
+                dac_cache_stats["stored"] = True
+            except Exception as e:
+                dac_cache_stats["error"] = f"{type(e).__name__}: {e}"
+
+    cms_id = fields.get("cms_id")
+    it_asset_id = fields.get("it_asset_id")
+    it_asset_name = fields.get("it_asset_name")
+    sod_value = fields.get("sod")
+    fa_value = fields.get("fa")
+    upload_value = fields.get("upload")
+    cif_value = fields.get("cif")
 
     # -------------------------------------------------------------------------
     # Section 1.1 General Information
     # -------------------------------------------------------------------------
     sec11_checks: List[CheckResult] = []
 
-    cms_id = _extract_value_global(pdf, ["CMS Product ID"])
-    it_asset_id = _extract_value_global(pdf, ["IT Asset ID", "IT Asset ID:"])
-    it_asset_name = _extract_value_global(pdf, ["IT Asset Name", "IT Asset Name:"])
-
-    # typed regex first, then generic fallback
-    if not cms_id:
-        cms_id = _extract_cms_product_id(all_text) or _extract_value_from_text(all_text, ["CMS Product ID"])
-        dbg("extract_fallback_value", field="cms_id", value=cms_id, method="cms_numeric_regex_then_generic")
-    if not it_asset_id:
-        it_asset_id = _extract_it_asset_id(all_text) or _extract_value_from_text(all_text, ["IT Asset ID", "IT Asset ID:"])
-        dbg("extract_fallback_value", field="it_asset_id", value=it_asset_id, method="asset_id_regex_then_generic")
-    if not it_asset_name:
-        it_asset_name = _extract_it_asset_name(all_text) or _extract_value_from_text(all_text, ["IT Asset Name", "IT Asset Name:"])
-        dbg("extract_fallback_value", field="it_asset_name", value=it_asset_name, method="asset_name_regex_then_generic")
-
-    dbg("extract_1.1_values", cms_id=cms_id, it_asset_id=it_asset_id, it_asset_name=it_asset_name)
-
     sec11_checks += [
         _presence_check("S1.1-01", "CMS Product ID present", cms_id, severity="major"),
         _presence_check("S1.1-02", "IT Asset ID present", it_asset_id, severity="major"),
@@ -277,6 +346,8 @@ def validate(
                     )
                 )
 
+    # Evidence OCR metas, for the stats.ocr_dpi / stats.ocr_preprocess summaries
+    evidence_ocr_metas: List[Dict[str, Any]] = []
     for idx, fname in enumerate(expected_pdfs, start=1):
         base_id = f"S2.0-{idx:02d}"
         p = evidence_dir / fname
@@ -288,12 +359,21 @@ def validate(
             min_chars=rules.pdf_evidence.min_text_chars,
             ocr_image_threshold=rules.pdf_evidence.ocr_image_threshold,
             ocr=ocr,
-            out_dir=(out_dir_final if out_dir_final else Path("out")),
+            ocr_cache_dir=ocr_cache_dir,
             tesseract_cmd=tesseract_cmd,
             ocr_lang=ocr_lang,
             ocr_dpi=ocr_dpi,
+            ocr_dpi_ladder=ocr_dpi_ladder,
             ocr_max_pages=ocr_max_pages,
+            ocr_workers=ocr_workers,
+            ocr_grayscale=ocr_grayscale,
+            ocr_preprocess=preprocess,
+            ocr_backend=ocr_backend,
+            ocr_dedupe=ocr_dedupe,
+            dbg=dbg,
         )
+        if meta.get("ocr_attempted"):
+            evidence_ocr_metas.append({"file": fname, **meta})
 
         if ok_text:
             sec20_checks.append(
@@ -340,57 +420,6 @@ def validate(
     # -------------------------------------------------------------------------
     sec41_checks: List[CheckResult] = []
 
-    cand_pages = set()
-    cand_pages.update(pdf.find_pages_containing("Application is", True))
-    cand_pages.update(pdf.find_pages_containing("SoD relevant", True))
-    cand_pages.update(pdf.find_pages_containing("Functional Area", True))
-    cand_pages.update(pdf.find_pages_containing("upload the", True))
-    cand_pages = set(int(x) for x in cand_pages if isinstance(x, int) and x >= 0)
-    cand_list = sorted(cand_pages)
-
-    dbg("sec4.1_candidate_pages", pages=cand_list)
-
-    sod_value: Optional[str] = None
-    fa_value: Optional[str] = None
-    upload_value: Optional[str] = None
-
-    for pi in cand_list:
-        lines = pdf.page_lines(pi)
-
-        if sod_value is None:
-            v = extract_yes_no(find_first_value_after_labels(lines, ["SoD relevant?", "Application is", "Application is SoD relevant?"]))
-            v = v or extract_yes_no(_extract_stack_label_value(lines, ["Application is", "SoD relevant?"]))
-            if v:
-                sod_value = v
-                dbg("sec4.1_extract", field="sod", page=pi, value=sod_value, method="page_lines")
-
-        if fa_value is None:
-            v = extract_yes_no(_extract_stack_label_value(lines, ["Functional Area", "relevant?"]))
-            v = v or extract_yes_no(find_first_value_after_labels(lines, ["Functional Area relevant?"]))
-            if v:
-                fa_value = v
-                dbg("sec4.1_extract", field="fa", page=pi, value=fa_value, method="page_lines")
-
-        if upload_value is None:
-            v = extract_yes_no(_extract_stack_label_value(lines, ["Do you want to", "upload the", "entitlement", "composition?"]))
-            v = v or extract_yes_no(find_first_value_after_labels(lines, ["upload the entitlement composition"]))
-            if v:
-                upload_value = v
-                dbg("sec4.1_extract", field="upload", page=pi, value=upload_value, method="page_lines")
-
-        if sod_value and fa_value and upload_value:
-            break
-
-    if sod_value is None:
-        sod_value = _extract_yes_no_near(all_text, [r"SoD\s+relevant\??", r"Application\s+is.*SoD\s+relevant"])
-        dbg("sec4.1_extract", field="sod", value=sod_value, method="text_near")
-    if fa_value is None:
-        fa_value = _extract_yes_no_near(all_text, [r"Functional\s+Area.*relevant\??"])
-        dbg("sec4.1_extract", field="fa", value=fa_value, method="text_near")
-    if upload_value is None:
-        upload_value = _extract_yes_no_near(all_text, [r"upload\s+the\s+entitlement\s+composition"])
-        dbg("sec4.1_extract", field="upload", value=upload_value, method="text_near")
-
     sec41_checks += [
         _yn_check("S4.1-01", "SoD relevancy recorded (yes/no)", sod_value, severity="critical", lenient=lenient),
         _yn_check("S4.1-02", "Functional Area relevancy recorded (yes/no)", fa_value, severity="major", lenient=lenient),
@@ -401,72 +430,30 @@ def validate(
     for i, exp in enumerate(expected_41, start=1):
         sec41_checks.append(_export_exists_check(f"S4.1-F{i:02d}", f"Export present: {exp}", referenced_xlsx, evidence_dir, exp))
 
-    es_path = _find_export_file(evidence_dir, referenced_xlsx, "Entitlement Services.xlsx")
-    if es_path:
-        df_es = read_excel_first_sheet(es_path)
-
-        f1 = check_required_columns_non_empty(
-            df_es,
-            required_cols=["Display name", "Description", "SoD Area", "Tier Level"],
-            id_col="Display name",
-        )
-
-        sev_41_req = rules.entitlements_required.mvp_severity if mvp else rules.entitlements_required.non_mvp_severity
-        sev_41_req = sev_41_req or rules.entitlements_required.severity
-
-        sec41_checks.append(
-            _excel_finding_check_threshold(
-                "S4.1-EX-01",
-                "Entitlement Services: required master data filled",
-                f1,
-                severity=sev_41_req,
-                mvp=mvp,
-                ratio_tol=rules.entitlements_required.ratio_tol,
-                abs_tol=rules.entitlements_required.abs_tol,
-            )
-        )
-
-        f2 = check_meaningful_descriptions(df_es, "Display name", "Description")
-        sec41_checks.append(
-            _excel_finding_check_threshold(
-                "S4.1-EX-02",
-                "Entitlement Services: descriptions are meaningful",
-                f2,
-                severity=rules.entitlements_descriptions.severity,
-                mvp=mvp,
-                ratio_tol=rules.entitlements_descriptions.ratio_tol,
-                abs_tol=rules.entitlements_descriptions.abs_tol,
-            )
-        )
-    else:
-        sec41_checks.append(
-            CheckResult(
-                check_id="S4.1-EX-01",
-                name="Entitlement Services: required master data filled",
-                status="SKIPPED",
-                severity=(rules.entitlements_required.mvp_severity or "major") if mvp else (rules.entitlements_required.non_mvp_severity or "critical"),
-                message="Skipped because Entitlement Services export was not found.",
-            )
+    # Column checks per export come from rules.yaml (excel_checks); the FA
+    # rule below only needs each export's Functional Area column filled somewhere
+    fa_findings: Dict[str, Any] = {}
+    for exp in expected_41:
+        findings = _excel_export_checks(
+            sec41_checks,
+            exp,
+            _find_export_file(evidence_dir, referenced_xlsx, exp),
+            rules=rules,
+            mvp=mvp,
+            workbooks=workbooks,
+            excel_stream=excel_stream,
+            stream_stats=excel_stream_stats,
+            populated={"fa": _FA_COLUMNS[exp][0]} if fa_value == "yes" else {},
         )
+        if "fa" in findings:
+            fa_findings[exp] = findings["fa"]
 
     if fa_value == "yes":
         fa_ok = False
         fa_evidence: Dict[str, Any] = {}
-
-        if es_path:
-            df_es2 = read_excel_first_sheet(es_path)
-            if "Functional Area" in df_es2.columns:
-                non_empty = df_es2["Functional Area"].fillna("").astype(str).str.strip().ne("").sum()
-                fa_evidence["entitlement_services_fa_non_empty_rows"] = int(non_empty)
-                fa_ok = fa_ok or (non_empty > 0)
-
-        ae_path = _find_export_file(evidence_dir, referenced_xlsx, "All Entitlements.xlsx")
-        if ae_path:
-            df_ae = read_excel_first_sheet(ae_path)
-            if "DBG Functional Area" in df_ae.columns:
-                non_empty = df_ae["DBG Functional Area"].fillna("").astype(str).str.strip().ne("").sum()
-                fa_evidence["all_entitlements_dbg_fa_non_empty_rows"] = int(non_empty)
-                fa_ok = fa_ok or (non_empty > 0)
+        for exp, finding in fa_findings.items():
+            non_empty = _fa_evidence(fa_evidence, _FA_COLUMNS[exp][1], finding)
+            fa_ok = fa_ok or (non_empty > 0)
 
         sec41_checks.append(
             CheckResult(
@@ -486,28 +473,6 @@ def validate(
     # -------------------------------------------------------------------------
     sec42_checks: List[CheckResult] = []
 
-    cand_pages2 = set()
-    cand_pages2.update(pdf.find_pages_containing("Is Application a", True))
-    cand_pages2.update(pdf.find_pages_containing("critical and", True))
-    cand_pages2.update(pdf.find_pages_containing("important", True))
-    cand2 = sorted(set(int(x) for x in cand_pages2 if isinstance(x, int) and x >= 0))
-    dbg("sec4.2_candidate_pages", pages=cand2)
-
-    cif_value: Optional[str] = None
-
-    for pi in cand2:
-        lines = pdf.page_lines(pi)
-        v = extract_yes_no(find_first_value_after_labels(lines, ["Is Application a", "critical and", "important"]))
-        v = v or extract_yes_no(_extract_stack_label_value(lines, ["Is Application a", "critical and", "important"]))
-        if v:
-            cif_value = v
-            dbg("sec4.2_extract", field="cif", page=pi, value=cif_value, method="page_lines")
-            break
-
-    if cif_value is None:
-        cif_value = _extract_yes_no_near(all_text, [r"Is\s+Application\s+a.*critical.*important"])
-        dbg("sec4.2_extract", field="cif", value=cif_value, method="text_near")
-
     sec42_checks.append(_yn_check("S4.2-01", "CIF (critical & important function) recorded (yes/no)", cif_value, severity="major", lenient=lenient))
 
     expected_42 = [
@@ -519,87 +484,20 @@ def validate(
     for i, exp in enumerate(expected_42, start=1):
         sec42_checks.append(_export_exists_check(f"S4.2-F{i:02d}", f"Export present: {exp}", referenced_xlsx, evidence_dir, exp))
 
-    itrs_path = _find_export_file(evidence_dir, referenced_xlsx, "IT Role Services.xlsx")
-    if itrs_path:
-        df = read_excel_first_sheet(itrs_path)
-
-        base_required = ["Display name", "Description", "Tier Level"]
-        missing_base = [c for c in base_required if c not in df.columns]
-        if missing_base:
-            sec42_checks.append(
-                CheckResult(
-                    check_id="S4.2-EX-01",
-                    name="IT Role Services: required master data filled",
-                    status=("MET" if mvp else "NOT_MET"),
-                    severity="major" if mvp else "critical",
-                    message=("MVP: missing columns but not blocking." if mvp else f"Missing required columns: {missing_base}"),
-                    evidence={"missing_columns": missing_base},
-                )
-            )
-        else:
-            owner_cols = [c for c in ["IT Role Owner", "cust_owner", "Application Owner"] if c in df.columns]
-
-            base_ok = (
-                df["Display name"].fillna("").astype(str).str.strip().ne("")
-                & df["Description"].fillna("").astype(str).str.strip().ne("")
-                & df["Tier Level"].notna()
-            )
-
-            if owner_cols:
-                owner_ok = df[owner_cols].fillna("").astype(str).apply(lambda r: any(v.strip() for v in r), axis=1)
-            else:
-                owner_ok = pd.Series(True, index=df.index)
-
-            ok = base_ok & owner_ok
-
-            failing_count = int((~ok).sum())
-            failing = df.loc[~ok].head(5)
-            sample_cols = [c for c in (base_required + owner_cols) if c in df.columns]
-
-            sev_42_req = rules.itroles_required.mvp_severity if mvp else rules.itroles_required.non_mvp_severity
-            sev_42_req = sev_42_req or rules.itroles_required.severity
-
-            sec42_checks.append(
-                _simple_threshold_check(
-                    check_id="S4.2-EX-01",
-                    name="IT Role Services: required master data filled (base + owner fallback)",
-                    failing_count=failing_count,
-                    total=len(df),
-                    severity=sev_42_req,
-                    mvp=mvp,
-                    ratio_tol=rules.itroles_required.ratio_tol,
-                    abs_tol=rules.itroles_required.abs_tol,
-                    evidence={
-                        "total_rows": int(len(df)),
-                        "failing_rows": failing_count,
-                        "owner_cols_used": owner_cols,
-                        "samples": failing[sample_cols].to_dict(orient="records"),
-                    },
-                )
-            )
-
-        f2 = check_meaningful_descriptions(df, "Display name", "Description")
-        sec42_checks.append(
-            _excel_finding_check_threshold(
-                "S4.2-EX-02",
-                "IT Role Services: descriptions are meaningful",
-                f2,
-                severity=rules.itroles_descriptions.severity,
-                mvp=mvp,
-                ratio_tol=rules.itroles_descriptions.ratio_tol,
-                abs_tol=rules.itroles_descriptions.abs_tol,
-            )
-        )
-    else:
-        sec42_checks.append(
-            CheckResult(
-                check_id="S4.2-EX-01",
-                name="IT Role Services: required master data filled",
-                status="SKIPPED",
-                severity="major" if mvp else "critical",
-                message="Skipped because IT Role Services export was not found.",
-            )
+    for exp in expected_42:
+        _excel_export_checks(
+            sec42_checks,
+            exp,
+            _find_export_file(evidence_dir, referenced_xlsx, exp),
+            rules=rules,
+            mvp=mvp,
+            workbooks=workbooks,
+            excel_stream=excel_stream,
+            stream_stats=excel_stream_stats,
         )
+    for exp in sorted(set(rules.excel_checks) - set(expected_41 + expected_42)):
+        if rules.excel_checks[exp].checks:
+            logging.warning("excel_checks for %s ignored: not an export of sections 4.1/4.2", exp)
 
     sec42 = _aggregate_section("4.2", "IT Roles", sec42_checks)
 
@@ -674,7 +572,30 @@ def validate(
         "referenced_xlsx": referenced_xlsx,
         "evidence_dir_files": list_existing_files(evidence_dir),
         "dac_ocr": dac_ocr_meta,
+        "dac_text_store": pdf_base.store_stats(),
+        "dac_cache": dac_cache_stats,
+        "workbook_cache": workbooks.stats_dict(),
     }
+    if excel_stream:
+        stats["excel_stream"] = excel_stream_stats
+    if workers > 1:
+        stats["page_extract"] = {"workers": int(workers), "documents": extract_timings}
+    if ocr_dpi_ladder:
+        stats["ocr_dpi"] = _ocr_dpi_summary(ocr_dpi_ladder, [dac_ocr_meta] + evidence_ocr_metas)
+    if ocr_dedupe:
+        stats["ocr_dedupe"] = {
+            "hits": sum(int(m.get("ocr_dedupe_hits") or 0) for m in evidence_ocr_metas),
+            "files": {m["file"]: int(m.get("ocr_dedupe_hits") or 0) for m in evidence_ocr_metas},
+        }
+    backend_stats = [m["ocr_backend"] for m in [dac_ocr_meta] + evidence_ocr_metas if m.get("ocr_backend")]
+    if backend_stats:
+        stats["ocr_backend"] = merge_backend_stats(backend_stats)
+        if debug_extract:
+            add_startup_estimate(stats["ocr_backend"], ocr_lang)
+    if preprocess is not None:
+        stats["ocr_preprocess"] = _ocr_preprocess_summary(
+            preprocess, [{"file": dac_pdf.name, **dac_ocr_meta}] + evidence_ocr_metas
+        )
 
     if debug_extract:
         stats["extract_debug_events"] = debug_log
@@ -698,6 +619,540 @@ def validate(
     return result
 
 
+# Functional Area column per 4.1 export (read only when FA relevancy = yes)
+# and the prefix of its S4.1-EX-FA evidence keys
+_FA_COLUMNS: Dict[str, Tuple[str, str]] = {
+    "Entitlement Services.xlsx": ("Functional Area", "entitlement_services_fa"),
+    "All Entitlements.xlsx": ("DBG Functional Area", "all_entitlements_dbg_fa"),
+}
+
+
+# =============================================================================
+# DAC load + field extraction
+# =============================================================================
+
+# Labels of the DAC fields; pages containing them are the ones worth OCRing
+_DAC_OCR_NEEDLES = [
+    "CMS Product ID",
+    "IT Asset ID",
+    "IT Asset Name",
+    "Application is",
+    "SoD relevant",
+    "Functional Area",
+    "upload the entitlement",
+    "Is Application a",
+    "critical and",
+    "important function",
+]
+
+
+# Adaptive DPI for the DAC: a page is good enough when every field whose label
+# is on it also yields a value. Bump the id when the check changes.
+_DAC_ACCEPT_ID = "dac-fields1"
+_DAC_FIELD_LABELS = {
+    "cms_id": ("CMS Product ID",),
+    "it_asset_id": ("IT Asset ID",),
+    "it_asset_name": ("IT Asset Name",),
+    "sod": ("SoD relevant",),
+    "fa": ("Functional Area",),
+    "upload": ("upload the entitlement", "entitlement composition"),
+    "cif": ("critical and", "important function"),
+}
+
+
+def _dac_page_readable(text: str) -> bool:
+    low = " ".join(text.split()).lower()
+    labelled = [f for f, labels in _DAC_FIELD_LABELS.items() if any(l.lower() in low for l in labels)]
+    if not labelled:
+        return True
+    page = PdfDoc.from_page_texts(Path("<ocr page>"), [{"text": text}])
+    fields = _extract_dac_fields(page, text, lambda *a, **k: None)
+    # The generic label/next-line extractor happily returns the next label; the
+    # numeric CMS id is checked with its typed regex instead
+    fields["cms_id"] = _extract_cms_product_id(text)
+    return all(fields.get(f) for f in labelled)
+
+
+def _load_dac_with_ocr(
+    dac_pdf: Path,
+    *,
+    rules: Rules,
+    ocr_cache_dir: Path,
+    ocr: bool,
+    tesseract_cmd: Optional[str],
+    ocr_lang: str,
+    ocr_dpi: int,
+    ocr_max_pages: int,
+    ocr_pages: Optional[List[int]],
+    ocr_dpi_ladder: Optional[List[int]] = None,
+    ocr_workers: int = 1,
+    ocr_grayscale: bool = False,
+    ocr_mode: str = "page",
+    ocr_incremental: bool = False,
+    ocr_preprocess: Optional[PreprocessConfig] = None,
+    ocr_backend: str = "page",
+    workers: int = 1,
+    dbg,
+) -> Tuple[PdfDoc, Any, Dict[str, Any]]:
+    """
+    Returns (pdf_base, pdf, dac_ocr_meta); pdf is pdf_base or an OCR overlay view.
+
+    ocr_incremental (without explicit ocr_pages): OCR page by page in priority
+    order and stop once all DAC fields are found; ocr_max_pages is the ceiling.
+    """
+    pdf_base = PdfDoc(dac_pdf, workers=workers)
+    base_text = (pdf_base.all_text() or "").strip()
+    base_chars = len(base_text)
+
+    dac_ocr_meta: Dict[str, Any] = {
+        "ocr_enabled": bool(ocr),
+        "ocr_attempted": False,
+        "ocr_succeeded": False,
+        "base_text_chars": int(base_chars),
+        "text_chars_after_ocr": int(base_chars),
+        "ocr_pages_requested": ocr_pages,
+    }
+
+    pdf = pdf_base
+    min_chars = int(getattr(rules.pdf_evidence, "min_text_chars", 200))
+
+    # IMPORTANT CHANGE:
+    # If user explicitly provided --ocr-pages, we OCR those pages even if base text is already above min_chars.
+    user_forced_pages = bool(ocr_pages and len(ocr_pages) > 0)
+    should_ocr_dac = bool(ocr) and (base_chars < min_chars or user_forced_pages)
+
+    if should_ocr_dac:
+        try:
+            ocr_kwargs = dict(
+                tesseract_cmd=tesseract_cmd,
+                lang=ocr_lang,
+                dpi=ocr_dpi,
+                max_pages=ocr_max_pages,
+                workers=ocr_workers,
+                grayscale=ocr_grayscale,
+                mode=ocr_mode,
+                dpi_ladder=ocr_dpi_ladder,
+                accept=_dac_page_readable,
+                accept_id=_DAC_ACCEPT_ID,
+                preprocess=ocr_preprocess,
+                backend=ocr_backend,
+            )
+
+            if ocr_incremental and not user_forced_pages:
+                pdf = _incremental_dac_ocr(
+                    dac_pdf,
+                    pdf_base,
+                    ocr_cache_dir=ocr_cache_dir,
+                    ocr_max_pages=ocr_max_pages,
+                    ocr_workers=ocr_workers,
+                    ocr_mode=ocr_mode,
+                    ocr_kwargs=ocr_kwargs,
+                    dac_ocr_meta=dac_ocr_meta,
+                    dbg=dbg,
+                )
+                return pdf_base, pdf, dac_ocr_meta
+
+            # Targeted DAC OCR selection
+            pages_to_ocr: Optional[List[int]] = None
+            if user_forced_pages:
+                pages_to_ocr = sorted(set(int(x) for x in ocr_pages or [] if isinstance(x, int) and x >= 0))
+                dbg("dac_ocr_pages_source", source="user", pages=pages_to_ocr)
+            else:
+                if base_chars > 0:
+                    hits = pdf_base.find_pages_containing_any(_DAC_OCR_NEEDLES, True)
+                    cand = sorted(set(pg for pages in hits.values() for pg in pages))
+                    if cand:
+                        pages_to_ocr = cand[: max(1, int(ocr_max_pages))]
+                        dbg("dac_ocr_pages_source", source="auto_from_text", candidates=cand, chosen=pages_to_ocr)
+
+                if not pages_to_ocr:
+                    pages_to_ocr = list(range(0, min(int(ocr_max_pages), pdf_base.page_count())))
+                    dbg("dac_ocr_pages_source", source="fallback_first_pages", chosen=pages_to_ocr)
+
+            ocr_page_map, meta = ocr_pdf_pages_best_effort(dac_pdf, ocr_cache_dir, pages=pages_to_ocr, **ocr_kwargs)
+
+            dac_ocr_meta.update(meta)
+            dac_ocr_meta["ocr_attempted"] = True
+
+            ocr_text_total = int(sum(len(v or "") for v in ocr_page_map.values()))
+            text_after = base_chars + ocr_text_total
+            dac_ocr_meta["text_chars_after_ocr"] = int(text_after)
+            dac_ocr_meta["ocr_succeeded"] = bool(ocr_text_total > 0 and meta.get("ocr_succeeded") is True)
+            dac_ocr_meta["ocr_pages_used"] = sorted(list(ocr_page_map.keys()))
+
+            dbg("dac_ocr_result", base_chars=base_chars, ocr_text_chars=ocr_text_total, pages_used=dac_ocr_meta.get("ocr_pages_used"))
+
+            if ocr_page_map and ocr_text_total > 0:
+                pdf = _PdfOverlayView(pdf_base, ocr_page_map, prepend=(ocr_mode == "region"))
+
+        except Exception as e:
+            dac_ocr_meta["error"] = f"{type(e).__name__}: {e}"
+            dbg("dac_ocr_error", error=dac_ocr_meta["error"])
+
+    return pdf_base, pdf, dac_ocr_meta
+
+
+# Measurements of the run that filled the DAC cache; a hit does not replay them
+_DAC_OCR_RUN_FIELDS = frozenset(
+    {
+        "ocr_backend",
+        "ocr_cache_hit",
+        "ocr_cache_pages_hit",
+        "ocr_dedupe",
+        "ocr_dpi_rungs",
+        "ocr_page_timings",
+        "ocr_pages_from_peer",
+        "ocr_pages_ocred",
+        "ocr_pipeline",
+        "ocr_preprocess",
+    }
+)
+
+
+def _replayed_dac_ocr_meta(dac_ocr_meta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The cached DAC OCR meta as reported by a cache hit: the result fields
+    (pages used, text chars, page probe) are kept, timings and OCR work
+    counts are dropped since this run did no OCR, and from_cache is set.
+    """
+    out = {k: v for k, v in dac_ocr_meta.items() if k not in _DAC_OCR_RUN_FIELDS and not k.endswith("_sec")}
+    out["from_cache"] = True
+    return out
+
+
+def _dac_ocr_cacheable(dac_ocr_meta: Dict[str, Any], pdf: Any) -> bool:
+    """
+    Whether the DAC result may be cached: no OCR error, no failed page and
+    text from every page OCR was used on. A failed page would otherwise be
+    served, with its fields missing, to every later run.
+    """
+    if "error" in dac_ocr_meta or dac_ocr_meta.get("ocr_page_errors"):
+        return False
+    used = dac_ocr_meta.get("ocr_pages_used") or []
+    if not used:
+        return True
+    if not isinstance(pdf, _PdfOverlayView):
+        return False  # OCR ran but produced no text at all
+    return all(pdf.ocr_text(int(i)).strip() for i in used)
+
+
+def _ocr_dpi_summary(ladder: List[int], metas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Adaptive DPI totals over the DAC and evidence OCR metas.
+    """
+    by_dpi: Dict[str, int] = {}
+    pages = 0
+    escalated = 0
+    for m in metas:
+        page_dpi = m.get("ocr_page_dpi") or {}
+        pages += len(page_dpi)
+        escalated += len(m.get("ocr_pages_escalated") or [])
+        for dpi in page_dpi.values():
+            by_dpi[str(dpi)] = by_dpi.get(str(dpi), 0) + 1
+    return {"ladder": list(ladder), "pages": pages, "pages_escalated": escalated, "accepted_at_dpi": by_dpi}
+
+
+def _ocr_preprocess_summary(cfg: PreprocessConfig, metas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Per-page preprocessing times over the DAC and evidence OCR metas.
+    """
+    pages: List[Dict[str, Any]] = []
+    for m in metas:
+        pp = m.get("ocr_preprocess") or {}
+        rungs = [r.get("preprocess") or {} for r in m.get("ocr_dpi_rungs") or []]
+        for block in [pp] + rungs:
+            for p in block.get("pages") or []:
+                pages.append({"file": m.get("file"), "page": p["page"], "sec": p["sec"], "blank": p["blank"]})
+    total = sum(p["sec"] for p in pages)
+    return {
+        "config": cfg.cache_id(),
+        "pages": pages,
+        "total_sec": round(total, 4),
+        "mean_sec_per_page": round(total / len(pages), 4) if pages else None,
+    }
+
+
+def _dac_ocr_priority(pdf_base: PdfDoc, *, ocr_mode: str, budget: int) -> List[int]:
+    """
+    DAC pages in OCR priority order, at most `budget` of them: pages with label
+    hits (most distinct labels first), then their neighbours, then the rest.
+
+    In page mode the OCR text only replaces pages without a text layer, so
+    pages that already have text are left out.
+    """
+    n = pdf_base.page_count()
+    if ocr_mode == "page":
+        eligible = [i for i in range(n) if not pdf_base.page(i).text.strip()]
+    else:
+        eligible = list(range(n))
+    eligible_set = set(eligible)
+
+    hit_count: Dict[int, int] = {}
+    for pages in pdf_base.find_pages_containing_any(_DAC_OCR_NEEDLES, True).values():
+        for pg in set(pages):
+            hit_count[pg] = hit_count.get(pg, 0) + 1
+    hit_pages = sorted(hit_count, key=lambda pg: (-hit_count[pg], pg))
+
+    order: List[int] = [pg for pg in hit_pages if pg in eligible_set]
+    for dist in (1, 2):
+        for pg in hit_pages:
+            for nb in (pg + dist, pg - dist):
+                if nb in eligible_set:
+                    order.append(nb)
+    order.extend(eligible)
+    return list(dict.fromkeys(order))[: max(0, int(budget))]
+
+
+def _incremental_dac_ocr(
+    dac_pdf: Path,
+    pdf_base: PdfDoc,
+    *,
+    ocr_cache_dir: Path,
+    ocr_max_pages: int,
+    ocr_workers: int,
+    ocr_mode: str,
+    ocr_kwargs: Dict[str, Any],
+    dac_ocr_meta: Dict[str, Any],
+    dbg,
+) -> Any:
+    """
+    OCRs DAC pages in priority order, one batch (ocr_workers pages) at a time,
+    re-running the field extractors after each batch. Stops as soon as every
+    1.1 / 4.1 / 4.2 field has a value, or when ocr_max_pages pages were OCRed.
+    Returns the (overlay) document; fills dac_ocr_meta in place.
+    """
+    order = _dac_ocr_priority(pdf_base, ocr_mode=ocr_mode, budget=ocr_max_pages)
+    batch_size = max(1, int(ocr_workers or 1))
+    dbg("dac_ocr_pages_source", source="incremental", order=order)
+
+    def _quiet(event: str, **kv: Any) -> None:
+        pass
+
+    def _missing(doc: Any) -> List[str]:
+        fields = _extract_dac_fields(doc, doc.all_text(), _quiet)
+        return [k for k, v in fields.items() if not v]
+
+    pdf: Any = pdf_base
+    ocr_page_map: Dict[int, str] = {}
+    rounds: List[Dict[str, Any]] = []
+    ocred: List[int] = []
+    cache_hit: List[int] = []
+    timings: List[Dict[str, Any]] = []
+    page_errors: List[Dict[str, Any]] = []
+    pipeline: List[Any] = []
+    region_pages: List[Dict[str, Any]] = []
+    page_dpi: Dict[str, Any] = {}
+    escalated: List[int] = []
+    pp_meta: List[Dict[str, Any]] = []
+    backend_stats: List[Dict[str, Any]] = []
+    missing = _missing(pdf)
+    if not missing:
+        stop = "all_fields_found"
+    else:
+        stop = "page_budget" if len(order) >= int(ocr_max_pages) else "pages_exhausted"
+
+    for start in range(0, len(order) if missing else 0, batch_size):
+        batch = order[start : start + batch_size]
+        page_map, meta = ocr_pdf_pages_best_effort(dac_pdf, ocr_cache_dir, pages=batch, **ocr_kwargs)
+
+        # Settings-level keys (availability, mode, workers, ...) from the latest round
+        dac_ocr_meta.update({k: v for k, v in meta.items() if k != "ocr_pages_requested"})
+        ocred.extend(meta.get("ocr_pages_ocred") or [])
+        cache_hit.extend(meta.get("ocr_cache_pages_hit") or [])
+        timings.extend(meta.get("ocr_page_timings") or [])
+        page_errors.extend(meta.get("ocr_page_errors") or [])
+        if meta.get("ocr_pipeline"):
+            pipeline.append(meta["ocr_pipeline"])
+        region_pages.extend((meta.get("ocr_region") or {}).get("pages") or [])
+        page_dpi.update(meta.get("ocr_page_dpi") or {})
+        escalated.extend(meta.get("ocr_pages_escalated") or [])
+        if meta.get("ocr_backend"):
+            backend_stats.append(meta["ocr_backend"])
+        pp_meta.extend(
+            pp for pp in [meta.get("ocr_preprocess")] + [r.get("preprocess") for r in meta.get("ocr_dpi_rungs") or []] if pp
+        )
+        if "error" in meta:
+            stop = "ocr_error"
+            break
+
+        ocr_page_map.update(page_map)
+        if any((v or "").strip() for v in ocr_page_map.values()):
+            pdf = _PdfOverlayView(pdf_base, ocr_page_map, prepend=(ocr_mode == "region"))
+        missing = _missing(pdf)
+        rounds.append({"pages": batch, "fields_missing": missing})
+        dbg("dac_ocr_round", pages=batch, fields_missing=missing)
+        if not missing:
+            stop = "all_fields_found"
+            break
+
+    ocr_text_total = int(sum(len(v or "") for v in ocr_page_map.values()))
+    dac_ocr_meta.update(
+        {
+            "ocr_attempted": bool(rounds) or "error" in dac_ocr_meta,
+            "ocr_succeeded": bool(ocr_text_total > 0 and "error" not in dac_ocr_meta),
+            "ocr_text_chars": ocr_text_total,
+            "text_chars_after_ocr": int(dac_ocr_meta["base_text_chars"]) + ocr_text_total,
+            "ocr_pages": len(ocr_page_map),
+            "ocr_pages_used": sorted(ocr_page_map),
+            "ocr_pages_ocred": ocred,
+            "ocr_cache_pages_hit": sorted(cache_hit),
+            "ocr_page_timings": timings,
+            "ocr_incremental": {
+                "order": order,
+                "rounds": rounds,
+                "stopped": stop,
+                "pages_skipped": len(order) - sum(len(r["pages"]) for r in rounds),
+                "fields_missing": missing,
+            },
+        }
+    )
+    if page_errors:
+        dac_ocr_meta["ocr_page_errors"] = sorted(page_errors, key=lambda x: x["page"])
+    if "ocr_dpi_ladder" in dac_ocr_meta:
+        dac_ocr_meta["ocr_page_dpi"] = page_dpi
+        dac_ocr_meta["ocr_pages_escalated"] = sorted(escalated)
+        dac_ocr_meta.pop("ocr_dpi_rungs", None)
+    # One pipeline / region / preprocess entry per round instead of the last round's only
+    dac_ocr_meta.pop("ocr_pipeline", None)
+    dac_ocr_meta.pop("ocr_region", None)
+    dac_ocr_meta.pop("ocr_preprocess", None)
+    dac_ocr_meta.pop("ocr_backend", None)
+    if backend_stats:
+        dac_ocr_meta["ocr_backend"] = merge_backend_stats(backend_stats)
+    if pp_meta:
+        pp_pages = [p for pp in pp_meta for p in pp["pages"]]
+        dac_ocr_meta["ocr_preprocess"] = {
+            "config": pp_meta[0]["config"],
+            "pages": pp_pages,
+            "preprocess_sec": round(sum(p["sec"] for p in pp_pages), 4),
+            "pixels_in": sum(pp["pixels_in"] for pp in pp_meta),
+            "pixels_out": sum(pp["pixels_out"] for pp in pp_meta),
+            "blank_pages": [p["page"] for p in pp_pages if p["blank"]],
+        }
+    if pipeline:
+        dac_ocr_meta["ocr_pipeline"] = pipeline
+    if region_pages:
+        px = sum(r["pixels_ocred"] for r in region_pages)
+        full = sum(r["page_pixels"] for r in region_pages)
+        dac_ocr_meta["ocr_region"] = {
+            "pages": region_pages,
+            "pixels_ocred": px,
+            "page_pixels": full,
+            "pixel_ratio": round(px / full, 4) if full else None,
+        }
+    dbg("dac_ocr_result", ocr_text_chars=ocr_text_total, pages_used=dac_ocr_meta["ocr_pages_used"], stopped=stop)
+    return pdf
+
+
+def _extract_dac_fields(pdf, all_text: str, dbg) -> Dict[str, Optional[str]]:
+    """
+    Section 1.1 values and the 4.1/4.2 yes/no answers from the (OCR-overlaid) DAC.
+    """
+    # 1.1 General Information
+    cms_id = _extract_value_global(pdf, ["CMS Product ID"])
+    it_asset_id = _extract_value_global(pdf, ["IT Asset ID", "IT Asset ID:"])
+    it_asset_name = _extract_value_global(pdf, ["IT Asset Name", "IT Asset Name:"])
+
+    # typed regex first, then generic fallback
+    if not cms_id:
+        cms_id = _extract_cms_product_id(all_text) or _extract_value_from_text(all_text, ["CMS Product ID"])
+        dbg("extract_fallback_value", field="cms_id", value=cms_id, method="cms_numeric_regex_then_generic")
+    if not it_asset_id:
+        it_asset_id = _extract_it_asset_id(all_text) or _extract_value_from_text(all_text, ["IT Asset ID", "IT Asset ID:"])
+        dbg("extract_fallback_value", field="it_asset_id", value=it_asset_id, method="asset_id_regex_then_generic")
+    if not it_asset_name:
+        it_asset_name = _extract_it_asset_name(all_text) or _extract_value_from_text(all_text, ["IT Asset Name", "IT Asset Name:"])
+        dbg("extract_fallback_value", field="it_asset_name", value=it_asset_name, method="asset_name_regex_then_generic")
+
+    dbg("extract_1.1_values", cms_id=cms_id, it_asset_id=it_asset_id, it_asset_name=it_asset_name)
+
+    # 4.1 Entitlements (one pass over the DAC for the 4.1 + 4.2 candidate-page labels)
+    sec41_needles = ["Application is", "SoD relevant", "Functional Area", "upload the"]
+    sec42_needles = ["Is Application a", "critical and", "important"]
+    label_pages = pdf.find_pages_containing_any(sec41_needles + sec42_needles, True)
+
+    cand_pages = set()
+    for n in sec41_needles:
+        cand_pages.update(label_pages[n])
+    cand_pages = set(int(x) for x in cand_pages if isinstance(x, int) and x >= 0)
+    cand_list = sorted(cand_pages)
+
+    dbg("sec4.1_candidate_pages", pages=cand_list)
+
+    sod_value: Optional[str] = None
+    fa_value: Optional[str] = None
+    upload_value: Optional[str] = None
+
+    for pi in cand_list:
+        lines = pdf.page_lines(pi)
+
+        if sod_value is None:
+            v = extract_yes_no(find_first_value_after_labels(lines, ["SoD relevant?", "Application is", "Application is SoD relevant?"]))
+            v = v or extract_yes_no(_extract_stack_label_value(lines, ["Application is", "SoD relevant?"]))
+            if v:
+                sod_value = v
+                dbg("sec4.1_extract", field="sod", page=pi, value=sod_value, method="page_lines")
+
+        if fa_value is None:
+            v = extract_yes_no(_extract_stack_label_value(lines, ["Functional Area", "relevant?"]))
+            v = v or extract_yes_no(find_first_value_after_labels(lines, ["Functional Area relevant?"]))
+            if v:
+                fa_value = v
+                dbg("sec4.1_extract", field="fa", page=pi, value=fa_value, method="page_lines")
+
+        if upload_value is None:
+            v = extract_yes_no(_extract_stack_label_value(lines, ["Do you want to", "upload the", "entitlement", "composition?"]))
+            v = v or extract_yes_no(find_first_value_after_labels(lines, ["upload the entitlement composition"]))
+            if v:
+                upload_value = v
+                dbg("sec4.1_extract", field="upload", page=pi, value=upload_value, method="page_lines")
+
+        if sod_value and fa_value and upload_value:
+            break
+
+    if sod_value is None:
+        sod_value = _extract_yes_no_near(all_text, [r"SoD\s+relevant\??", r"Application\s+is.*SoD\s+relevant"])
+        dbg("sec4.1_extract", field="sod", value=sod_value, method="text_near")
+    if fa_value is None:
+        fa_value = _extract_yes_no_near(all_text, [r"Functional\s+Area.*relevant\??"])
+        dbg("sec4.1_extract", field="fa", value=fa_value, method="text_near")
+    if upload_value is None:
+        upload_value = _extract_yes_no_near(all_text, [r"upload\s+the\s+entitlement\s+composition"])
+        dbg("sec4.1_extract", field="upload", value=upload_value, method="text_near")
+
+    # 4.2 IT Roles
+    cand_pages2 = set()
+    for n in sec42_needles:
+        cand_pages2.update(label_pages[n])
+    cand2 = sorted(set(int(x) for x in cand_pages2 if isinstance(x, int) and x >= 0))
+    dbg("sec4.2_candidate_pages", pages=cand2)
+
+    cif_value: Optional[str] = None
+
+    for pi in cand2:
+        lines = pdf.page_lines(pi)
+        v = extract_yes_no(find_first_value_after_labels(lines, ["Is Application a", "critical and", "important"]))
+        v = v or extract_yes_no(_extract_stack_label_value(lines, ["Is Application a", "critical and", "important"]))
+        if v:
+            cif_value = v
+            dbg("sec4.2_extract", field="cif", page=pi, value=cif_value, method="page_lines")
+            break
+
+    if cif_value is None:
+        cif_value = _extract_yes_no_near(all_text, [r"Is\s+Application\s+a.*critical.*important"])
+        dbg("sec4.2_extract", field="cif", value=cif_value, method="text_near")
+
+    return {
+        "cms_id": cms_id,
+        "it_asset_id": it_asset_id,
+        "it_asset_name": it_asset_name,
+        "sod": sod_value,
+        "fa": fa_value,
+        "upload": upload_value,
+        "cif": cif_value,
+    }
+
+
 # =============================================================================
 # Evidence PDF: extractable text + OCR-required detection + OPTIONAL OCR
 # =============================================================================
@@ -708,52 +1163,51 @@ def _pdf_text_and_ocr_meta(
     ocr_image_threshold: int,
     *,
     ocr: bool,
-    out_dir: Path,
+    ocr_cache_dir: Path,
     tesseract_cmd: Optional[str],
     ocr_lang: str,
     ocr_dpi: int,
     ocr_max_pages: int,
+    ocr_workers: int = 1,
+    ocr_grayscale: bool = False,
+    ocr_dpi_ladder: Optional[List[int]] = None,
+    ocr_preprocess: Optional[PreprocessConfig] = None,
+    ocr_backend: str = "page",
+    ocr_dedupe: bool = False,
+    dbg=None,
 ) -> Tuple[bool, dict]:
     """
     Returns (text_ok, meta).
     If OCR is enabled and required, attempt OCR (best-effort) on up to ocr_max_pages.
+    Text/scan detection is a single-open probe of the PDF that stops once min_chars
+    is reached (meta["text_chars_complete"] is then False); when OCR runs it targets
+    the pages the probe classifies as image-only (summary under meta["page_probe"],
+    per-page data only in the debug_extract log).
     """
     text_chars = 0
     page_count = 0
     image_count = 0
     err: Optional[str] = None
+    probe: Optional[PdfProbe] = None
 
     try:
-        d = PdfDoc(pdf_path)
-        page_count = d.page_count()
-        t = (d.all_text() or "").strip()
-        text_chars = len(t)
+        probe = probe_pdf(pdf_path, min_text_chars=min_chars)
+        page_count = probe.page_count
+        text_chars = probe.text_chars
+        image_count = probe.image_count
     except Exception as e:
         err = f"text_extract_error: {e}"
 
-    # Image count via PyMuPDF directly (best-effort)
-    try:
-        import fitz  # type: ignore
-
-        doc = fitz.open(str(pdf_path))
-        for i in range(len(doc)):
-            try:
-                page = doc.load_page(i)
-                imgs = page.get_images(full=True)
-                image_count += len(imgs)
-            except Exception:
-                continue
-        doc.close()
-    except Exception as e:
-        if err is None:
-            err = f"image_detect_error: {e}"
-
     meta: Dict[str, Any] = {
         "page_count": page_count,
         "text_chars": text_chars,
         "image_count": image_count,
         "ocr_enabled": bool(ocr),
     }
+    if probe is not None:
+        # False: the probe stopped once min_chars was reached; text_chars is a
+        # lower bound and image_count counts distinct images in the xref table
+        meta["text_chars_complete"] = bool(probe.complete)
     if err:
         meta["error"] = err
 
@@ -761,17 +1215,38 @@ def _pdf_text_and_ocr_meta(
     ocr_required = (not text_ok) and (image_count >= max(0, int(ocr_image_threshold)))
     meta["ocr_required"] = bool(ocr_required)
 
+    page_classes = classify_probe_pages(probe) if probe is not None else {}
+    if dbg is not None and probe is not None:
+        dbg("evidence_page_probe", file=pdf_path.name, page_density=probe.pages, page_classes=page_classes)
+
     if ocr and ocr_required:
-        cache_dir = Path(out_dir) / "ocr_cache"
-        pages_to_ocr = list(range(0, min(int(ocr_max_pages), int(page_count or 0))))
+        image_only = page_classes.get("image_only") or []
+        if image_only:
+            pages_to_ocr = image_only[: max(0, int(ocr_max_pages))]
+            selection = "image_only"
+        else:
+            pages_to_ocr = list(range(0, min(int(ocr_max_pages), int(page_count or 0))))
+            selection = "fallback_first_pages"
+        meta["page_probe"] = {
+            "page_class_counts": {k: len(v) for k, v in page_classes.items()},
+            "ocr_page_selection": selection,
+            "ocr_pages_chosen": pages_to_ocr,
+        }
+
         ocr_pages_map, ocr_meta = ocr_pdf_pages_best_effort(
             pdf_path,
-            cache_dir,
+            ocr_cache_dir,
             tesseract_cmd=tesseract_cmd,
             lang=ocr_lang,
             dpi=ocr_dpi,
             max_pages=ocr_max_pages,
             pages=pages_to_ocr,
+            workers=ocr_workers,
+            grayscale=ocr_grayscale,
+            dpi_ladder=ocr_dpi_ladder,
+            preprocess=ocr_preprocess,
+            backend=ocr_backend,
+            dedupe=ocr_dedupe,
         )
         meta.update(ocr_meta)
 
@@ -878,6 +1353,215 @@ def _find_export_file(evidence_dir: Path, referenced_xlsx: List[str], expected_s
     return None
 
 
+def _settle_above(rule: ExcelThresholdRule, mvp: bool, row_estimate: Optional[int]) -> Optional[int]:
+    """
+    Failing-row count past which a threshold check is NOT_MET whatever the
+    unread rows hold (see _excel_finding_check_threshold): any failure outside
+    MVP; the tolerance in MVP, which needs the sheet's row count.
+    """
+    if not mvp:
+        return 0
+    if row_estimate is None:
+        return None
+    return max(int(rule.abs_tol), int(row_estimate * float(rule.ratio_tol)))
+
+
+def _fa_populated_check(col: str) -> RowCheck:
+    # "Failing" = empty; settled by the first populated row
+    return RowCheck(lambda ch: non_empty_series(ch[col]), required_cols=[col], max_samples=0, settle_passing_at=1)
+
+
+def _fa_evidence(evidence: Dict[str, Any], prefix: str, finding: Any) -> int:
+    non_empty = int(finding.rows_scanned) - int(finding.failing_rows)
+    evidence[f"{prefix}_non_empty_rows"] = non_empty
+    if not finding.complete:
+        evidence[f"{prefix}_rows_scanned"] = finding.rows_scanned
+    return non_empty
+
+
+def _stream_export(
+    path: Path,
+    columns: List[str],
+    build: Any,
+    stream_stats: Dict[str, Any],
+) -> StreamResult:
+    """
+    Runs the row checks build(stream) returns over `path` in chunks and
+    records rows read, early stop, time and peak RSS under the file name.
+    """
+    t0 = time.perf_counter()
+    before = peak_rss_bytes()
+    with open_column_stream(path, columns) as st:
+        res = run_row_checks(st, build(st))
+    after = peak_rss_bytes()
+    stream_stats[Path(path).name] = {
+        "rows_scanned": res.rows_scanned,
+        "row_estimate": res.row_estimate,
+        "complete": res.complete,
+        "chunks": res.chunks,
+        "sec": round(time.perf_counter() - t0, 4),
+        **peak_rss_growth(before, after),
+    }
+    return res
+
+
+def _threshold_severity(rule: ExcelThresholdRule, mvp: bool) -> str:
+    sev = rule.mvp_severity if mvp else rule.non_mvp_severity
+    return sev or rule.severity
+
+
+def _not_run_severity(rule: ExcelThresholdRule, mvp: bool) -> str:
+    # SKIPPED / missing-columns results: a check that could not run at all is
+    # critical outside MVP unless the threshold says otherwise
+    return (rule.mvp_severity or "major") if mvp else (rule.non_mvp_severity or "critical")
+
+
+def _run_export_checks(
+    path: Path,
+    plan: ExcelCheckPlan,
+    *,
+    rules: Rules,
+    mvp: bool,
+    workbooks: WorkbookCache,
+    excel_stream: bool,
+    stream_stats: Dict[str, Any],
+    populated: Dict[str, str],
+) -> Tuple[Dict[str, ExcelCheckFinding], List[str]]:
+    """
+    Findings of the plan's checks (by check id) and of the "column populated
+    somewhere" checks in `populated` (by key), with the sheet's columns.
+    Only the columns they read are loaded, streamed with excel_stream.
+    """
+    columns = list(dict.fromkeys(plan.columns + list(populated.values())))
+    if excel_stream:
+
+        def build(st: ColumnStream) -> Dict[str, RowCheck]:
+            settle = {
+                c.id: _settle_above(rules.excel_thresholds[c.threshold], mvp, st.row_estimate) for c in plan.checks
+            }
+            checks = check_plan_row_checks(plan, st.columns, settle)
+            checks.update({k: _fa_populated_check(col) for k, col in populated.items() if col in st.columns})
+            return checks
+
+        res = _stream_export(path, columns, build, stream_stats)
+        return res.findings, res.columns
+
+    df = workbooks.read(path, columns=columns)
+    findings = evaluate_check_plan(plan, df)
+    for k, col in populated.items():
+        if col in df.columns:
+            chk = _fa_populated_check(col)
+            chk.start(list(df.columns))
+            chk.add(df)
+            findings[k] = chk.finding(len(df), True)
+    return findings, list(df.columns)
+
+
+def _column_rule_result(
+    rule: ExcelColumnRule,
+    finding: Optional[ExcelCheckFinding],
+    columns: List[str],
+    *,
+    rules: Rules,
+    mvp: bool,
+) -> CheckResult:
+    threshold = rules.excel_thresholds[rule.threshold]
+    severity = _threshold_severity(threshold, mvp)
+    if finding is None:
+        # missing_columns="not_met": the check could not run at all
+        missing = [c for c in rule.required if c not in columns]
+        return CheckResult(
+            check_id=rule.id,
+            name=rule.missing_name or rule.name,
+            status=("MET" if mvp else "NOT_MET"),
+            severity=_not_run_severity(threshold, mvp),
+            message=("MVP: missing columns but not blocking." if mvp else f"Missing required columns: {missing}"),
+            evidence={"missing_columns": missing},
+        )
+
+    if not rule.any_of:
+        return _excel_finding_check_threshold(
+            rule.id,
+            rule.name,
+            finding,
+            severity=severity,
+            mvp=mvp,
+            ratio_tol=threshold.ratio_tol,
+            abs_tol=threshold.abs_tol,
+        )
+
+    # Owner-fallback style checks also report which any_of columns existed
+    evidence = {
+        "total_rows": int(finding.total_rows),
+        "failing_rows": int(finding.failing_rows),
+        "owner_cols_used": [c for c in rule.any_of if c in columns],
+        "samples": finding.sample_rows,
+    }
+    if not finding.complete:
+        evidence.update({"rows_scanned": finding.rows_scanned, "complete": False})
+    return _simple_threshold_check(
+        check_id=rule.id,
+        name=rule.name,
+        failing_count=int(finding.failing_rows),
+        total=int(finding.total_rows),
+        severity=severity,
+        mvp=mvp,
+        ratio_tol=threshold.ratio_tol,
+        abs_tol=threshold.abs_tol,
+        evidence=evidence,
+        complete=finding.complete,
+    )
+
+
+def _excel_export_checks(
+    out: List[CheckResult],
+    export: str,
+    path: Optional[Path],
+    *,
+    rules: Rules,
+    mvp: bool,
+    workbooks: WorkbookCache,
+    excel_stream: bool,
+    stream_stats: Dict[str, Any],
+    populated: Optional[Dict[str, str]] = None,
+) -> Dict[str, ExcelCheckFinding]:
+    """
+    Appends the CheckResults of the export's rules.yaml column checks to
+    `out` (a single SKIPPED one when the export was not found) and returns
+    all findings, `populated` ones included.
+    """
+    plan = rules.excel_checks.get(export) or ExcelCheckPlan(export=export, checks=[], columns=[])
+    populated = populated or {}
+    if path is None:
+        if plan.checks:
+            first = plan.checks[0]
+            out.append(
+                CheckResult(
+                    check_id=first.id,
+                    name=first.missing_name or first.name,
+                    status="SKIPPED",
+                    severity=_not_run_severity(rules.excel_thresholds[first.threshold], mvp),
+                    message=f"Skipped because {Path(export).stem} export was not found.",
+                )
+            )
+        return {}
+    if not plan.checks and not populated:
+        return {}
+
+    findings, columns = _run_export_checks(
+        path,
+        plan,
+        rules=rules,
+        mvp=mvp,
+        workbooks=workbooks,
+        excel_stream=excel_stream,
+        stream_stats=stream_stats,
+        populated=populated,
+    )
+    out += [_column_rule_result(c, findings.get(c.id), columns, rules=rules, mvp=mvp) for c in plan.checks]
+    return findings
+
+
 def _excel_finding_check_threshold(
     check_id: str,
     name: str,
@@ -893,6 +1577,10 @@ def _excel_finding_check_threshold(
     if failing == 0:
         return CheckResult(check_id=check_id, name=name, status="MET", severity=severity, evidence={"total_rows": total})
 
+    evidence: Dict[str, Any] = {"total_rows": total, "failing_rows": failing, "samples": finding.sample_rows}
+    if not finding.complete:
+        evidence.update({"rows_scanned": finding.rows_scanned, "complete": False})
+
     tol = max(int(abs_tol), int(total * float(ratio_tol)))
     if mvp and failing <= tol:
         return CheckResult(
@@ -901,7 +1589,7 @@ def _excel_finding_check_threshold(
             status="MET",
             severity=severity,
             message=f"MVP warning: {failing} of {total} rows failed (tolerance={tol}).",
-            evidence={"total_rows": total, "failing_rows": failing, "samples": finding.sample_rows},
+            evidence=evidence,
         )
 
     return CheckResult(
@@ -909,8 +1597,8 @@ def _excel_finding_check_threshold(
         name=name,
         status="NOT_MET",
         severity=severity,
-        message=f"{failing} of {total} rows failed.",
-        evidence={"total_rows": total, "failing_rows": failing, "samples": finding.sample_rows},
+        message=_failed_rows_message(failing, total, finding.complete, finding.rows_scanned),
+        evidence=evidence,
     )
 
 
@@ -924,6 +1612,7 @@ def _simple_threshold_check(
     ratio_tol: float,
     abs_tol: int,
     evidence: dict,
+    complete: bool = True,
 ) -> CheckResult:
     if failing_count == 0:
         return CheckResult(check_id=check_id, name=name, status="MET", severity=severity, evidence=evidence)
@@ -944,11 +1633,18 @@ def _simple_threshold_check(
         name=name,
         status="NOT_MET",
         severity=severity,
-        message=f"{failing_count} of {total} rows failed.",
+        message=_failed_rows_message(failing_count, total, complete, evidence.get("rows_scanned")),
         evidence=evidence,
     )
 
 
+def _failed_rows_message(failing: int, total: int, complete: bool, rows_scanned: Optional[int]) -> str:
+    if complete:
+        return f"{failing} of {total} rows failed."
+    # Streamed check stopped once the outcome was settled
+    return f"At least {failing} of ~{total} rows failed (stopped after {rows_scanned} rows)."
+
+
 def _aggregate_section(section_id: str, name: str, checks: List[CheckResult]) -> SectionResult:
     crit_not = any(c.status == "NOT_MET" and c.severity == "critical" for c in checks)
     any_not = any(c.status == "NOT_MET" for c in checks)
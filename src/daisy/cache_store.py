@@ -0,0 +1,360 @@
+# src/daisy/cache_store.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Shared cache layout (<cache_dir> from --cache-dir / DAISY_CACHE_DIR):
+#   <cache_dir>/ocr/...        per-page OCR text (see ocr.py)
+#   <cache_dir>/dac/...        DAC text + fields (see dac_cache.py)
+#   <cache_dir>/xlsx/...       parsed evidence workbooks (see workbook_cache.py)
+#   <cache_dir>/digests.json   file digest registry (see digest.py; never evicted)
+CACHE_DIR_ENV = "DAISY_CACHE_DIR"
+CACHE_SECTIONS = ("ocr", "dac", "xlsx")
+
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+DEFAULT_MAX_ENTRIES = 100_000
+
+# Locks older than this belong to a crashed process and are broken
+LOCK_STALE_SEC = 600.0
+LOCK_WAIT_SEC = 300.0
+_LOCK_POLL_SEC = 0.05
+
+_RECORD_MAGIC = b"#daisy-cache v1"
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+_SIZE_MULT = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+
+
+def resolve_cache_dir(value: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """
+    Explicit value wins, then $DAISY_CACHE_DIR; None means per-run caches under --out.
+    """
+    v = value if value else os.environ.get(CACHE_DIR_ENV)
+    return Path(v).expanduser() if v else None
+
+
+def parse_size(value: Union[str, int]) -> int:
+    """
+    "500M", "2G", "1048576" -> bytes.
+    """
+    if isinstance(value, int):
+        return value
+    m = _SIZE_RE.match(str(value))
+    if not m:
+        raise ValueError(f"invalid size: {value!r}")
+    return int(float(m.group(1)) * _SIZE_MULT[m.group(2).lower()])
+
+
+def touch_entry(path: Path) -> None:
+    """
+    Marks a cache entry as used. Explicit utime, since atime updates are
+    unreliable (noatime/relatime mounts).
+    """
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+# -----------------------------------------------------------------------------
+# Concurrency-safe entries: checksummed records, atomic writes, per-key locks.
+# Temp and lock files are dot-files, so stats/prune never count them.
+# -----------------------------------------------------------------------------
+
+def encode_record(body: Union[str, bytes], **attrs: Any) -> bytes:
+    """
+    Cache record = header line with sha256 + length of the body, then the body.
+    `attrs` are extra header fields (single tokens, e.g. dpi=300).
+    """
+    data = body if isinstance(body, bytes) else body.encode("utf-8")
+    extra = "".join(f" {k}={v}" for k, v in attrs.items())
+    header = _RECORD_MAGIC + f" sha256={hashlib.sha256(data).hexdigest()} len={len(data)}{extra}\n".encode("ascii")
+    return header + data
+
+
+def decode_record_bytes(raw: bytes) -> Optional[Tuple[bytes, Dict[str, str]]]:
+    """
+    Returns (raw body, header fields), or None when the record is torn / corrupt / not a record.
+    """
+    nl = raw.find(b"\n")
+    if nl < 0 or not raw.startswith(_RECORD_MAGIC + b" "):
+        return None
+    try:
+        fields = dict(kv.split("=", 1) for kv in raw[len(_RECORD_MAGIC) + 1 : nl].decode("ascii").split())
+        data = raw[nl + 1 :]
+        if int(fields["len"]) != len(data) or hashlib.sha256(data).hexdigest() != fields["sha256"]:
+            return None
+        return data, fields
+    except Exception:
+        return None
+
+
+def decode_record_attrs(raw: bytes) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    Returns (body, header fields), or None when the record is torn / corrupt / not a record.
+    """
+    rec = decode_record_bytes(raw)
+    if rec is None:
+        return None
+    try:
+        return rec[0].decode("utf-8"), rec[1]
+    except UnicodeDecodeError:
+        return None
+
+
+def decode_record(raw: bytes) -> Optional[str]:
+    """
+    Returns the body, or None when the record is torn / corrupt / not a record.
+    """
+    rec = decode_record_attrs(raw)
+    return rec[0] if rec is not None else None
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """
+    Write to a temp file in the same directory, fsync, then rename over `path`,
+    so readers see either the old or the new file, never a partial one.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
+
+
+class CacheLock:
+    """
+    Cross-process lock for one cache key: an O_EXCL lock file next to the entry.
+    Works on POSIX and Windows; a lock older than LOCK_STALE_SEC is broken.
+
+    The lock file holds an owner token (pid + random), so release() and
+    refresh() only ever touch a lock that is still ours. Holders call refresh()
+    while they work on the key so a live lock never looks stale.
+    """
+
+    def __init__(self, entry_path: Path):
+        entry_path = Path(entry_path)
+        self.path = entry_path.with_name(f".{entry_path.name}.lock")
+        self.token = f"{os.getpid()}.{uuid.uuid4().hex}"
+        self.held = False
+
+    def acquire(self, timeout: Optional[float] = 0.0) -> bool:
+        """
+        timeout=0: try once; None: wait forever; else wait up to `timeout` seconds.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        deadline = None if timeout is None else time.monotonic() + float(timeout)
+        while True:
+            try:
+                fd = os.open(str(self.path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                try:
+                    os.write(fd, self.token.encode("ascii"))
+                finally:
+                    os.close(fd)
+                self.held = True
+                return True
+            except FileExistsError:
+                if self._break_if_stale():
+                    continue
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(_LOCK_POLL_SEC)
+
+    def owned(self) -> bool:
+        """
+        True while the lock file still carries our token.
+        """
+        if not self.held:
+            return False
+        try:
+            return self.path.read_bytes().decode("ascii", "replace") == self.token
+        except OSError:
+            return False
+
+    def refresh(self) -> bool:
+        """
+        Bumps the lock's mtime so peers do not treat it as stale. Returns False
+        (and drops the lock) if it was broken and taken over meanwhile.
+        """
+        if not self.owned():
+            if self.held:
+                logging.warning("Cache lock %s was broken while held", self.path.name)
+                self.held = False
+            return False
+        touch_entry(self.path)
+        return True
+
+    def _break_if_stale(self) -> bool:
+        """
+        Returns True when a stale lock was removed.
+        """
+        try:
+            age = time.time() - self.path.stat().st_mtime
+        except OSError:
+            return False
+        if age <= LOCK_STALE_SEC:
+            return False
+        # Rename aside first: only one waiter wins the rename, and a lock that
+        # was replaced or refreshed after our stat is put back untouched.
+        aside = self.path.with_name(f"{self.path.name}.{self.token}.stale")
+        try:
+            os.rename(self.path, aside)
+        except OSError:
+            return False
+        try:
+            age = time.time() - aside.stat().st_mtime
+        except OSError:
+            return False
+        broken = age > LOCK_STALE_SEC
+        if broken:
+            logging.warning("Breaking stale cache lock %s (%.0fs old)", self.path.name, age)
+        else:
+            try:
+                os.link(aside, self.path)  # no-clobber: fails if a new lock exists
+            except OSError:
+                pass
+        try:
+            aside.unlink()
+        except OSError:
+            pass
+        return broken
+
+    def release(self) -> None:
+        if not self.held:
+            return
+        if not self.owned():
+            self.held = False
+            logging.warning("Cache lock %s was broken while held", self.path.name)
+            return
+        self.held = False
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self) -> "CacheLock":
+        if not self.acquire(timeout=LOCK_WAIT_SEC):
+            logging.warning("Cache lock wait timed out: %s; continuing without it", self.path.name)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.release()
+
+
+@dataclass
+class CacheEntry:
+    path: Path
+    section: str
+    size: int
+    last_access: float
+
+
+def _entries(cache_dir: Path) -> List[CacheEntry]:
+    out: List[CacheEntry] = []
+    for section in CACHE_SECTIONS:
+        root = Path(cache_dir) / section
+        if not root.is_dir():
+            continue
+        for p in root.rglob("*"):
+            try:
+                if not p.is_file() or p.name.startswith("."):
+                    continue
+                st = p.stat()
+            except OSError:
+                continue
+            out.append(CacheEntry(p, section, int(st.st_size), max(st.st_atime, st.st_mtime)))
+    return out
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+
+
+def cache_stats(cache_dir: Path) -> Dict[str, Any]:
+    entries = _entries(cache_dir)
+    sections: Dict[str, Dict[str, int]] = {s: {"entries": 0, "bytes": 0} for s in CACHE_SECTIONS}
+    for e in entries:
+        sections[e.section]["entries"] += 1
+        sections[e.section]["bytes"] += e.size
+    return {
+        "cache_dir": str(cache_dir),
+        "entries": len(entries),
+        "bytes": sum(e.size for e in entries),
+        "sections": sections,
+        "oldest_access": _iso(min((e.last_access for e in entries), default=None)),
+        "newest_access": _iso(max((e.last_access for e in entries), default=None)),
+    }
+
+
+def prune_cache(
+    cache_dir: Path,
+    *,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> Dict[str, Any]:
+    """
+    Evicts least recently used entries until both budgets hold.
+    """
+    entries = sorted(_entries(cache_dir), key=lambda e: e.last_access)
+    total_bytes = sum(e.size for e in entries)
+    count = len(entries)
+    evicted = 0
+    evicted_bytes = 0
+
+    for e in entries:
+        if total_bytes <= int(max_bytes) and count <= int(max_entries):
+            break
+        try:
+            e.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as err:
+            logging.warning("Cache prune: cannot remove %s: %s", e.path, err)
+            continue
+        total_bytes -= e.size
+        count -= 1
+        evicted += 1
+        evicted_bytes += e.size
+
+    # Drop directories emptied by eviction (e.g. ocr/pages/<doc>/)
+    for section in CACHE_SECTIONS:
+        root = Path(cache_dir) / section
+        if not root.is_dir():
+            continue
+        for d in sorted((p for p in root.rglob("*") if p.is_dir()), key=lambda p: len(p.parts), reverse=True):
+            try:
+                d.rmdir()
+            except OSError:
+                pass
+
+    if evicted:
+        logging.info("Cache prune: evicted %d entries (%d bytes) from %s", evicted, evicted_bytes, cache_dir)
+    return {
+        "evicted_entries": evicted,
+        "evicted_bytes": evicted_bytes,
+        "entries": count,
+        "bytes": total_bytes,
+        "max_entries": int(max_entries),
+        "max_bytes": int(max_bytes),
+    }
@@ -4,14 +4,24 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
 import sys
 import time
 from pathlib import Path
 from typing import Any, Dict, Optional, List
 
 from .agent import validate
+from .cache_store import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_MAX_ENTRIES,
+    cache_stats,
+    parse_size,
+    prune_cache,
+    resolve_cache_dir,
+)
+from .digest import configure_digest_registry, file_sha256
+from .ocr import parse_dpi_ladder
 from .util import (
-    sha256_file,
     evidence_file_list_hash,
     sanitize_json,
 )
@@ -110,6 +120,7 @@ def cmd_validate(args: argparse.Namespace) -> int:
     evidence_dir = Path(args.evidence_dir)
     out_dir = Path(args.out) if args.out else Path("out")
     rules_path = Path(args.rules) if args.rules else None
+    cache_dir = resolve_cache_dir(args.cache_dir)
 
     log_path = _setup_logging(out_dir)
 
@@ -123,12 +134,19 @@ def cmd_validate(args: argparse.Namespace) -> int:
     if rules_path is not None and (not rules_path.exists() or not rules_path.is_file()):
         logging.error("rules.yaml not found: %s", rules_path)
         return EXIT_ERROR
+    try:
+        parse_size(args.cache_max_bytes)
+    except ValueError as e:
+        logging.error("Bad --cache-max-bytes: %s", e)
+        return EXIT_ERROR
 
     t0 = time.perf_counter()
 
-    # Reproducibility hashes
+    # Reproducibility hashes (memoized across runs; agent and OCR cache keys
+    # reuse them through the same registry)
+    digests = configure_digest_registry((cache_dir / "digests.json") if cache_dir else (out_dir / "digest_cache.json"))
     try:
-        dac_sha = sha256_file(dac)
+        dac_sha = file_sha256(dac)
     except Exception as e:
         logging.error("Failed hashing DAC: %s", e)
         return EXIT_ERROR
@@ -136,14 +154,17 @@ def cmd_validate(args: argparse.Namespace) -> int:
     rules_sha = None
     if rules_path is not None:
         try:
-            rules_sha = sha256_file(rules_path)
+            rules_sha = file_sha256(rules_path)
         except Exception as e:
             logging.error("Failed hashing rules.yaml: %s", e)
             return EXIT_ERROR
 
     ev_list, ev_list_hash = evidence_file_list_hash(evidence_dir, recursive=False)
+    ev_digests = digests.digest_many([evidence_dir / n for n in ev_list], workers=min(8, os.cpu_count() or 1))
+    ev_file_sha = {n: ev_digests.get(str(evidence_dir / n)) for n in ev_list}
 
     ocr_pages = _parse_ocr_pages(args.ocr_pages)
+    ocr_dpi_ladder = args.ocr_dpi_ladder
 
     # Run validation
     try:
@@ -159,8 +180,24 @@ def cmd_validate(args: argparse.Namespace) -> int:
             tesseract_cmd=args.tesseract_cmd,
             ocr_lang=args.ocr_lang,
             ocr_dpi=int(args.ocr_dpi),
+            ocr_dpi_ladder=ocr_dpi_ladder,
             ocr_max_pages=int(args.ocr_max_pages),
             ocr_pages=ocr_pages,
+            ocr_workers=int(args.ocr_workers),
+            ocr_grayscale=bool(args.ocr_grayscale),
+            ocr_mode=args.ocr_mode,
+            ocr_incremental=bool(args.ocr_incremental),
+            ocr_preprocess=bool(args.ocr_preprocess),
+            ocr_backend=args.ocr_backend,
+            ocr_dedupe=bool(args.ocr_dedupe),
+            workers=int(args.workers),
+            # DAC cache
+            dac_cache=not bool(args.no_dac_cache),
+            dac_sha256=dac_sha,
+            cache_dir=cache_dir,
+            workbook_cache=bool(args.workbook_cache),
+            excel_stream=bool(args.excel_stream),
+            excel_compact=bool(args.excel_compact),
             # Debug
             debug_extract=bool(args.debug_extract),
         )
@@ -178,6 +215,7 @@ def cmd_validate(args: argparse.Namespace) -> int:
                     "lenient": bool(args.lenient),
                     "schema_validate": not bool(args.schema_off),
                     "ocr": bool(args.ocr),
+                    "dac_cache": not bool(args.no_dac_cache),
                     "debug_extract": bool(args.debug_extract),
                 },
                 "timings_sec": {"total": float(time.perf_counter() - t0)},
@@ -194,6 +232,24 @@ def cmd_validate(args: argparse.Namespace) -> int:
 
     total_sec = float(time.perf_counter() - t0)
 
+    try:
+        digests.save()
+    except Exception as e:
+        logging.warning("Failed writing digest cache: %s", e)
+
+    cache_info: Optional[Dict[str, Any]] = None
+    if cache_dir is not None:
+        cache_info = {"cache_dir": str(cache_dir)}
+        try:
+            cache_info["prune"] = prune_cache(
+                cache_dir,
+                max_bytes=parse_size(args.cache_max_bytes),
+                max_entries=int(args.cache_max_entries),
+            )
+        except Exception as e:
+            logging.warning("Cache prune failed: %s", e)
+            cache_info["error"] = f"{type(e).__name__}: {e}"
+
     # Read back the written review_result.json (already sanitized by agent.py)
     review_path = out_dir / "review_result.json"
     try:
@@ -247,7 +303,20 @@ def cmd_validate(args: argparse.Namespace) -> int:
             "lenient": bool(args.lenient),
             "schema_validate": not bool(args.schema_off),
             "ocr": bool(args.ocr),
+            "dac_cache": not bool(args.no_dac_cache),
+            "workbook_cache": bool(args.workbook_cache),
+            "excel_stream": bool(args.excel_stream),
+            "excel_compact": bool(args.excel_compact),
             "debug_extract": bool(args.debug_extract),
+            "workers": int(args.workers),
+            "ocr_workers": int(args.ocr_workers),
+            "ocr_grayscale": bool(args.ocr_grayscale),
+            "ocr_mode": args.ocr_mode,
+            "ocr_incremental": bool(args.ocr_incremental),
+            "ocr_dpi_ladder": ocr_dpi_ladder,
+            "ocr_preprocess": bool(args.ocr_preprocess),
+            "ocr_backend": args.ocr_backend,
+            "ocr_dedupe": bool(args.ocr_dedupe),
         },
         "timings_sec": {"total": total_sec},
         "counts": {
@@ -257,14 +326,24 @@ def cmd_validate(args: argparse.Namespace) -> int:
             "ocr_required_pdfs": int(len(ocr_required_files)),
         },
         "ocr_required_files": ocr_required_files,
+        "page_extract_workers": (result.stats or {}).get("page_extract"),
+        "ocr_dpi": (result.stats or {}).get("ocr_dpi"),
+        "ocr_preprocess": (result.stats or {}).get("ocr_preprocess"),
+        "ocr_backend": (result.stats or {}).get("ocr_backend"),
+        "ocr_dedupe": (result.stats or {}).get("ocr_dedupe"),
+        "workbook_cache": (result.stats or {}).get("workbook_cache"),
+        "excel_stream": (result.stats or {}).get("excel_stream"),
         "inputs": {
             "sha256": {
                 "dac_pdf": dac_sha,
                 "rules_yaml": rules_sha,
                 "evidence_file_list": ev_list_hash,
+                "evidence_files": ev_file_sha,
             },
             "evidence_file_list": ev_list,
         },
+        "digest_cache": digests.stats_dict(),
+        "shared_cache": cache_info,
         "schema": schema_info,
         "output_files": {
             "review_result_json": str(out_dir / "review_result.json"),
@@ -292,6 +371,28 @@ def cmd_validate(args: argparse.Namespace) -> int:
     return exit_code
 
 
+def cmd_cache(args: argparse.Namespace) -> int:
+    cache_dir = resolve_cache_dir(args.cache_dir)
+    if cache_dir is None:
+        print("No cache dir: pass --cache-dir or set DAISY_CACHE_DIR", file=sys.stderr)
+        return EXIT_ERROR
+    if not cache_dir.is_dir():
+        print(f"Cache dir not found: {cache_dir}", file=sys.stderr)
+        return EXIT_ERROR
+
+    if args.action == "stats":
+        info = cache_stats(cache_dir)
+    else:
+        try:
+            max_bytes = parse_size(args.max_bytes)
+        except ValueError as e:
+            print(f"Bad --max-bytes: {e}", file=sys.stderr)
+            return EXIT_ERROR
+        info = prune_cache(cache_dir, max_bytes=max_bytes, max_entries=int(args.max_entries))
+    print(json.dumps(info, indent=2), flush=True)
+    return EXIT_OK
+
+
 def _write_run_summary(out_dir: Path, payload: Dict[str, Any]) -> None:
     out_dir.mkdir(parents=True, exist_ok=True)
     p = out_dir / "run_summary.json"
@@ -318,16 +419,44 @@ def main(argv: Optional[list[str]] = None) -> int:
     p_val.add_argument("--tesseract-cmd", default=None, help="Path to tesseract.exe (Windows)")
     p_val.add_argument("--ocr-lang", default="eng", help="Tesseract language (default: eng)")
     p_val.add_argument("--ocr-dpi", type=int, default=200, help="OCR render DPI (default: 200)")
+    p_val.add_argument("--ocr-dpi-ladder", type=parse_dpi_ladder, default=None, help="Adaptive OCR DPI, e.g. '150,300': OCR at the lowest DPI, re-OCR a page at the next one only if its text is too short or unparseable (overrides --ocr-dpi)")
     p_val.add_argument("--ocr-max-pages", type=int, default=2, help="Max pages per PDF to OCR when auto-picking (default: 2)")
     p_val.add_argument("--ocr-pages", default=None, help="Explicit page numbers to OCR for DAC (0-based). Examples: '14,38,43' or '10-15,40'")
+    p_val.add_argument("--ocr-workers", type=int, default=1, help="Concurrent tesseract processes per PDF (default: 1)")
+    p_val.add_argument("--ocr-mode", choices=["page", "region"], default="page", help="DAC OCR: whole pages, or only the areas next to the field labels (default: page)")
+    p_val.add_argument("--ocr-incremental", action="store_true", help="DAC OCR one page at a time (label pages first), stopping once all fields are found; --ocr-max-pages is the ceiling")
+    p_val.add_argument("--ocr-backend", choices=["page", "batch", "api", "auto"], default="page", help="Tesseract invocation: one process per page, one per batch of pages, a long-lived engine (tesserocr), or auto (api, else batch) (default: page)")
+    p_val.add_argument("--ocr-dedupe", action="store_true", help="Evidence OCR: pages that look like a page already OCRed (this run or cache) reuse its text (perceptual hash)")
+    p_val.add_argument("--ocr-preprocess", action="store_true", help="Binarize, deskew and crop page images (NumPy) before tesseract; smaller 1-bit input, often allows a lower --ocr-dpi")
+    p_val.add_argument("--ocr-grayscale", action="store_true", help="Render OCR pages as 8-bit grayscale (1/3 the memory of RGB)")
+
+    # Performance
+    p_val.add_argument("--workers", type=int, default=1, help="Process-pool workers for page text extraction of large PDFs (default: 1 = serial)")
+
+    # Caching
+    p_val.add_argument("--no-dac-cache", action="store_true", help="Disable the persistent DAC text/field cache")
+    p_val.add_argument("--excel-stream", action="store_true", help="Run the Excel checks on streamed row chunks and stop reading a sheet once every check's outcome is settled")
+    p_val.add_argument("--excel-compact", action="store_true", help="Load repeating text columns of the Excel exports as categoricals (less memory on large exports, same results)")
+    p_val.add_argument("--workbook-cache", action="store_true", help="Also keep parsed evidence workbooks on disk, so a repeat run on unchanged XLSX exports skips parsing")
+    p_val.add_argument("--cache-dir", default=None, help="Shared OCR/DAC cache dir for all runs (default: $DAISY_CACHE_DIR, else per-run under --out)")
+    p_val.add_argument("--cache-max-bytes", default=str(DEFAULT_MAX_BYTES), help="Shared cache size budget, e.g. 500M, 2G (default: 1G); LRU entries are evicted after each run")
+    p_val.add_argument("--cache-max-entries", type=int, default=DEFAULT_MAX_ENTRIES, help=f"Shared cache entry budget (default: {DEFAULT_MAX_ENTRIES})")
 
     # Debug
     p_val.add_argument("--debug-extract", action="store_true", help="Write extract_debug.json with details on how values were extracted")
 
+    p_cache = sub.add_parser("cache", help="Inspect or prune the shared cache")
+    p_cache.add_argument("action", choices=["stats", "prune"])
+    p_cache.add_argument("--cache-dir", default=None, help="Cache dir (default: $DAISY_CACHE_DIR)")
+    p_cache.add_argument("--max-bytes", default=str(DEFAULT_MAX_BYTES), help="prune: size budget, e.g. 500M, 2G (default: 1G)")
+    p_cache.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES, help=f"prune: entry budget (default: {DEFAULT_MAX_ENTRIES})")
+
     args = parser.parse_args(argv)
 
     if args.cmd == "validate":
         return cmd_validate(args)
+    if args.cmd == "cache":
+        return cmd_cache(args)
 
     print("Unknown command", file=sys.stderr)
     return EXIT_ERROR
@@ -0,0 +1,96 @@
+# src/daisy/dac_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .cache_store import atomic_write_bytes, decode_record, encode_record, touch_entry
+from .pdf_reader import PageText
+from .util import sanitize_json
+
+# Bump whenever DAC text extraction, the OCR overlay or the field extractors
+# change behaviour; old cache entries then simply stop matching.
+EXTRACTOR_VERSION = "1"
+
+_FIELDS = ("cms_id", "it_asset_id", "it_asset_name", "sod", "fa", "upload", "cif")
+
+
+def dac_cache_key(dac_sha256: str, *, ocr: Dict[str, Any]) -> str:
+    """
+    Content-addressed key: DAC sha256 + OCR settings + extractor version.
+    """
+    payload = {
+        "dac_sha256": str(dac_sha256),
+        "extractor_version": EXTRACTOR_VERSION,
+        "ocr": ocr,
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _cache_path(cache_dir: Path, key: str) -> Path:
+    return Path(cache_dir) / f"dac.{key}.json"
+
+
+def load_dac_cache(cache_dir: Path, key: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the cached entry, or None on miss / unreadable / wrong version.
+    """
+    p = _cache_path(cache_dir, key)
+    if not p.exists():
+        return None
+    try:
+        body = decode_record(p.read_bytes())
+        if body is None:
+            logging.warning("DAC cache entry failed checksum, recomputing: %s", p.name)
+            return None
+        data = json.loads(body)
+    except Exception as e:
+        logging.warning("DAC cache unreadable (%s): %s", p.name, e)
+        return None
+
+    if not isinstance(data, dict) or data.get("extractor_version") != EXTRACTOR_VERSION:
+        return None
+    if not isinstance(data.get("pages"), list) or not isinstance(data.get("fields"), dict):
+        return None
+    if not isinstance(data.get("dac_ocr"), dict) or not isinstance(data.get("referenced_xlsx"), list):
+        return None
+
+    data["fields"] = {k: data["fields"].get(k) for k in _FIELDS}
+    touch_entry(p)
+    logging.info("DAC cache hit: %s", p.name)
+    return data
+
+
+def save_dac_cache(
+    cache_dir: Path,
+    key: str,
+    *,
+    pages: Sequence[PageText],
+    dac_ocr: Dict[str, Any],
+    referenced_xlsx: List[str],
+    fields: Dict[str, Optional[str]],
+) -> Path:
+    stored_pages: List[Dict[str, Any]] = []
+    for pg in pages:
+        entry: Dict[str, Any] = {"text": pg.text}
+        # OCR overlay pages keep their own line split; only store it when it differs
+        if pg.lines != [l.rstrip() for l in pg.text.splitlines()]:
+            entry["lines"] = list(pg.lines)
+        stored_pages.append(entry)
+
+    payload = {
+        "extractor_version": EXTRACTOR_VERSION,
+        "key": key,
+        "pages": stored_pages,
+        "dac_ocr": dac_ocr,
+        "referenced_xlsx": list(referenced_xlsx),
+        "fields": {k: fields.get(k) for k in _FIELDS},
+    }
+    p = _cache_path(cache_dir, key)
+    atomic_write_bytes(p, encode_record(json.dumps(sanitize_json(payload), ensure_ascii=False)))
+    logging.info("DAC cache write: %s", p.name)
+    return p
@@ -0,0 +1,138 @@
+# src/daisy/digest.py
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .cache_store import atomic_write_bytes
+from .util import sha256_file
+
+DIGEST_CACHE_VERSION = 1
+
+_StatKey = Tuple[int, int, int]  # (size, mtime_ns, inode)
+
+
+def _stat_key(st: os.stat_result) -> _StatKey:
+    return (int(st.st_size), int(st.st_mtime_ns), int(st.st_ino))
+
+
+class DigestRegistry:
+    """
+    sha256 of files, memoized on (path, size, mtime_ns, inode).
+
+    Hashing is chunked (hashlib drops the GIL while digesting large buffers), so
+    digest_many() can spread files over threads. With a persist path the table
+    survives between runs and unchanged files are never hashed again.
+    """
+
+    def __init__(self, persist_path: Optional[Path] = None):
+        self.persist_path = Path(persist_path) if persist_path else None
+        self._entries: Dict[str, Tuple[_StatKey, str]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.stats: Dict[str, int] = {"hits": 0, "hashed": 0, "bytes_hashed": 0}
+        if self.persist_path is not None:
+            self._load()
+
+    def _load(self) -> None:
+        assert self.persist_path is not None
+        if not self.persist_path.exists():
+            return
+        try:
+            data = json.loads(self.persist_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            logging.warning("Digest cache unreadable (%s): %s", self.persist_path.name, e)
+            return
+        if not isinstance(data, dict) or data.get("version") != DIGEST_CACHE_VERSION:
+            return
+        for path, e in (data.get("entries") or {}).items():
+            try:
+                key = (int(e["size"]), int(e["mtime_ns"]), int(e["ino"]))
+                self._entries[str(path)] = (key, str(e["sha256"]))
+            except Exception:
+                continue
+
+    def save(self) -> None:
+        if self.persist_path is None or not self._dirty:
+            return
+        with self._lock:
+            entries = {
+                path: {"size": k[0], "mtime_ns": k[1], "ino": k[2], "sha256": sha}
+                for path, (k, sha) in sorted(self._entries.items())
+            }
+            self._dirty = False
+        payload = {"version": DIGEST_CACHE_VERSION, "entries": entries}
+        atomic_write_bytes(self.persist_path, json.dumps(payload, indent=2).encode("utf-8"))
+
+    def digest(self, path: Path) -> str:
+        p = Path(path).resolve()
+        st = p.stat()
+        key = _stat_key(st)
+        name = str(p)
+
+        with self._lock:
+            hit = self._entries.get(name)
+            if hit is not None and hit[0] == key:
+                self.stats["hits"] += 1
+                return hit[1]
+
+        sha = sha256_file(p)
+        # Re-stat: if the file changed while hashing, don't remember the digest
+        unchanged = _stat_key(p.stat()) == key
+        with self._lock:
+            self.stats["hashed"] += 1
+            self.stats["bytes_hashed"] += int(st.st_size)
+            if unchanged:
+                self._entries[name] = (key, sha)
+                self._dirty = True
+        return sha
+
+    def digest_many(self, paths: Iterable[Path], workers: int = 4) -> Dict[str, Optional[str]]:
+        """
+        Returns {str(path): sha256 or None if unreadable}, hashing on up to `workers` threads.
+        """
+        plist = [Path(p) for p in paths]
+
+        def one(p: Path) -> Optional[str]:
+            try:
+                return self.digest(p)
+            except Exception as e:
+                logging.warning("Failed hashing %s: %s", p, e)
+                return None
+
+        if int(workers) <= 1 or len(plist) <= 1:
+            return {str(p): one(p) for p in plist}
+        with ThreadPoolExecutor(max_workers=int(workers)) as ex:
+            return dict(zip((str(p) for p in plist), ex.map(one, plist)))
+
+    def stats_dict(self) -> Dict[str, Any]:
+        return {"persistent": self.persist_path is not None, "entries": len(self._entries), **self.stats}
+
+
+_registry = DigestRegistry()
+
+
+def get_digest_registry() -> DigestRegistry:
+    return _registry
+
+
+def configure_digest_registry(persist_path: Optional[Path]) -> DigestRegistry:
+    """
+    Replaces the process-wide registry (CLI calls this once per run).
+    """
+    global _registry
+    _registry = DigestRegistry(persist_path)
+    return _registry
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Content sha256 of a file through the shared registry.
+    """
+    return _registry.digest(path)
+
@@ -1,40 +1,297 @@
 from __future__ import annotations
 
+from array import array
+from contextlib import contextmanager
 from dataclasses import dataclass
+import math
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from .rules import ExcelCheckPlan, ExcelColumnRule
+
+try:
+    from openpyxl.cell.cell import ERROR_CODES as _EXCEL_ERRORS  # type: ignore
+except ImportError:  # pragma: no cover
+    _EXCEL_ERRORS = ()
+
+# Rows per chunk for the streaming checks (see open_column_stream)
+EXCEL_CHUNK_ROWS = 10_000
+
+# Compact loads: a text column becomes categorical while it has at most this
+# share of distinct cells (checked from this many distinct cells on)
+COMPACT_MAX_DISTINCT_RATIO = 0.5
+_COMPACT_MIN_DISTINCT = 1_000
+
 def read_excel_first_sheet(path: Path) -> pd.DataFrame:
     return pd.read_excel(path, sheet_name=0, engine="openpyxl")
 
+def _excel_cell(v: Any) -> Any:
+    # Same conversion as pandas' openpyxl reader, from values_only rows
+    if v is None:
+        return ""
+    if isinstance(v, float):
+        return int(v) if v.is_integer() else v
+    if isinstance(v, str) and v in _EXCEL_ERRORS:
+        return np.nan
+    return v
+
+def _projected_rows(rows: Iterator[Tuple[Any, ...]], idx: List[int]) -> Iterator[Tuple[Any, ...]]:
+    """
+    Converted cells at `idx` of every data row. pandas keeps a row if *any*
+    cell in it is set and drops trailing empty rows, so runs of empty rows are
+    held back (as a count) until a later row has data.
+    """
+    blank = tuple("" for _ in idx)
+    pending = 0
+    for row in rows:
+        if not any(v is not None and v != "" for v in row):
+            pending += 1
+            continue
+        for _ in range(pending):
+            yield blank
+        pending = 0
+        yield tuple(_excel_cell(row[k]) if k < len(row) else "" for k in idx)
+
+def _header_index(header: Tuple[Any, ...], columns: Sequence[str]) -> List[int]:
+    # First occurrence of each wanted name (pandas would mangle later duplicates)
+    wanted = set(columns)
+    idx: List[int] = []
+    seen = set()
+    for k, name in enumerate(header):
+        if name in wanted and name not in seen:
+            idx.append(k)
+            seen.add(name)
+    return idx
+
+def _parse_rows(names: List[Any], data: List[Tuple[Any, ...]], dtype: Any = None) -> pd.DataFrame:
+    # The TextParser read_excel itself uses: same NA strings and dtype inference
+    from pandas.io.parsers import TextParser
+
+    return TextParser([names] + data, header=0, skip_blank_lines=False, dtype=dtype).read()
+
+class _CompactColumn:
+    """
+    Cells of one projected column, dictionary-encoded (int32 codes into the
+    distinct cells) for as long as they repeat enough; past that share of
+    distinct cells the column falls back to a plain list of cells.
+    """
+
+    def __init__(self) -> None:
+        self.index: Optional[Dict[Any, int]] = {}
+        self.distinct: List[Any] = []
+        self.codes = array("i")
+        self.plain: Optional[List[Any]] = None
+
+    def add(self, v: Any) -> None:
+        if self.plain is not None:
+            self.plain.append(v)
+            return
+        assert self.index is not None
+        # 1 == 1.0 == True, but they are different cells
+        key = v if type(v) is str else (type(v), v)
+        c = self.index.get(key)
+        if c is None:
+            c = self.index[key] = len(self.distinct)
+            self.distinct.append(v)
+            if c >= _COMPACT_MIN_DISTINCT and c > len(self.codes) * COMPACT_MAX_DISTINCT_RATIO:
+                self.plain = [self.distinct[i] for i in self.codes] + [v]
+                self.index, self.distinct, self.codes = None, [], array("i")
+                return
+        self.codes.append(c)
+
+    def series(self, name: Any) -> pd.Series:
+        if self.plain is not None:
+            return _parse_rows([name], [(v,) for v in self.plain]).iloc[:, 0]
+        # pandas infers a column's dtype from the set of its cells, so parsing
+        # only the distinct ones gives the same values and dtype
+        conv = _parse_rows([name], [(v,) for v in self.distinct]).iloc[:, 0]
+        codes = np.frombuffer(self.codes, dtype=np.int32) if len(self.codes) else np.zeros(0, dtype=np.int32)
+        if conv.dtype == object or isinstance(conv.dtype, pd.StringDtype):
+            keep = conv.notna().to_numpy(dtype=bool)
+            if int(keep.sum()) <= max(1, int(len(codes) * COMPACT_MAX_DISTINCT_RATIO)):
+                remap = np.full(len(conv), -1, dtype=np.int32)
+                remap[keep] = np.arange(int(keep.sum()), dtype=np.int32)
+                try:
+                    cats = pd.Index(conv.to_numpy(dtype=object)[keep], dtype=object)
+                    return pd.Series(pd.Categorical.from_codes(remap[codes], categories=cats), name=conv.name)
+                except ValueError:
+                    pass  # distinct cells that parse to equal values (categories must be unique)
+        return pd.Series(conv.array.take(codes), name=conv.name)
+
+def _read_compact(names: List[Any], rows: Iterator[Tuple[Any, ...]], idx: List[int]) -> pd.DataFrame:
+    cols = [_CompactColumn() for _ in idx]
+    n = 0
+    for row in _projected_rows(rows, idx):
+        n += 1
+        for col, v in zip(cols, row):
+            col.add(v)
+    if not idx:
+        return pd.DataFrame(index=pd.RangeIndex(n))
+    return pd.DataFrame({name: col.series(name) for name, col in zip(names, cols)})
+
+def read_excel_columns(path: Path, columns: Sequence[str], compact: bool = False) -> pd.DataFrame:
+    """
+    First sheet restricted to `columns` (those present in the header row; the
+    rest are simply absent, as with read_excel_first_sheet). The sheet is
+    streamed row by row with openpyxl read_only and only the projected cells
+    are kept, so a wide export never exists in memory as a whole. Values,
+    dtypes and the row count match read_excel_first_sheet() on those columns.
+
+    compact=True keeps repeating text columns (IDs, SoD Area, owners, ...) as
+    categoricals: cells are dictionary-encoded while they are read, so no
+    row tuples or per-cell objects are held for them. Other text columns keep
+    pandas' string dtype (Arrow-backed when pyarrow is installed). Values are
+    the same as without it; .astype(object) gives back the plain frame.
+    """
+    from openpyxl import load_workbook  # type: ignore
+
+    wb = load_workbook(Path(path), read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()  # exports often carry a wrong <dimension>
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        idx = _header_index(header, columns)
+        if compact:
+            return _read_compact([header[k] for k in idx], rows, idx)
+        data = list(_projected_rows(rows, idx))
+    finally:
+        wb.close()
+
+    if not idx:
+        return pd.DataFrame(index=pd.RangeIndex(len(data)))
+    return _parse_rows([header[k] for k in idx], data)
+
+@dataclass
+class ColumnStream:
+    columns: List[str]  # requested columns present in the header row
+    row_estimate: Optional[int]  # data rows per the sheet's <dimension>; None if absent/implausible
+    chunks: Iterator[pd.DataFrame]
+
+@contextmanager
+def open_column_stream(path: Path, columns: Sequence[str], chunk_rows: int = EXCEL_CHUNK_ROWS) -> Iterator[ColumnStream]:
+    """
+    read_excel_columns() in chunks of `chunk_rows` rows, for checks that keep
+    running counts instead of a whole frame (see run_row_checks). Columns come
+    back as object dtype: inferring per chunk would turn a text column into
+    numbers in a chunk that happens to hold only digits.
+    """
+    from openpyxl import load_workbook  # type: ignore
+
+    wb = load_workbook(Path(path), read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb.worksheets[0]
+        # The stored <dimension> is only an estimate (some writers leave it at A1)
+        try:
+            max_row = ws.max_row
+        except Exception:
+            max_row = None
+        estimate = int(max_row) - 1 if max_row and int(max_row) > 2 else None
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        idx = _header_index(header, columns)
+        names = [header[k] for k in idx]
+
+        def chunks() -> Iterator[pd.DataFrame]:
+            buf: List[Tuple[Any, ...]] = []
+            for r in _projected_rows(rows, idx):
+                buf.append(r)
+                if len(buf) >= chunk_rows:
+                    yield _parse_rows(names, buf, object) if idx else pd.DataFrame(index=pd.RangeIndex(len(buf)))
+                    buf = []
+            if buf:
+                yield _parse_rows(names, buf, object) if idx else pd.DataFrame(index=pd.RangeIndex(len(buf)))
+
+        yield ColumnStream(columns=[str(n) for n in names], row_estimate=estimate, chunks=chunks())
+    finally:
+        wb.close()
+
 def col_exists(df: pd.DataFrame, col: str) -> bool:
     return col in df.columns
 
+def _filled_categories(s: pd.Series) -> np.ndarray:
+    # non_empty_series() of a categorical: each category is tested once and
+    # the codes pick the results (-1, NaN, picks the False appended last)
+    cats = pd.Series(np.asarray(s.cat.categories, dtype=object))
+    ok = np.append(cats.astype(str).str.strip().ne("").to_numpy(dtype=bool), False)
+    return ok[s.cat.codes.to_numpy()]
+
 def non_empty_series(s: pd.Series) -> pd.Series:
     # treat NaN, None, empty string as empty
-    return s.fillna("").astype(str).str.strip().ne("")
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return pd.Series(_filled_categories(s), index=s.index, name=s.name)
+    return pd.Series(_stripped_text(s) != "", index=s.index, name=s.name)
+
+_MIN_DESCRIPTION_LEN = 8
+_PLACEHOLDER_DESCRIPTIONS = frozenset({"...", "tbd", "n/a", "na"})
 
 def meaningful_description(desc: str, display_name: str = "") -> bool:
     d = (desc or "").strip()
     if not d:
         return False
-    if len(d) < 8:
+    if len(d) < _MIN_DESCRIPTION_LEN:
         return False
     # If it's literally the display name, it's not a description
     if display_name and d.strip().lower() == str(display_name).strip().lower():
         return False
     # Common placeholders
-    if d.strip() in {"...", "tbd", "n/a", "na"}:
+    if d.strip() in _PLACEHOLDER_DESCRIPTIONS:
         return False
     return True
 
+def _cell_text(v: Any) -> str:
+    # A cell as every check sees it. Whole numbers read as "2", not "2.0", and
+    # booleans as "1" / "0": read_excel turns an int or bool column with gaps
+    # into floats (and bools mixed with ints into ints), while streamed object
+    # chunks keep the ints and bools, so this is the one text both agree on
+    if isinstance(v, (bool, np.bool_)):
+        return "1" if v else "0"
+    if isinstance(v, float) and math.isfinite(v) and v == int(v):
+        return str(int(v))
+    return str(v).strip()
+
+def _stripped_text(s: pd.Series) -> np.ndarray:
+    # _cell_text() of every cell, NaN as "": what non_empty_series(),
+    # meaningful_description() and the plan checks look at. Each distinct
+    # cell (category, for categoricals) is converted once
+    codes, uniques = pd.factorize(s)
+    texts = np.array([_cell_text(u) for u in uniques] + [""], dtype=object)
+    return texts[codes]
+
+def _description_ok(d: np.ndarray, display: np.ndarray) -> np.ndarray:
+    # meaningful_description() per row of stripped text; a plain loop beats
+    # the pandas .str equivalent here (it would need four passes)
+    return np.fromiter((meaningful_description(x, n) for x, n in zip(d, display)), dtype=bool, count=len(d))
+
+def meaningful_description_mask(display: pd.Series, desc: pd.Series) -> pd.Series:
+    """
+    meaningful_description() over whole columns, NaN cells as "".
+    """
+    return pd.Series(_description_ok(_stripped_text(desc), _stripped_text(display)), index=desc.index)
+
+def any_non_empty(df: pd.DataFrame, cols: Sequence[str]) -> pd.Series:
+    """
+    Row has at least one of `cols` filled (after strip); True when `cols` is empty.
+    """
+    if not cols:
+        return pd.Series(True, index=df.index)
+    return pd.Series(np.logical_or.reduce([non_empty_series(df[c]).to_numpy(dtype=bool) for c in cols]), index=df.index)
+
 @dataclass
 class ExcelCheckFinding:
     total_rows: int
     failing_rows: int
     sample_rows: List[Dict[str, Any]]
+    # Streaming checks that stopped early: failing_rows is a lower bound and
+    # total_rows the sheet's own row count estimate
+    complete: bool = True
+    rows_scanned: Optional[int] = None
 
 def check_required_columns_non_empty(
     df: pd.DataFrame,
@@ -79,10 +336,7 @@ def check_meaningful_descriptions(
             sample_rows=[{"error": f"Missing columns: {[c for c in [display_col, desc_col] if c not in df.columns]}"}],
         )
 
-    ok = []
-    for dn, desc in zip(df[display_col].fillna(""), df[desc_col].fillna("")):
-        ok.append(meaningful_description(str(desc), str(dn)))
-    ok = pd.Series(ok, index=df.index)
+    ok = meaningful_description_mask(df[display_col], df[desc_col])
     failing = df.loc[~ok]
     samples = failing[[display_col, desc_col]].head(max_samples).to_dict(orient="records") if not failing.empty else []
     return ExcelCheckFinding(
@@ -90,3 +344,306 @@ def check_meaningful_descriptions(
         failing_rows=int((~ok).sum()),
         sample_rows=samples,
     )
+
+# -----------------------------------------------------------------------------
+# Streaming checks: row masks evaluated chunk by chunk with running counts
+# -----------------------------------------------------------------------------
+
+class RowCheck:
+    """
+    One row-mask check over streamed chunks: running failing count and the
+    first `max_samples` failing rows. It is settled (its outcome can no longer
+    change, so it needs no more rows) once it has more than
+    `settle_failing_above` failures and a full sample set, or
+    `settle_passing_at` passing rows. A check whose required columns are
+    missing fails every row, as check_required_columns_non_empty() does.
+    """
+
+    def __init__(
+        self,
+        mask_fn: Callable[[pd.DataFrame], pd.Series],
+        *,
+        required_cols: Sequence[str] = (),
+        sample_cols: Sequence[str] = (),
+        max_samples: int = 5,
+        settle_failing_above: Optional[int] = None,
+        settle_passing_at: Optional[int] = None,
+    ):
+        self.mask_fn = mask_fn
+        self.required_cols = list(required_cols)
+        self.sample_cols = list(sample_cols)
+        self.max_samples = int(max_samples)
+        self.settle_failing_above = settle_failing_above
+        self.settle_passing_at = settle_passing_at
+        self.rows = 0
+        self.failing = 0
+        self.samples: List[Dict[str, Any]] = []
+        self.missing: List[str] = []
+
+    @property
+    def settled(self) -> bool:
+        if self.settle_passing_at is not None and self.rows - self.failing >= self.settle_passing_at:
+            return True
+        return (
+            self.settle_failing_above is not None
+            and self.failing > self.settle_failing_above
+            and (bool(self.missing) or len(self.samples) >= self.max_samples)
+        )
+
+    def start(self, columns: Sequence[str]) -> None:
+        self.missing = [c for c in self.required_cols if c not in columns]
+        self.sample_cols = [c for c in self.sample_cols if c in columns]
+
+    def add(self, chunk: pd.DataFrame) -> None:
+        self.rows += len(chunk)
+        if self.missing:
+            self.failing += len(chunk)
+            return
+        bad = ~self.mask_fn(chunk)
+        self.failing += int(bad.sum())
+        room = self.max_samples - len(self.samples)
+        if room > 0 and self.sample_cols:
+            self.samples += chunk.loc[bad, self.sample_cols].head(room).to_dict(orient="records")
+
+    def finding(self, total_rows: int, complete: bool) -> ExcelCheckFinding:
+        if self.missing:
+            return ExcelCheckFinding(
+                total_rows=total_rows,
+                failing_rows=total_rows,
+                sample_rows=[{"error": f"Missing columns: {self.missing}"}],
+                complete=complete,
+                rows_scanned=self.rows,
+            )
+        return ExcelCheckFinding(
+            total_rows=total_rows,
+            failing_rows=self.failing,
+            sample_rows=self.samples,
+            complete=complete,
+            rows_scanned=self.rows,
+        )
+
+
+@dataclass
+class StreamResult:
+    findings: Dict[str, ExcelCheckFinding]
+    columns: List[str]
+    rows_scanned: int
+    complete: bool  # False when the sheet was not read to the end
+    row_estimate: Optional[int]
+    chunks: int
+
+
+def run_row_checks(stream: ColumnStream, checks: Dict[str, RowCheck]) -> StreamResult:
+    """
+    Feeds the stream's chunks to all checks and stops reading the sheet as
+    soon as every one of them is settled. When it stops early, the findings
+    carry the sheet's row estimate (or the rows read, without one) as
+    total_rows and complete=False. A sheet whose last chunk settles the checks
+    was read in full and stays complete.
+    """
+    if not checks:
+        return StreamResult({}, list(stream.columns), 0, False, stream.row_estimate, 0)
+    for c in checks.values():
+        c.start(stream.columns)
+    rows = 0
+    chunks = 0
+    complete = True
+    est = stream.row_estimate
+    it = iter(stream.chunks)
+    chunk = next(it, None)
+    while chunk is not None:
+        chunks += 1
+        rows += len(chunk)
+        # Every check sees every chunk read: once past the estimate the row
+        # count is unknown, tolerances derived from it no longer hold and the
+        # sheet is read to the end, so no check may have skipped rows
+        for c in checks.values():
+            c.add(chunk)
+        if all(c.settled for c in checks.values()) and (est is None or rows <= est):
+            # Peek one chunk: a stop is early only if rows are left (the
+            # estimate can be high). At the estimate with rows still to come
+            # it was low, so read to the end (see above).
+            chunk = next(it, None)
+            if chunk is not None and (est is None or rows < est):
+                complete = False
+                break
+            continue
+        chunk = next(it, None)
+
+    total = rows if complete else max(rows, stream.row_estimate or 0)
+    findings = {name: c.finding(total, complete) for name, c in checks.items()}
+    return StreamResult(
+        findings=findings,
+        columns=list(stream.columns),
+        rows_scanned=rows,
+        complete=complete,
+        row_estimate=stream.row_estimate,
+        chunks=chunks,
+    )
+
+
+def required_non_empty_check(
+    required_cols: Sequence[str],
+    id_col: Optional[str] = None,
+    max_samples: int = 5,
+    **settle: Any,
+) -> RowCheck:
+    """
+    Streaming check_required_columns_non_empty().
+    """
+    cols = list(required_cols)
+
+    def mask(chunk: pd.DataFrame) -> pd.Series:
+        ok = pd.Series(True, index=chunk.index)
+        for c in cols:
+            ok &= non_empty_series(chunk[c])
+        return ok
+
+    sample_cols = list(dict.fromkeys(([id_col] if id_col else []) + cols))
+    return RowCheck(mask, required_cols=cols, sample_cols=sample_cols, max_samples=max_samples, **settle)
+
+
+def meaningful_descriptions_check(display_col: str, desc_col: str, max_samples: int = 5, **settle: Any) -> RowCheck:
+    """
+    Streaming check_meaningful_descriptions().
+    """
+
+    return RowCheck(
+        lambda chunk: meaningful_description_mask(chunk[display_col], chunk[desc_col]),
+        required_cols=[display_col, desc_col],
+        sample_cols=[display_col, desc_col],
+        max_samples=max_samples,
+        **settle,
+    )
+
+
+# -----------------------------------------------------------------------------
+# Column-rule plans (rules.yaml excel_checks): all checks of an export in one pass
+# -----------------------------------------------------------------------------
+
+class _NormalizedColumns:
+    """
+    Per-frame cache of the normalized columns the checks look at, so a column
+    shared by several checks is stripped (and tested for emptiness) once.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._text: Dict[str, np.ndarray] = {}
+        self._filled: Dict[str, np.ndarray] = {}
+
+    def text(self, col: str) -> np.ndarray:
+        t = self._text.get(col)
+        if t is None:
+            t = self._text[col] = _stripped_text(self.df[col])
+        return t
+
+    def filled(self, col: str) -> np.ndarray:
+        f = self._filled.get(col)
+        if f is None:
+            s = self.df[col]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                f = _filled_categories(s)  # no per-row text needed
+            else:
+                f = np.asarray(self.text(col) != "", dtype=bool)
+            self._filled[col] = f
+        return f
+
+    def notna(self, col: str) -> np.ndarray:
+        return self.df[col].notna().to_numpy(dtype=bool)
+
+def _rule_mask(rule: ExcelColumnRule, norm: _NormalizedColumns, columns: Sequence[str]) -> np.ndarray:
+    ok = np.ones(len(norm.df), dtype=bool)
+    for c in rule.columns:
+        if rule.type == "non_empty":
+            ok &= norm.filled(c)
+        elif rule.type == "meaningful_description":
+            ok &= _description_ok(norm.text(c), norm.text(rule.display_column))
+        elif rule.type == "allowed_values":
+            hit = np.isin(norm.text(c).astype(object), list(rule.values))
+            ok &= (hit | ~norm.filled(c)) if rule.allow_empty else hit
+        elif rule.type == "regex":
+            # Exports repeat values heavily: match each distinct cell once
+            codes, uniques = pd.factorize(norm.text(c).astype(object))
+            matched = np.array([rule.regex.fullmatch(u) is not None for u in uniques], dtype=bool)
+            hit = matched[codes] if len(codes) else np.zeros(0, dtype=bool)
+            ok &= (hit | ~norm.filled(c)) if rule.allow_empty else hit
+    for c in rule.not_null:
+        ok &= norm.notna(c)
+    present = [c for c in rule.any_of if c in columns]
+    if present:
+        ok &= np.logical_or.reduce([norm.filled(c) for c in present])
+    return ok
+
+def _plan_runnable(rule: ExcelColumnRule, columns: Sequence[str]) -> bool:
+    # "not_met" checks with a missing column get no finding; the caller reports them
+    return rule.missing_columns != "not_met" or all(c in columns for c in rule.required)
+
+def check_plan_masks(plan: ExcelCheckPlan, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Row masks (True = row passes) of every check of `plan` that has all its
+    required columns in `df`, by check id, from one normalization of the
+    columns they read.
+    """
+    norm = _NormalizedColumns(df)
+    cols = list(df.columns)
+    return {
+        r.id: _rule_mask(r, norm, cols)
+        for r in plan.checks
+        if _plan_runnable(r, cols) and all(c in cols for c in r.required)
+    }
+
+def evaluate_check_plan(plan: ExcelCheckPlan, df: pd.DataFrame, max_samples: int = 5) -> Dict[str, ExcelCheckFinding]:
+    """
+    Findings of all checks of `plan` on a whole frame, by check id. As with
+    check_required_columns_non_empty(), a check missing a required column
+    fails every row, unless it is a missing_columns="not_met" check, which
+    is left out.
+    """
+    cols = list(df.columns)
+    masks = check_plan_masks(plan, df)
+    findings: Dict[str, ExcelCheckFinding] = {}
+    for r in plan.checks:
+        if not _plan_runnable(r, cols):
+            continue
+        ok = masks.get(r.id)
+        if ok is None:
+            missing = [c for c in r.required if c not in cols]
+            findings[r.id] = ExcelCheckFinding(len(df), len(df), [{"error": f"Missing columns: {missing}"}])
+            continue
+        sample_cols = [c for c in r.sample_columns if c in cols]
+        failing = df.loc[~ok]
+        samples = failing[sample_cols].head(max_samples).to_dict(orient="records") if not failing.empty else []
+        findings[r.id] = ExcelCheckFinding(total_rows=len(df), failing_rows=int((~ok).sum()), sample_rows=samples)
+    return findings
+
+def check_plan_row_checks(
+    plan: ExcelCheckPlan,
+    columns: Sequence[str],
+    settle_failing_above: Optional[Dict[str, Optional[int]]] = None,
+    max_samples: int = 5,
+) -> Dict[str, RowCheck]:
+    """
+    Streaming evaluate_check_plan(): one RowCheck per check id, all fed from
+    a single check_plan_masks() call per chunk.
+    """
+    settle = settle_failing_above or {}
+    last: Dict[str, Any] = {"chunk": None, "masks": {}}
+
+    def masks_of(chunk: pd.DataFrame) -> Dict[str, np.ndarray]:
+        if last["chunk"] is not chunk:
+            last["chunk"], last["masks"] = chunk, check_plan_masks(plan, chunk)
+        return last["masks"]
+
+    checks: Dict[str, RowCheck] = {}
+    for r in plan.checks:
+        if not _plan_runnable(r, columns):
+            continue
+        checks[r.id] = RowCheck(
+            lambda chunk, rid=r.id: pd.Series(masks_of(chunk)[rid], index=chunk.index),
+            required_cols=r.required,
+            sample_cols=r.sample_columns,
+            max_samples=max_samples,
+            settle_failing_above=settle.get(r.id),
+        )
+    return checks
@@ -1,41 +1,208 @@
 # src/daisy/ocr.py
 from __future__ import annotations
 
+import atexit
 import hashlib
 import logging
+import queue
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional, Tuple, List
+from typing import Any, Callable, Dict, Optional, Sequence, Set, Tuple, List
 
 import fitz  # PyMuPDF
 
+from .cache_store import (
+    LOCK_WAIT_SEC,
+    CacheLock,
+    atomic_write_bytes,
+    decode_record,
+    decode_record_attrs,
+    encode_record,
+    touch_entry,
+)
+from .digest import file_sha256
+from .ocr_dedupe import PageHashIndex, PageSignature, hamming, page_signature, same_page
+from .ocr_preprocess import PreprocessConfig, render_preprocessed
+from .ocr_regions import RegionJob, recognize_region_job, render_region_job
+
 
 def _sha8(s: bytes) -> str:
     return hashlib.sha256(s).hexdigest()[:8]
 
 
-def _cache_key(pdf_path: Path, *, lang: str, dpi: int, max_pages: int, pages: Optional[List[int]]) -> str:
+OCR_MODES = ("page", "region")
+# Cache preprocessing id prefix for label-region OCR results
+REGION_PREP_ID = "region1"
+
+# Bounded render->OCR queue: at most this many rendered pages wait for tesseract
+# (a 300 DPI A3 page is ~52 MB as RGB, ~17 MB as grayscale)
+OCR_QUEUE_DEPTH = 2
+
+# Adaptive DPI: a page OCRed at a lower rung of the DPI ladder is re-OCRed at the
+# next one when its text is shorter than this (page mode) or the caller's
+# accept() check rejects it
+ADAPTIVE_MIN_CHARS = 40
+
+
+def _preprocess_id(grayscale: bool, preprocess: Optional[PreprocessConfig] = None) -> str:
+    """
+    Identifies the image handed to tesseract in the page cache key; extend when
+    the render/preprocessing pipeline changes.
+    """
+    if preprocess is not None:
+        return preprocess.cache_id()  # always rendered as gray
+    return "gray" if grayscale else "rgb"
+
+
+def _prep_for(grayscale: bool, mode: str, preprocess: Optional[PreprocessConfig] = None) -> str:
+    # Region clips are not preprocessed
+    if mode == "region":
+        return f"{REGION_PREP_ID}-{_preprocess_id(grayscale)}"
+    return _preprocess_id(grayscale, preprocess)
+
+
+def parse_dpi_ladder(value: Any) -> List[int]:
+    """
+    "150,300" / [150, 300] -> ascending unique DPIs.
+    """
+    items = value.split(",") if isinstance(value, str) else list(value or [])
+    ladder = sorted(set(int(str(x).strip()) for x in items if str(x).strip()))
+    if not ladder or ladder[0] <= 0:
+        raise ValueError(f"invalid DPI ladder: {value!r}")
+    return ladder
+
+
+def _doc_sha256(pdf_path: Path) -> str:
     try:
-        b = pdf_path.read_bytes()
+        return file_sha256(pdf_path)
     except Exception:
-        b = (str(pdf_path).encode("utf-8"))
+        return hashlib.sha256(str(pdf_path).encode("utf-8")).hexdigest()
+
+
+def _stream_hasher(pdf_path: Path) -> "hashlib._Hash":
+    h = hashlib.sha256()
+    try:
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+    except Exception:
+        h.update(str(pdf_path).encode("utf-8"))
+    return h
+
+
+def _legacy_cache_keys(base: "hashlib._Hash", page_set: List[int], *, lang: str, dpi: int) -> Set[str]:
+    """
+    Keys the old page-set cache files (<stem>.<key>.txt) could have had for this
+    page set: "pages=<list>" for explicit pages, "first=<N>" for auto-picked
+    first pages (N may exceed the page count of a short document).
+    `base` is a sha256 that has already consumed the document bytes.
+    """
+    specs = ["pages=" + ",".join(str(int(p)) for p in page_set)]
+    if page_set == list(range(len(page_set))):
+        specs += [f"first={n}" for n in range(len(page_set), len(page_set) + 16)]
+
+    keys: Set[str] = set()
+    for spec in specs:
+        h = base.copy()
+        h.update(f"|lang={lang}|dpi={dpi}|{spec}".encode("utf-8"))
+        keys.add(h.hexdigest()[:8])
+    return keys
+
+
+def _page_cache_path(cache_dir: Path, doc_sha: str, page: int, *, lang: str, dpi: int, prep: str = "rgb") -> Path:
+    settings = _sha8(f"lang={lang}|dpi={int(dpi)}|prep={prep}".encode("utf-8"))
+    return cache_dir / "pages" / doc_sha[:16] / f"p{int(page):05d}.{settings}.txt"
+
+
+def _read_cached_pages(cache_dir: Path, doc_sha: str, pages: List[int], *, lang: str, dpi: int, prep: str = "rgb") -> Dict[int, str]:
+    out: Dict[int, str] = {}
+    for i in pages:
+        p = _page_cache_path(cache_dir, doc_sha, i, lang=lang, dpi=dpi, prep=prep)
+        if not p.exists():
+            continue
+        try:
+            text = decode_record(p.read_bytes())
+        except OSError:
+            continue
+        if text is None:
+            # Torn or corrupt entry: treat as a miss; the re-OCR overwrites it
+            logging.warning("OCR cache: bad checksum, recomputing %s", p.name)
+            continue
+        out[i] = text
+        touch_entry(p)
+    return out
 
-    pages_spec = ""
-    if pages:
-        pages_spec = "pages=" + ",".join(str(int(p)) for p in pages)
-    else:
-        pages_spec = f"first={int(max_pages)}"
 
-    payload = b + f"|lang={lang}|dpi={dpi}|{pages_spec}".encode("utf-8")
-    return _sha8(payload)
+def _write_cached_page(cache_dir: Path, doc_sha: str, page: int, text: str, *, lang: str, dpi: int, prep: str = "rgb") -> None:
+    atomic_write_bytes(_page_cache_path(cache_dir, doc_sha, page, lang=lang, dpi=dpi, prep=prep), encode_record(text))
 
 
-def _write_cache_txt(path: Path, ocr_pages: Dict[int, str]) -> None:
-    # Simple text cache with page markers
-    parts: List[str] = []
-    for i in sorted(ocr_pages.keys()):
-        parts.append(f"===PAGE {i}===\n")
-        parts.append((ocr_pages[i] or "").rstrip() + "\n")
-    path.write_text("".join(parts), encoding="utf-8")
+def _accepted_cache_path(
+    cache_dir: Path, doc_sha: str, page: int, *, lang: str, ladder: List[int], prep: str, accept_id: str, min_chars: int
+) -> Path:
+    rungs = ",".join(str(d) for d in ladder)
+    settings = _sha8(f"lang={lang}|dpi=auto:{rungs}|prep={prep}|accept={accept_id}|min={int(min_chars)}".encode("utf-8"))
+    return cache_dir / "pages" / doc_sha[:16] / f"p{int(page):05d}.{settings}.txt"
+
+
+def _read_accepted_pages(cache_dir: Path, doc_sha: str, pages: List[int], **spec: Any) -> Dict[int, Tuple[str, int]]:
+    """
+    Adaptive-DPI results: {page: (text, dpi that produced it)}.
+    """
+    out: Dict[int, Tuple[str, int]] = {}
+    for i in pages:
+        p = _accepted_cache_path(cache_dir, doc_sha, i, **spec)
+        if not p.exists():
+            continue
+        try:
+            rec = decode_record_attrs(p.read_bytes())
+        except OSError:
+            continue
+        if rec is None or "dpi" not in rec[1]:
+            logging.warning("OCR cache: bad checksum, recomputing %s", p.name)
+            continue
+        out[i] = (rec[0], int(rec[1]["dpi"]))
+        touch_entry(p)
+    return out
+
+
+def _migrate_legacy_cache(cache_dir: Path, pdf_path: Path, doc_sha: str, *, lang: str, dpi: int) -> int:
+    """
+    Imports pages from old <stem>.<key>.txt files into the per-page cache.
+
+    A legacy file is only trusted when its key re-computes from this document's
+    bytes, the requested lang/dpi and the page set it contains, i.e. it was
+    produced by exactly these settings. Returns the number of pages imported.
+    """
+    imported = 0
+    base: Optional["hashlib._Hash"] = None
+    for f in sorted(cache_dir.glob(f"{pdf_path.stem}.*.txt")):
+        key = f.name[len(pdf_path.stem) + 1 : -len(".txt")]
+        if len(key) != 8:
+            continue
+        try:
+            legacy = _read_cache_txt(f)
+        except Exception:
+            continue
+        if not legacy:
+            continue
+
+        if base is None:
+            base = _stream_hasher(pdf_path)
+        if key not in _legacy_cache_keys(base, sorted(legacy), lang=lang, dpi=int(dpi)):
+            continue
+
+        for i, text in legacy.items():
+            # Legacy files stored failed pages as empty text; leave those to be retried
+            if not text.strip():
+                continue
+            if not _page_cache_path(cache_dir, doc_sha, i, lang=lang, dpi=dpi).exists():
+                _write_cached_page(cache_dir, doc_sha, i, text, lang=lang, dpi=dpi)
+                imported += 1
+    if imported:
+        logging.info("OCR cache: migrated %d legacy page(s) for %s", imported, pdf_path.name)
+    return imported
 
 
 def _read_cache_txt(path: Path) -> Dict[int, str]:
@@ -65,6 +232,480 @@ def _read_cache_txt(path: Path) -> Dict[int, str]:
     return out
 
 
+def _tesseract_page(img: Any, lang: str) -> Tuple[str, float, Optional[str]]:
+    """
+    Runs tesseract on one rendered page. Never raises: returns (text, sec, error).
+    """
+    import pytesseract  # type: ignore
+
+    t0 = time.perf_counter()
+    try:
+        text = pytesseract.image_to_string(img, lang=lang) or ""
+        return text, time.perf_counter() - t0, None
+    except Exception as e:
+        return "", time.perf_counter() - t0, f"{type(e).__name__}: {e}"
+
+
+# -----------------------------------------------------------------------------
+# OCR backends (page mode). "page" is one tesseract process per page (the
+# original path); "batch" hands several page images to one tesseract process
+# via its file-list input; "api" keeps tesseract engines loaded (tesserocr)
+# for the whole run. "auto" picks api, else batch; every backend falls back to
+# the per-page path when it cannot run.
+# -----------------------------------------------------------------------------
+
+OCR_BACKENDS = ("page", "batch", "api", "auto")
+OCR_BATCH_SIZE = 8
+
+OcrResult = Tuple[str, float, Optional[str]]
+
+# Per-process startup cost of the tesseract CLI (model load etc.), per (cmd, lang)
+_startup_probe_cache: Dict[Tuple[str, str], Optional[float]] = {}
+_startup_probe_lock = threading.Lock()
+
+
+def _tesseract_cmd() -> str:
+    try:
+        import pytesseract  # type: ignore
+
+        return str(pytesseract.pytesseract.tesseract_cmd or "tesseract")
+    except Exception:
+        return "tesseract"
+
+
+def _startup_probe(lang: str) -> Optional[float]:
+    """
+    Seconds one tesseract process needs on an empty 8x8 image, i.e. the fixed
+    cost paid per invocation. Measured once per run; None if tesseract can't run.
+    """
+    import subprocess
+
+    key = (_tesseract_cmd(), lang)
+    with _startup_probe_lock:
+        if key in _startup_probe_cache:
+            return _startup_probe_cache[key]
+        try:
+            from PIL import Image  # type: ignore
+            import io
+
+            buf = io.BytesIO()
+            Image.new("L", (8, 8), 255).save(buf, format="PNG")
+            t0 = time.perf_counter()
+            subprocess.run(
+                [key[0], "stdin", "stdout", "-l", lang], input=buf.getvalue(),
+                capture_output=True, timeout=60, check=True,
+            )
+            sec: Optional[float] = time.perf_counter() - t0
+        except Exception:
+            sec = None
+        _startup_probe_cache[key] = sec
+        return sec
+
+
+class OcrBackend:
+    """
+    Per-page tesseract calls; base class for the other backends.
+    """
+
+    name = "page"
+    batch_size = 1
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {"invocations": 0, "pages": 0, "ocr_sec": 0.0, "fallback_pages": 0}
+
+    def _count(self, invocations: int, pages: int, sec: float) -> None:
+        with self._lock:
+            self.stats["invocations"] += invocations
+            self.stats["pages"] += pages
+            self.stats["ocr_sec"] += sec
+
+    def recognize(self, img: Any) -> OcrResult:
+        out = _tesseract_page(img, self.lang)
+        self._count(1, 1, out[1])
+        return out
+
+    def recognize_batch(self, imgs: List[Any]) -> List[OcrResult]:
+        return [self.recognize(img) for img in imgs]
+
+    def stats_dict(self) -> Dict[str, Any]:
+        """
+        Counters and seconds of this backend. "invocations" counts tesseract
+        processes; their startup share of ocr_sec is not measured here (see
+        add_startup_estimate()).
+        """
+        return {
+            "backend": self.name,
+            "invocations": self.stats["invocations"],
+            "pages": self.stats["pages"],
+            "fallback_pages": self.stats["fallback_pages"],
+            "ocr_sec": round(float(self.stats["ocr_sec"]), 4),
+        }
+
+
+class BatchOcrBackend(OcrBackend):
+    """
+    One tesseract process for up to batch_size pages: the images are written to
+    a temp dir and tesseract reads them from a list file. Its text output has
+    one form feed per page; if the page count does not match, or tesseract
+    fails, the batch is redone page by page.
+    """
+
+    name = "batch"
+
+    def __init__(self, lang: str, batch_size: int = OCR_BATCH_SIZE):
+        super().__init__(lang)
+        self.batch_size = max(1, int(batch_size))
+
+    def recognize_batch(self, imgs: List[Any]) -> List[OcrResult]:
+        import tempfile
+
+        import pytesseract  # type: ignore
+
+        if len(imgs) <= 1:
+            return [self.recognize(img) for img in imgs]
+        t0 = time.perf_counter()
+        try:
+            with tempfile.TemporaryDirectory(prefix="daisy-ocr-") as tmp:
+                names = []
+                for k, img in enumerate(imgs):
+                    name = str(Path(tmp) / f"p{k:04d}.png")
+                    img.save(name)
+                    names.append(name)
+                listing = Path(tmp) / "pages.txt"
+                listing.write_text("\n".join(names) + "\n", encoding="utf-8")
+                text = pytesseract.image_to_string(str(listing), lang=self.lang) or ""
+            parts = text.split("\f")
+            # The text renderer ends every page with a form feed
+            if len(parts) == len(imgs) + 1 and not parts[-1].strip():
+                parts = parts[:-1]
+            if len(parts) != len(imgs):
+                raise RuntimeError(f"batch output has {len(parts)} page(s), expected {len(imgs)}")
+        except Exception as e:
+            logging.warning("OCR batch of %d page(s) failed (%s); OCRing page by page", len(imgs), e)
+            with self._lock:
+                self.stats["fallback_pages"] += len(imgs)
+            return [self.recognize(img) for img in imgs]
+        sec = time.perf_counter() - t0
+        self._count(1, len(imgs), sec)
+        return [(p.strip("\n"), sec / len(imgs), None) for p in parts]
+
+
+# tesserocr engines are expensive to create and not thread-safe: idle engines
+# wait in a per-language pool and are reused by later pages and documents
+_api_engines: Dict[str, "queue.LifoQueue[Any]"] = {}
+_api_engines_lock = threading.Lock()
+
+
+def _close_api_engines() -> None:
+    with _api_engines_lock:
+        for pool in _api_engines.values():
+            while not pool.empty():
+                try:
+                    pool.get_nowait().End()
+                except Exception:
+                    pass
+        _api_engines.clear()
+
+
+atexit.register(_close_api_engines)
+
+
+class ApiOcrBackend(OcrBackend):
+    """
+    Long-lived tesseract engines through the C API (tesserocr). Startup is the
+    engine creation time, measured exactly.
+    """
+
+    name = "api"
+
+    def __init__(self, lang: str):
+        super().__init__(lang)
+        import tesserocr  # type: ignore  # noqa: F401
+
+        self._startup = 0.0
+        self._created = 0
+
+    def _borrow(self) -> Any:
+        import tesserocr  # type: ignore
+
+        with _api_engines_lock:
+            pool = _api_engines.setdefault(self.lang, queue.LifoQueue())
+        try:
+            return pool.get_nowait()
+        except queue.Empty:
+            pass
+        t0 = time.perf_counter()
+        api = tesserocr.PyTessBaseAPI(lang=self.lang)
+        with self._lock:
+            self._startup += time.perf_counter() - t0
+            self._created += 1
+        return api
+
+    def _give_back(self, api: Any) -> None:
+        _api_engines[self.lang].put(api)
+
+    def recognize(self, img: Any) -> OcrResult:
+        t0 = time.perf_counter()
+        try:
+            api = self._borrow()
+        except Exception as e:
+            logging.warning("tesseract engine unavailable (%s); OCRing page by page", e)
+            with self._lock:
+                self.stats["fallback_pages"] += 1
+            return super().recognize(img)
+        try:
+            t1 = time.perf_counter()
+            api.SetImage(img)
+            text = api.GetUTF8Text() or ""
+            self._count(0, 1, time.perf_counter() - t1)
+            return text, time.perf_counter() - t0, None
+        except Exception as e:
+            return "", time.perf_counter() - t0, f"{type(e).__name__}: {e}"
+        finally:
+            self._give_back(api)
+
+    def stats_dict(self) -> Dict[str, Any]:
+        out = super().stats_dict()
+        # Measured engine creation time; ocr_sec excludes it
+        out.update({"engines_created": self._created, "startup_sec": round(self._startup, 4)})
+        return out
+
+
+def merge_backend_stats(stats: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Sums OcrBackend.stats_dict() results of several calls (None stays None).
+    """
+    if not stats:
+        return None
+    out: Dict[str, Any] = {"backend": stats[0].get("backend")}
+    for st in stats:
+        for k, v in st.items():
+            if k == "backend":
+                continue
+            if v is None or out.get(k, 0) is None:
+                out[k] = None
+            else:
+                out[k] = round(out.get(k, 0) + v, 4)
+    return out
+
+
+def add_startup_estimate(stats: Dict[str, Any], lang: str) -> Dict[str, Any]:
+    """
+    Adds startup_sec_estimated / recognize_sec_estimated to merged backend
+    stats: the process count times one timed tesseract run on an empty image
+    (_startup_probe). Costs an extra tesseract process, so only for detailed runs.
+    """
+    n = int(stats.get("invocations") or 0)
+    per_call = _startup_probe(lang) if n else 0.0
+    if per_call is None or stats.get("ocr_sec") is None:
+        stats["startup_sec_estimated"] = None
+        stats["recognize_sec_estimated"] = None
+    else:
+        startup = min(per_call * n, float(stats["ocr_sec"]))
+        stats["startup_sec_estimated"] = round(startup, 4)
+        stats["recognize_sec_estimated"] = round(float(stats["ocr_sec"]) - startup, 4)
+    return stats
+
+
+def get_ocr_backend(name: str, lang: str) -> OcrBackend:
+    """
+    Backend by name; "api" / "auto" fall back when tesserocr is not installed.
+    """
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"unknown OCR backend: {name!r}")
+    if name in ("api", "auto"):
+        try:
+            return ApiOcrBackend(lang)
+        except Exception as e:
+            if name == "api":
+                logging.warning("OCR backend 'api' unavailable (%s); using per-page tesseract", e)
+                return OcrBackend(lang)
+    if name in ("batch", "auto"):
+        return BatchOcrBackend(lang)
+    return OcrBackend(lang)
+
+
+_DONE = object()
+_SKIPPED = object()
+
+
+def _render_page(doc: "fitz.Document", i: int, dpi: int, grayscale: bool) -> Any:
+    from PIL import Image  # type: ignore
+
+    page = doc.load_page(int(i))
+    if grayscale:
+        pix = page.get_pixmap(dpi=int(dpi), colorspace=fitz.csGRAY, alpha=False)
+        return Image.frombytes("L", [pix.width, pix.height], pix.samples)
+    pix = page.get_pixmap(dpi=int(dpi), alpha=False)
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+
+def _render_ocr_pipeline(
+    doc: "fitz.Document",
+    pages: List[int],
+    on_result: Callable[[int, str, Dict[str, float], Optional[str]], None],
+    *,
+    lang: str,
+    dpi: int,
+    grayscale: bool = False,
+    workers: int = 1,
+    queue_depth: int = OCR_QUEUE_DEPTH,
+    render: Optional[Callable[[int], Any]] = None,
+    recognize: Optional[Callable[[Any], Tuple[str, float, Optional[str]]]] = None,
+    recognize_batch: Optional[Callable[[List[Any]], List[Tuple[str, float, Optional[str]]]]] = None,
+    batch_size: int = 1,
+    claim: Optional[Callable[[int], bool]] = None,
+) -> Dict[str, Any]:
+    """
+    Producer/consumer render -> OCR.
+
+    One thread renders pages (the only thread touching `doc` meanwhile) into a
+    bounded queue; `workers` threads feed tesseract from it. At most
+    queue_depth + workers rendered pages are alive at any time. on_result(page,
+    text, timings, error) is called on the calling thread, in completion order.
+    Returns stage timings.
+
+    render(page) / recognize(job) default to full-page rendering + tesseract;
+    region mode plugs in label-region jobs instead. With recognize_batch and
+    batch_size > 1 a worker collects up to batch_size rendered pages and OCRs
+    them in one call; the queue then holds at least batch_size pages.
+
+    claim(page), if given, runs on the render thread just before a page is
+    rendered; pages it returns False for are skipped (on_result is not called).
+    """
+    if render is None:
+        render = lambda i: _render_page(doc, i, dpi, grayscale)  # noqa: E731
+    if recognize is None:
+        recognize = lambda img: _tesseract_page(img, lang)  # noqa: E731
+
+    n_workers = max(1, int(workers or 1))
+    n_batch = max(1, int(batch_size)) if recognize_batch is not None else 1
+    depth = max(1, int(queue_depth), n_batch)
+    images: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    results: "queue.Queue[Any]" = queue.Queue()
+    stop = threading.Event()
+    stage = {"render_sec": 0.0, "render_blocked_sec": 0.0, "ocr_sec": 0.0, "ocr_idle_sec": 0.0}
+    stage_lock = threading.Lock()
+
+    def _put(item: Any) -> bool:
+        # Blocks while the queue is full; gives up if the consumer side stopped
+        while not stop.is_set():
+            try:
+                images.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _producer() -> None:
+        try:
+            for i in pages:
+                if stop.is_set():
+                    return
+                if claim is not None:
+                    try:
+                        claimed = claim(i)
+                    except Exception as e:
+                        logging.warning("OCR: claiming page %d failed (%s); OCRing it anyway", i, e)
+                        claimed = True
+                    if not claimed:
+                        results.put(_SKIPPED)
+                        continue
+                t0 = time.perf_counter()
+                try:
+                    item = (i, t0, render(i), None)
+                except Exception as e:
+                    item = (i, t0, None, f"render: {type(e).__name__}: {e}")
+                t1 = time.perf_counter()
+                if not _put(item + (t1 - t0,)):
+                    return
+                stage["render_sec"] += t1 - t0
+                stage["render_blocked_sec"] += time.perf_counter() - t1
+        finally:
+            for _ in range(n_workers):
+                _put(_DONE)
+
+    def _consumer() -> None:
+        t_wait = time.perf_counter()
+        last = False
+        while not last:
+            try:
+                item = images.get(timeout=0.1)
+            except queue.Empty:
+                if stop.is_set():
+                    return
+                continue
+            if item is _DONE:
+                return
+            batch = [item]
+            # Batching backends: keep taking rendered pages until the batch is full
+            while len(batch) < n_batch and not stop.is_set():
+                try:
+                    item = images.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _DONE:
+                    last = True
+                    break
+                batch.append(item)
+            idle = time.perf_counter() - t_wait
+
+            todo = [b for b in batch if b[3] is None]
+            # Hooks are not bound to the never-raise contract of _tesseract_page:
+            # a failure must still post a result per page, or the caller waits forever
+            try:
+                if len(todo) > 1 and recognize_batch is not None:
+                    outs = list(recognize_batch([b[2] for b in todo]))
+                else:
+                    outs = [recognize(b[2]) for b in todo]
+                by_page = {b[0]: (str(out[0] or ""), float(out[1]), out[2]) for b, out in zip(todo, outs)}
+            except Exception as e:
+                by_page = {b[0]: ("", 0.0, f"ocr: {type(e).__name__}: {e}") for b in todo}
+            del todo, item
+
+            with stage_lock:
+                stage["ocr_sec"] += sum(out[1] for out in by_page.values())
+                stage["ocr_idle_sec"] += idle
+            for i, t0, _img, err, render_sec in batch:
+                text, ocr_sec = "", 0.0
+                if err is None:
+                    text, ocr_sec, err = by_page.get(i, ("", 0.0, "ocr: no result for page"))
+                timings = {
+                    "render_sec": round(render_sec, 4),
+                    "ocr_sec": round(ocr_sec, 4),
+                    "wall_sec": round(time.perf_counter() - t0, 4),
+                }
+                results.put((i, text, timings, err))
+            del batch, _img
+            t_wait = time.perf_counter()
+
+    t_start = time.perf_counter()
+    threads = [threading.Thread(target=_producer, name="ocr-render", daemon=True)]
+    threads += [threading.Thread(target=_consumer, name=f"ocr-{k}", daemon=True) for k in range(n_workers)]
+    for t in threads:
+        t.start()
+    try:
+        for _ in range(len(pages)):
+            res = results.get()
+            if res is not _SKIPPED:
+                on_result(*res)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+    return {
+        "workers": n_workers,
+        "queue_depth": depth,
+        "batch_size": n_batch,
+        "grayscale": bool(grayscale),
+        "wall_sec": round(time.perf_counter() - t_start, 4),
+        **{k: round(v, 4) for k, v in stage.items()},
+    }
+
+
 def ocr_pdf_pages_best_effort(
     pdf_path: Path,
     cache_dir: Path,
@@ -74,13 +715,44 @@ def ocr_pdf_pages_best_effort(
     dpi: int = 200,
     max_pages: int = 2,
     pages: Optional[List[int]] = None,  # explicit 0-based page indices
+    workers: int = 1,
+    grayscale: bool = False,
+    queue_depth: int = OCR_QUEUE_DEPTH,
+    mode: str = "page",
+    dpi_ladder: Optional[Sequence[int]] = None,
+    accept: Optional[Callable[[str], bool]] = None,
+    accept_id: str = "",
+    min_chars: int = ADAPTIVE_MIN_CHARS,
+    preprocess: Optional[PreprocessConfig] = None,
+    backend: str = "page",
+    dedupe: bool = False,
 ) -> Tuple[Dict[int, str], dict]:
     """
     Returns (ocr_pages, meta).
 
     - If pages is None: OCR first max_pages pages (0..max_pages-1)
     - If pages is provided: OCR exactly those 0-based page indices (bounded to doc)
-    - Writes/reads cache file: <stem>.<hash>.txt
+    - Rendering and tesseract run as a pipeline: one render thread fills a queue of
+      at most queue_depth page images, `workers` threads run tesseract (each call
+      is its own tesseract process); grayscale=True renders 8-bit gray images
+    - mode="region" (DAC): OCR only clips next to the DAC field labels, with
+      field-specific tesseract configs; each page's text is then a set of
+      "<label lines>\n<value>" blocks (see ocr_regions.py)
+    - Cache is per page: <cache_dir>/pages/<doc sha256[:16]>/p<page>.<settings>.txt,
+      keyed by document bytes, page index, lang, dpi and preprocessing. Cached
+      pages are served as-is and only the missing ones are OCRed; old
+      <stem>.<hash>.txt page-set files are migrated on first use
+    - dpi_ladder (e.g. [150, 300], overrides dpi): pages are OCRed at the lowest
+      DPI and escalated one rung at a time while their text is too short
+      (< min_chars, page mode) or accept(text) is False; see _ocr_pdf_pages_adaptive
+    - preprocess (page mode): render gray, then binarize / deskew / crop with
+      NumPy before tesseract (see ocr_preprocess.py); per-page preprocess_sec
+      goes into ocr_page_timings (render_sec includes it)
+    - backend (page mode): "page" | "batch" | "api" | "auto", see OcrBackend;
+      meta["ocr_backend"] reports process/page counts and seconds
+    - dedupe (page mode): pages whose perceptual hash matches a page already
+      OCRed with the same settings (this run, the cache, or an earlier page of
+      this call) reuse its text; meta["ocr_dedupe_hits"] counts them
     """
     meta = {
         "ocr_enabled": True,
@@ -94,46 +766,33 @@ def ocr_pdf_pages_best_effort(
         "ocr_succeeded": False,
         "ocr_pages_requested": pages,
     }
+    if mode not in OCR_MODES:
+        raise ValueError(f"unknown OCR mode: {mode!r}")
+    if backend not in OCR_BACKENDS:
+        raise ValueError(f"unknown OCR backend: {backend!r}")
+    if dpi_ladder is not None:
+        ladder = parse_dpi_ladder(dpi_ladder)
+        if len(ladder) > 1:
+            return _ocr_pdf_pages_adaptive(
+                pdf_path, cache_dir,
+                ladder=ladder, accept=accept, accept_id=accept_id, min_chars=min_chars,
+                tesseract_cmd=tesseract_cmd, lang=lang, max_pages=max_pages, pages=pages,
+                workers=workers, grayscale=grayscale, queue_depth=queue_depth, mode=mode,
+                preprocess=preprocess, backend=backend, dedupe=dedupe,
+            )
+        dpi = ladder[0]
+        meta["ocr_dpi"] = int(dpi)
+    if mode != "page":
+        preprocess = None
+    prep = _prep_for(grayscale, mode, preprocess)
+    meta["ocr_mode"] = mode
 
     cache_dir = Path(cache_dir)
     cache_dir.mkdir(parents=True, exist_ok=True)
 
     pdf_path = Path(pdf_path)
-    key = _cache_key(pdf_path, lang=lang, dpi=int(dpi), max_pages=int(max_pages), pages=pages)
-    cache_file = cache_dir / f"{pdf_path.stem}.{key}.txt"
-
-    # Try cache
-    if cache_file.exists():
-        try:
-            ocr_pages_map = _read_cache_txt(cache_file)
-            meta["ocr_cache_hit"] = True
-            meta["ocr_available"] = True
-            meta["ocr_attempted"] = True
-            meta["ocr_pages"] = int(len(ocr_pages_map))
-            meta["ocr_text_chars"] = int(sum(len(v or "") for v in ocr_pages_map.values()))
-            meta["ocr_succeeded"] = bool(meta["ocr_text_chars"] > 0)
-            meta["ocr_pages_used"] = sorted(list(ocr_pages_map.keys()))
-            logging.info("OCR cache hit: %s", cache_file.name)
-            return ocr_pages_map, meta
-        except Exception:
-            pass
-
-    # Determine tesseract availability
-    try:
-        import pytesseract  # type: ignore
-        from PIL import Image  # type: ignore
+    doc_sha = _doc_sha256(pdf_path)
 
-        meta["ocr_available"] = True
-        if tesseract_cmd:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
-    except Exception as e:
-        meta["ocr_attempted"] = True
-        meta["error"] = f"ocr_unavailable: {type(e).__name__}: {e}"
-        return {}, meta
-
-    meta["ocr_attempted"] = True
-
-    # OCR render + tesseract
     ocr_pages_map: Dict[int, str] = {}
     try:
         doc = fitz.open(str(pdf_path))
@@ -147,33 +806,420 @@ def ocr_pdf_pages_best_effort(
         meta["ocr_pages"] = int(len(target_pages))
         meta["ocr_pages_used"] = target_pages
 
-        import pytesseract  # type: ignore
-        from PIL import Image  # type: ignore
+        # Per-page cache: serve what is there, OCR only the rest
+        cached = _read_cached_pages(cache_dir, doc_sha, target_pages, lang=lang, dpi=int(dpi), prep=prep)
+        # Legacy page-set files were always rendered as RGB
+        if len(cached) < len(set(target_pages)) and prep == "rgb":
+            try:
+                if _migrate_legacy_cache(cache_dir, pdf_path, doc_sha, lang=lang, dpi=int(dpi)):
+                    cached = _read_cached_pages(cache_dir, doc_sha, target_pages, lang=lang, dpi=int(dpi), prep=prep)
+            except Exception as e:
+                logging.warning("OCR cache: legacy migration failed for %s: %s", pdf_path.name, e)
+        ocr_pages_map.update(cached)
+        missing = [i for i in dict.fromkeys(target_pages) if i not in cached]
+        meta["ocr_cache_pages_hit"] = sorted(cached)
+
+        # Perceptual-hash dedupe: only pages unlike anything OCRed so far go on.
+        # Reused text stays in memory and in the hash index; the per-page OCR
+        # cache only ever holds text tesseract produced for that page.
+        hash_index: Optional[PageHashIndex] = None
+        hashes: Dict[int, PageSignature] = {}
+        followers: Dict[int, int] = {}  # page -> earlier page of this call it duplicates
+        if dedupe and mode == "page" and missing:
+            t0 = time.perf_counter()
+            hash_index = PageHashIndex(cache_dir, f"lang={lang}|dpi={int(dpi)}|prep={prep}")
+            hits: List[Dict[str, Any]] = []
+            unique: List[int] = []
+            for i in missing:
+                try:
+                    hashes[i] = page_signature(doc, i)
+                except Exception as e:
+                    logging.warning("OCR dedupe: cannot hash %s p%d: %s", pdf_path.name, i, e)
+                    unique.append(i)
+                    continue
+                found = hash_index.lookup(hashes[i])
+                if found is not None:
+                    del hashes[i]  # only pages still to OCR keep their ink mask
+                    ocr_pages_map[i] = found[0]
+                    hits.append({"page": i, "source": found[1], "distance": found[2]})
+                    continue
+                rep = next((r for r in unique if r in hashes and same_page(hashes[r], hashes[i], hash_index.max_distance)), None)
+                if rep is not None:
+                    followers[i] = rep
+                    hits.append({"page": i, "source": f"page {rep}", "distance": hamming(hashes[rep].phash, hashes.pop(i).phash)})
+                    continue
+                unique.append(i)
+            missing = unique
+            meta["ocr_dedupe_hits"] = len(hits)
+            meta["ocr_dedupe"] = {"pages": hits, "hash_sec": round(time.perf_counter() - t0, 4)}
 
-        for i in target_pages:
+        if not missing:
+            doc.close()
+            meta["ocr_cache_hit"] = True
+            meta["ocr_available"] = True
+            meta["ocr_attempted"] = True
+            meta["ocr_text_chars"] = int(sum(len(v or "") for v in ocr_pages_map.values()))
+            meta["ocr_succeeded"] = bool(meta["ocr_text_chars"] > 0)
+            logging.info("OCR cache hit: %s (%d page(s))", pdf_path.name, len(cached))
+            return ocr_pages_map, meta
+
+        # Determine tesseract availability
+        try:
+            import pytesseract  # type: ignore
+            from PIL import Image  # type: ignore  # noqa: F401
+
+            meta["ocr_available"] = True
+            if tesseract_cmd:
+                pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        except Exception as e:
+            doc.close()
+            meta["ocr_attempted"] = True
+            meta["error"] = f"ocr_unavailable: {type(e).__name__}: {e}"
+            meta["ocr_text_chars"] = int(sum(len(v or "") for v in ocr_pages_map.values()))
+            return ocr_pages_map, meta
+
+        meta["ocr_attempted"] = True
+
+        n_workers = max(1, int(workers or 1))
+        page_timings: Dict[int, Dict[str, Any]] = {}
+        page_errors: List[Dict[str, Any]] = []
+        # Per-page cross-process locks, taken just before a page is rendered and
+        # held until it is cached; refreshed as results come in so a long run
+        # never leaves a live lock looking stale to other processes
+        locks: Dict[int, CacheLock] = {}
+        locks_mu = threading.Lock()
+        claims: Dict[int, Optional[bool]] = {}
+        ocred: List[int] = []
+        from_peer: List[int] = []
+
+        def _claim(i: int, timeout: Optional[float]) -> Optional[bool]:
+            """
+            True: page is ours to OCR; False: another process is on it (lock busy);
+            None: someone else finished it meanwhile (text is in ocr_pages_map).
+            """
+            lock = CacheLock(_page_cache_path(cache_dir, doc_sha, i, lang=lang, dpi=int(dpi), prep=prep))
+            got = lock.acquire(timeout=timeout)
+            if not got and timeout == 0:
+                return False
+            if not got:
+                logging.warning("OCR cache: lock wait timed out for %s p%d; OCRing anyway", pdf_path.name, i)
+            hit = _read_cached_pages(cache_dir, doc_sha, [i], lang=lang, dpi=int(dpi), prep=prep)
+            if hit:
+                lock.release()
+                ocr_pages_map.update(hit)
+                from_peer.append(i)
+                return None
+            with locks_mu:
+                locks[i] = lock
+            return True
+
+        def _refresh_locks() -> None:
+            with locks_mu:
+                held = list(locks.values())
+            for lock in held:
+                lock.refresh()
+
+        def _collect(i: int, text: str, timings: Dict[str, float], error: Optional[str]) -> None:
+            ocr_pages_map[i] = text
+            page_timings[i] = {"page": i, **timings}
+            if i in pp_info:
+                page_timings[i]["preprocess_sec"] = pp_info[i]["sec"]
             try:
-                page = doc.load_page(int(i))
-                pix = page.get_pixmap(dpi=int(dpi), alpha=False)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                text = pytesseract.image_to_string(img, lang=lang) or ""
-                ocr_pages_map[int(i)] = text
-            except Exception:
-                ocr_pages_map[int(i)] = ""
+                if error:
+                    page_errors.append({"page": i, "error": error})
+                    return
+                # Failed pages are not cached, so a later run retries them
+                try:
+                    _write_cached_page(cache_dir, doc_sha, i, text, lang=lang, dpi=int(dpi), prep=prep)
+                except Exception as e:
+                    logging.warning("OCR cache write failed (%s p%d): %s", pdf_path.name, i, e)
+                sig = hashes.pop(i, None)
+                if hash_index is not None and sig is not None:
+                    hash_index.add(sig, text)
+            finally:
+                with locks_mu:
+                    lock = locks.pop(i, None)
+                if lock is not None:
+                    lock.release()
+                _refresh_locks()
+
+        stage_timings: List[Dict[str, Any]] = []
+        region_info: Dict[int, Dict[str, Any]] = {}
+        pp_info: Dict[int, Dict[str, Any]] = {}
+
+        def _render_preprocessed(i: int) -> Any:
+            img, info = render_preprocessed(doc, i, int(dpi), preprocess)
+            pp_info[i] = {"page": i, **info}
+            return img
+
+        engine = get_ocr_backend(backend, lang)
+
+        def _recognize_preprocessed(img: Any) -> OcrResult:
+            # None: preprocessing found no ink, nothing for tesseract to read
+            return ("", 0.0, None) if img is None else engine.recognize(img)
+
+        def _recognize_preprocessed_batch(imgs: List[Any]) -> List[OcrResult]:
+            live = [k for k, img in enumerate(imgs) if img is not None]
+            out: List[OcrResult] = [("", 0.0, None)] * len(imgs)
+            for k, res in zip(live, engine.recognize_batch([imgs[k] for k in live])):
+                out[k] = res
+            return out
+
+        def _recognize_region(job: RegionJob) -> Tuple[str, float, Optional[str]]:
+            out = recognize_region_job(job, lang)
+            region_info[job.page] = {
+                "page": job.page,
+                "anchor_source": job.anchor_source,
+                "fields": list(job.fields_found),
+                "full_page_fallback": job.full_page is not None,
+                "pixels_ocred": job.pixels_ocred,
+                "page_pixels": job.page_pixels,
+                "anchor_sec": round(job.anchor_sec, 4),
+            }
+            return out
+
+        def _run(batch: List[int], claim_timeout: Optional[float] = None) -> None:
+            # claim_timeout: lock each page before rendering it (see _claim); None: no locking
+            if not batch:
+                return
+            hooks: Dict[str, Any] = {}
+            if claim_timeout is not None:
+                def _take(i: int) -> bool:
+                    claims[i] = _claim(i, claim_timeout)
+                    if claims[i] is True:
+                        ocred.append(i)
+                    return claims[i] is True
+
+                hooks["claim"] = _take
+            else:
+                ocred.extend(batch)
+            if mode == "region":
+                hooks["render"] = lambda i: render_region_job(doc, i, dpi=int(dpi), grayscale=grayscale, lang=lang)
+                hooks["recognize"] = _recognize_region
+            elif preprocess is not None:
+                hooks["render"] = _render_preprocessed
+                hooks["recognize"] = _recognize_preprocessed
+                hooks["recognize_batch"] = _recognize_preprocessed_batch
+                hooks["batch_size"] = engine.batch_size
+            else:
+                hooks["recognize"] = engine.recognize
+                hooks["recognize_batch"] = engine.recognize_batch
+                hooks["batch_size"] = engine.batch_size
+            stage_timings.append(
+                _render_ocr_pipeline(
+                    doc, batch, _collect,
+                    lang=lang, dpi=int(dpi), grayscale=grayscale,
+                    workers=n_workers, queue_depth=queue_depth,
+                    **hooks,
+                )
+            )
+
+        try:
+            _run(missing, 0)
+            # Pages another process was OCRing: wait for its result, OCR only if it gave up
+            _run([i for i in missing if claims.get(i) is False], LOCK_WAIT_SEC)
+            # Duplicates take their original's text; if that failed, OCR them after all
+            failed = {e["page"] for e in page_errors}
+            for i, rep in followers.items():
+                if rep in ocr_pages_map and rep not in failed:
+                    ocr_pages_map[i] = ocr_pages_map[rep]
+            _run([i for i, rep in followers.items() if rep not in ocr_pages_map or rep in failed])
+        finally:
+            for lock in locks.values():
+                lock.release()
+
+        meta["ocr_pages_ocred"] = ocred
+        if from_peer:
+            meta["ocr_pages_from_peer"] = sorted(from_peer)
+
+        # Keep page order stable regardless of completion order
+        ocr_pages_map = {i: ocr_pages_map[i] for i in target_pages if i in ocr_pages_map}
+        meta["ocr_workers"] = n_workers
+        meta["ocr_grayscale"] = bool(grayscale)
+        if region_info:
+            px = sum(r["pixels_ocred"] for r in region_info.values())
+            full = sum(r["page_pixels"] for r in region_info.values())
+            meta["ocr_region"] = {
+                "pages": [region_info[i] for i in sorted(region_info)],
+                "pixels_ocred": px,
+                "page_pixels": full,
+                "pixel_ratio": round(px / full, 4) if full else None,
+            }
+        if mode == "page" and ocred:
+            meta["ocr_backend"] = engine.stats_dict()
+        if pp_info:
+            pp_pages = [pp_info[i] for i in sorted(pp_info)]
+            meta["ocr_preprocess"] = {
+                "config": preprocess.cache_id() if preprocess is not None else None,
+                "pages": pp_pages,
+                "preprocess_sec": round(sum(p["sec"] for p in pp_pages), 4),
+                "pixels_in": sum(p["pixels_in"] for p in pp_pages),
+                "pixels_out": sum(p["pixels_out"] for p in pp_pages),
+                "blank_pages": [p["page"] for p in pp_pages if p["blank"]],
+            }
+        if stage_timings:
+            # One entry per pipeline pass (a second pass only runs for pages
+            # that were waited on from another process and then given up)
+            meta["ocr_pipeline"] = stage_timings[0] if len(stage_timings) == 1 else stage_timings
+        meta["ocr_page_timings"] = [page_timings[i] for i in ocred if i in page_timings]
+        if page_errors:
+            meta["ocr_page_errors"] = sorted(page_errors, key=lambda x: x["page"])
 
         doc.close()
 
         meta["ocr_text_chars"] = int(sum(len(v or "") for v in ocr_pages_map.values()))
         meta["ocr_succeeded"] = bool(meta["ocr_text_chars"] > 0)
 
-        # Write cache
-        try:
-            _write_cache_txt(cache_file, ocr_pages_map)
-            logging.info("OCR cache write: %s", cache_file.name)
-        except Exception:
-            pass
-
         return ocr_pages_map, meta
 
     except Exception as e:
         meta["error"] = f"ocr_error: {type(e).__name__}: {e}"
         return {}, meta
+
+
+def _ocr_pdf_pages_adaptive(
+    pdf_path: Path,
+    cache_dir: Path,
+    *,
+    ladder: List[int],
+    accept: Optional[Callable[[str], bool]],
+    accept_id: str,
+    min_chars: int,
+    lang: str,
+    max_pages: int,
+    pages: Optional[List[int]],
+    grayscale: bool,
+    mode: str,
+    preprocess: Optional[PreprocessConfig] = None,
+    **ocr_kwargs: Any,
+) -> Tuple[Dict[int, str], dict]:
+    """
+    DPI escalation on top of ocr_pdf_pages_best_effort(): each rung is a normal
+    fixed-DPI call (so its pages land in the per-DPI page cache), restricted to
+    the pages not yet accepted. A page's accepted text is cached under the
+    ladder settings together with the DPI that produced it; a page still
+    rejected at the top rung keeps its last non-empty text and is not cached
+    as accepted.
+    """
+    pdf_path = Path(pdf_path)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    meta: Dict[str, Any] = {
+        "ocr_enabled": True,
+        "ocr_available": False,
+        "ocr_attempted": False,
+        "ocr_lang": lang,
+        "ocr_dpi": "auto",
+        "ocr_dpi_ladder": list(ladder),
+        "ocr_pages": 0,
+        "ocr_text_chars": 0,
+        "ocr_cache_hit": False,
+        "ocr_succeeded": False,
+        "ocr_pages_requested": pages,
+        "ocr_mode": mode,
+    }
+    doc_sha = _doc_sha256(pdf_path)
+    spec = dict(lang=lang, ladder=list(ladder), prep=_prep_for(grayscale, mode, preprocess), accept_id=accept_id, min_chars=int(min_chars))
+
+    def _good(text: str) -> bool:
+        if mode == "page" and len(text.strip()) < int(min_chars):
+            return False
+        try:
+            return accept is None or bool(accept(text))
+        except Exception as e:
+            logging.warning("OCR accept check failed: %s", e)
+            return False
+
+    try:
+        with fitz.open(str(pdf_path)) as doc:
+            total_pages = len(doc)
+    except Exception as e:
+        meta["error"] = f"ocr_error: {type(e).__name__}: {e}"
+        return {}, meta
+    if pages is not None and len(pages) > 0:
+        target_pages = [int(p) for p in pages if 0 <= int(p) < total_pages]
+    else:
+        target_pages = list(range(min(int(max_pages), total_pages)))
+    meta["ocr_pages"] = len(target_pages)
+    meta["ocr_pages_used"] = target_pages
+
+    accepted = _read_accepted_pages(cache_dir, doc_sha, target_pages, **spec)
+    meta["ocr_dpi_cache_pages_hit"] = sorted(accepted)
+    final: Dict[int, Tuple[str, int]] = dict(accepted)
+    pending = [i for i in dict.fromkeys(target_pages) if i not in accepted]
+
+    rungs: List[Dict[str, Any]] = []
+    escalated: Set[int] = set()
+    ocred: Set[int] = set()
+    cache_hit: Set[int] = set()
+    timings: List[Dict[str, Any]] = []
+    page_errors: Dict[int, Dict[str, Any]] = {}
+    backend_stats: List[Dict[str, Any]] = []
+    for k, dpi in enumerate(ladder):
+        if not pending:
+            break
+        page_map, rung_meta = ocr_pdf_pages_best_effort(
+            pdf_path, cache_dir, lang=lang, dpi=dpi, max_pages=max_pages, pages=pending,
+            grayscale=grayscale, mode=mode, preprocess=preprocess, **ocr_kwargs,
+        )
+        for key in ("ocr_available", "ocr_workers", "ocr_grayscale"):
+            if key in rung_meta:
+                meta[key] = rung_meta[key]
+        ocred.update(rung_meta.get("ocr_pages_ocred") or [])
+        cache_hit.update(rung_meta.get("ocr_cache_pages_hit") or [])
+        timings.extend({**t, "dpi": dpi} for t in rung_meta.get("ocr_page_timings") or [])
+        failed = {e["page"]: {**e, "dpi": dpi} for e in rung_meta.get("ocr_page_errors") or []}
+        page_errors.update(failed)
+        if "error" in rung_meta:
+            meta["error"] = rung_meta["error"]
+            break
+
+        top = k == len(ladder) - 1
+        nxt: List[int] = []
+        for i in pending:
+            text = page_map.get(i) or ""
+            if i not in failed:
+                page_errors.pop(i, None)
+            if text.strip() or i not in final:
+                final[i] = (text, dpi)
+            if i not in failed and _good(text):
+                try:
+                    path = _accepted_cache_path(cache_dir, doc_sha, i, **spec)
+                    atomic_write_bytes(path, encode_record(text, dpi=int(dpi)))
+                except Exception as e:
+                    logging.warning("OCR cache write failed (%s p%d): %s", pdf_path.name, i, e)
+            elif not top:
+                nxt.append(i)
+        escalated.update(nxt)
+        rung: Dict[str, Any] = {"dpi": dpi, "pages": list(pending), "escalated": nxt}
+        if rung_meta.get("ocr_pipeline"):
+            rung["pipeline"] = rung_meta["ocr_pipeline"]
+        if rung_meta.get("ocr_region"):
+            rung["region"] = rung_meta["ocr_region"]
+        if rung_meta.get("ocr_preprocess"):
+            rung["preprocess"] = rung_meta["ocr_preprocess"]
+        if rung_meta.get("ocr_backend"):
+            backend_stats.append(rung_meta["ocr_backend"])
+        if "ocr_dedupe_hits" in rung_meta:
+            meta["ocr_dedupe_hits"] = meta.get("ocr_dedupe_hits", 0) + rung_meta["ocr_dedupe_hits"]
+        rungs.append(rung)
+        pending = nxt
+
+    ocr_pages_map = {i: final[i][0] for i in target_pages if i in final}
+    meta["ocr_attempted"] = True
+    if accepted and not rungs:
+        meta["ocr_cache_hit"] = True
+        meta["ocr_available"] = True
+    meta["ocr_cache_pages_hit"] = sorted(cache_hit | set(accepted))
+    meta["ocr_pages_ocred"] = sorted(ocred)
+    meta["ocr_page_dpi"] = {str(i): final[i][1] for i in target_pages if i in final}
+    meta["ocr_pages_escalated"] = sorted(escalated)
+    meta["ocr_dpi_rungs"] = rungs
+    if backend_stats:
+        meta["ocr_backend"] = merge_backend_stats(backend_stats)
+    meta["ocr_page_timings"] = timings
+    if page_errors:
+        meta["ocr_page_errors"] = [page_errors[i] for i in sorted(page_errors)]
+    meta["ocr_text_chars"] = int(sum(len(v or "") for v in ocr_pages_map.values()))
+    meta["ocr_succeeded"] = bool(meta["ocr_text_chars"] > 0)
+    return ocr_pages_map, meta
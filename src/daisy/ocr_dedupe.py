@@ -0,0 +1,217 @@
+# src/daisy/ocr_dedupe.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from .cache_store import atomic_write_bytes, decode_record_bytes, encode_record, touch_entry
+from .ocr_preprocess import pixmap_gray_view
+
+# Perceptual-hash dedupe for page OCR: every page is rendered gray at PHASH_DPI
+# (glyphs still visible), averaged down to PHASH_DCT_SIZE x PHASH_DCT_SIZE
+# cells, and the PHASH_SIZE x PHASH_SIZE lowest DCT frequencies, thresholded at
+# their median, give a 64-bit hash. A page whose hash is within
+# PHASH_MAX_DISTANCE bits of a page already OCRed with the same settings (this
+# run, or the cache) is a candidate. Its text is only reused when the ink masks
+# of both renders also match pixel by pixel (ink_matches): a low-frequency
+# hash cannot tell two pages of dense text apart, the pixel check can.
+
+PHASH_DPI = 100
+PHASH_DCT_SIZE = 32
+PHASH_SIZE = 8
+PHASH_MAX_DISTANCE = 8
+
+# Pixel check: gray < INK_LEVEL is ink; at most INK_MAX_MISMATCH of the ink
+# pixels (both pages) may have no ink within one pixel in the other page
+INK_LEVEL = 160
+INK_MAX_MISMATCH = 0.02
+
+
+@dataclass
+class PageSignature:
+    """
+    Perceptual hash plus the packed ink mask of one page render.
+    """
+    phash: int
+    shape: Tuple[int, int]
+    ink: bytes  # np.packbits of the (h, w) ink mask
+
+    def mask(self) -> np.ndarray:
+        h, w = self.shape
+        return np.unpackbits(np.frombuffer(self.ink, dtype=np.uint8), count=h * w).reshape(h, w).astype(bool)
+
+    def digest(self) -> str:
+        return hashlib.sha256(self.ink).hexdigest()[:8]
+
+
+# Pages OCRed or matched in this process, per OCR settings key: record name
+# -> phash only. Ink masks (~115 KB a letter page) and texts stay on disk and
+# are read when a hash comes close, so the index stays small on big bundles.
+_run_index: Dict[str, Dict[str, int]] = {}
+_run_lock = threading.Lock()
+
+
+def _block_means(gray: np.ndarray, size: int) -> np.ndarray:
+    h, w = gray.shape
+    if h < size or w < size:
+        raise ValueError("page image smaller than the hash grid")
+    rows = np.linspace(0, h, size + 1).astype(int)
+    cols = np.linspace(0, w, size + 1).astype(int)
+    # Block sums via cumulative sums over the (possibly uneven) grid
+    c = np.zeros((h + 1, w + 1), dtype=np.int64)
+    c[1:, 1:] = gray.astype(np.int64).cumsum(axis=0).cumsum(axis=1)
+    sums = c[np.ix_(rows[1:], cols[1:])] - c[np.ix_(rows[:-1], cols[1:])] - c[np.ix_(rows[1:], cols[:-1])] + c[np.ix_(rows[:-1], cols[:-1])]
+    return sums / np.outer(np.diff(rows), np.diff(cols))
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    return np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+
+
+def phash_gray(gray: np.ndarray) -> int:
+    """
+    64-bit DCT hash of a gray page image, as an int.
+    """
+    d = _dct_matrix(PHASH_DCT_SIZE)
+    low = (d @ _block_means(gray, PHASH_DCT_SIZE) @ d.T)[:PHASH_SIZE, :PHASH_SIZE].ravel()
+    bits = low > np.median(low)
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _dilate(mask: np.ndarray) -> np.ndarray:
+    out = mask.copy()
+    out[1:, :] |= mask[:-1, :]
+    out[:-1, :] |= mask[1:, :]
+    grown = out.copy()
+    out[:, 1:] |= grown[:, :-1]
+    out[:, :-1] |= grown[:, 1:]
+    return out
+
+
+def ink_matches(a: PageSignature, b: PageSignature) -> bool:
+    """
+    True when the two renders carry the same ink up to a one-pixel shift.
+    """
+    if a.shape != b.shape:
+        return False
+    if a.ink == b.ink:
+        return True
+    ma, mb = a.mask(), b.mask()
+    total = int(ma.sum()) + int(mb.sum())
+    missing = int((ma & ~_dilate(mb)).sum()) + int((mb & ~_dilate(ma)).sum())
+    return missing <= INK_MAX_MISMATCH * total
+
+
+def gray_signature(gray: np.ndarray) -> PageSignature:
+    ink = gray < INK_LEVEL
+    return PageSignature(phash_gray(gray), (int(ink.shape[0]), int(ink.shape[1])), np.packbits(ink).tobytes())
+
+
+def page_signature(doc: "fitz.Document", i: int) -> PageSignature:
+    pix = doc.load_page(int(i)).get_pixmap(dpi=PHASH_DPI, colorspace=fitz.csGRAY, alpha=False)
+    return gray_signature(pixmap_gray_view(pix))
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def same_page(a: PageSignature, b: PageSignature, max_distance: int = PHASH_MAX_DISTANCE) -> bool:
+    return hamming(a.phash, b.phash) <= max_distance and ink_matches(a, b)
+
+
+class PageHashIndex:
+    """
+    Signature -> OCR text for one OCR settings key, on disk as
+    <cache_dir>/phash/<settings>/<hash>-<ink digest>.rec (one checksummed
+    record per page image holding text and ink mask, so the shared-cache prune
+    covers it). Pages of this run are also listed in memory (hash + record
+    name) so later documents see them without re-listing the directory.
+    """
+
+    def __init__(self, cache_dir: Path, settings: str, max_distance: int = PHASH_MAX_DISTANCE):
+        self.key = hashlib.sha256(settings.encode("utf-8")).hexdigest()[:8]
+        self.dir = Path(cache_dir) / "phash" / self.key
+        self.max_distance = int(max_distance)
+        self._disk: Optional[List[Tuple[int, str]]] = None
+
+    def _disk_entries(self) -> List[Tuple[int, str]]:
+        if self._disk is None:
+            self._disk = []
+            try:
+                with os.scandir(self.dir) as it:
+                    for e in it:
+                        if e.name.endswith(".rec") and not e.name.startswith("."):
+                            try:
+                                self._disk.append((int(e.name.split("-", 1)[0], 16), e.name))
+                            except ValueError:
+                                continue
+            except FileNotFoundError:
+                pass
+        return self._disk
+
+    def _name(self, sig: PageSignature) -> str:
+        return f"{sig.phash:0{PHASH_SIZE * PHASH_SIZE // 4}x}-{sig.digest()}.rec"
+
+    def _load(self, name: str) -> Optional[Tuple[PageSignature, str]]:
+        p = self.dir / name
+        try:
+            rec = decode_record_bytes(p.read_bytes())
+        except OSError:
+            return None
+        if rec is None:
+            return None
+        try:
+            data, fields = rec
+            n = int(fields["text_len"])
+            h, w = (int(v) for v in fields["shape"].split("x"))
+            known = PageSignature(int(name.split("-", 1)[0], 16), (h, w), zlib.decompress(data[n:]))
+            return known, data[:n].decode("utf-8")
+        except Exception:
+            return None
+
+    def lookup(self, sig: PageSignature) -> Optional[Tuple[str, str, int]]:
+        """
+        (text, "run" | "cache", distance) of the closest known page whose hash
+        is close enough and whose ink matches.
+        """
+        with _run_lock:
+            run = dict(_run_index.get(self.key) or {})
+        for source, entries in (("run", run.items()), ("cache", ((n, h) for h, n in self._disk_entries() if n not in run))):
+            for dist, name in sorted((hamming(sig.phash, h), name) for name, h in entries):
+                if dist > self.max_distance:
+                    break
+                found = self._load(name)
+                if found is None or not ink_matches(sig, found[0]):
+                    continue
+                touch_entry(self.dir / name)
+                self._remember(name, found[0].phash)
+                return found[1], source, dist
+        return None
+
+    def _remember(self, name: str, phash: int) -> None:
+        with _run_lock:
+            _run_index.setdefault(self.key, {})[name] = phash
+
+    def add(self, sig: PageSignature, text: str) -> None:
+        body = text.encode("utf-8")
+        try:
+            name = self._name(sig)
+            rec = encode_record(body + zlib.compress(sig.ink), text_len=len(body), shape=f"{sig.shape[0]}x{sig.shape[1]}")
+            atomic_write_bytes(self.dir / name, rec)
+        except Exception as e:
+            logging.warning("OCR dedupe index write failed: %s", e)
+            return
+        self._remember(name, sig.phash)
+        if self._disk is not None:
+            self._disk.append((sig.phash, name))
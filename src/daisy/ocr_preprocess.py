@@ -0,0 +1,146 @@
+# src/daisy/ocr_preprocess.py
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import fitz  # PyMuPDF
+import numpy as np
+
+# Optional preprocessing between rendering and tesseract (page mode): the page
+# is rendered as 8-bit gray, the pixmap samples are viewed as a NumPy array
+# without copying, then binarized with a local-mean threshold, deskewed and
+# cropped to the inked area. Tesseract gets a small 1-bit image.
+
+
+@dataclass(frozen=True)
+class PreprocessConfig:
+    block: int = 31  # local threshold window (px, odd)
+    offset: int = 10  # a pixel is ink when darker than the local mean minus this
+    deskew: bool = True
+    max_skew_deg: float = 5.0
+    skew_step_deg: float = 0.25
+    crop: bool = True
+    margin_px: int = 12
+
+    def cache_id(self) -> str:
+        """
+        Goes into the OCR page cache key; every parameter that changes the
+        image handed to tesseract must be in here.
+        """
+        parts = [f"pp1-b{int(self.block)}-o{int(self.offset)}"]
+        if self.deskew:
+            parts.append(f"dsk{self.max_skew_deg:g}s{self.skew_step_deg:g}")
+        if self.crop:
+            parts.append(f"crop{int(self.margin_px)}")
+        return "-".join(parts)
+
+
+def pixmap_gray_view(pix: "fitz.Pixmap") -> np.ndarray:
+    """
+    (h, w) uint8 view of a gray pixmap's samples; shares the pixmap's memory,
+    so the pixmap must outlive the array.
+    """
+    if pix.n != 1 or pix.alpha:
+        raise ValueError("expected an 8-bit gray pixmap without alpha")
+    buf = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    return buf.reshape(pix.height, pix.stride)[:, : pix.width]
+
+
+def _window_sums(gray: np.ndarray, r: int) -> np.ndarray:
+    """
+    Sum over the (2r+1)^2 window around each pixel (edge-replicated), via
+    separable running sums in int32.
+    """
+    k = 2 * r + 1
+    a = np.pad(gray, r, mode="edge").astype(np.int32)
+    c = np.cumsum(a, axis=1, dtype=np.int32)
+    rows = c[:, k - 1 :].copy()
+    rows[:, 1:] -= c[:, : -k]
+    c = np.cumsum(rows, axis=0, dtype=np.int32)
+    out = c[k - 1 :].copy()
+    out[1:] -= c[: -k]
+    return out
+
+
+def binarize(gray: np.ndarray, block: int = 31, offset: int = 10) -> np.ndarray:
+    """
+    Ink mask (True = dark): pixel darker than its local window mean minus offset.
+    """
+    r = max(1, int(block) // 2)
+    kk = (2 * r + 1) ** 2
+    sums = _window_sums(gray, r)
+    return gray.astype(np.int32) * kk < sums - int(offset) * kk
+
+
+def estimate_skew(ink: np.ndarray, *, max_deg: float = 5.0, step_deg: float = 0.25, sample: int = 4) -> float:
+    """
+    Text line slope in degrees (positive: lines run down to the right), by
+    maximising the sharpness of the row projection over candidate angles.
+    """
+    ys, xs = np.nonzero(ink[::sample, ::sample])
+    if len(ys) < 50:
+        return 0.0
+    ys = ys.astype(np.float64)
+    xs = xs.astype(np.float64)
+    best, best_score = 0.0, -1.0
+    for deg in np.arange(-max_deg, max_deg + step_deg / 2, step_deg):
+        rows = np.round(ys - xs * np.tan(np.radians(deg))).astype(np.int64)
+        profile = np.bincount(rows - rows.min())
+        score = float(np.dot(profile, profile))
+        if score > best_score:
+            best, best_score = float(deg), score
+    return best
+
+
+def _ink_bbox(ink: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
+    rows = np.flatnonzero(ink.any(axis=1))
+    if not len(rows):
+        return None
+    cols = np.flatnonzero(ink.any(axis=0))
+    return int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1
+
+
+def preprocess_gray(gray: np.ndarray, cfg: PreprocessConfig) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Returns (1-bit PIL image or None for a blank page, info).
+    """
+    from PIL import Image  # type: ignore
+
+    t0 = time.perf_counter()
+    h, w = gray.shape
+    info: Dict[str, Any] = {"pixels_in": int(h * w), "skew_deg": 0.0, "blank": False}
+
+    ink = binarize(gray, cfg.block, cfg.offset)
+    if cfg.deskew:
+        skew = estimate_skew(ink, max_deg=cfg.max_skew_deg, step_deg=cfg.skew_step_deg)
+        info["skew_deg"] = skew
+        if abs(skew) >= cfg.skew_step_deg:
+            # PIL rotates counter-clockwise, which levels lines that run down to the right
+            mask = Image.fromarray(np.where(ink, 255, 0).astype(np.uint8), "L")
+            mask = mask.rotate(skew, resample=Image.NEAREST, expand=True, fillcolor=0)
+            ink = np.asarray(mask) > 127
+
+    bbox = _ink_bbox(ink) if cfg.crop else (0, ink.shape[0], 0, ink.shape[1])
+    if bbox is None:
+        info.update({"blank": True, "pixels_out": 0, "sec": round(time.perf_counter() - t0, 4)})
+        return None, info
+    m = int(cfg.margin_px) if cfg.crop else 0
+    y0, y1 = max(0, bbox[0] - m), min(ink.shape[0], bbox[1] + m)
+    x0, x1 = max(0, bbox[2] - m), min(ink.shape[1], bbox[3] + m)
+    # Tesseract wants dark text on white: 1-bit image, True = white
+    img = Image.fromarray(~ink[y0:y1, x0:x1])
+    info["pixels_out"] = int((y1 - y0) * (x1 - x0))
+    info["sec"] = round(time.perf_counter() - t0, 4)
+    return img, info
+
+
+def render_preprocessed(doc: "fitz.Document", i: int, dpi: int, cfg: PreprocessConfig) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Renders page i as gray and preprocesses it in place of a PIL conversion.
+    """
+    pix = doc.load_page(int(i)).get_pixmap(dpi=int(dpi), colorspace=fitz.csGRAY, alpha=False)
+    img, info = preprocess_gray(pixmap_gray_view(pix), cfg)
+    del pix
+    return img, info
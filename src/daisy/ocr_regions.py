@@ -0,0 +1,234 @@
+# src/daisy/ocr_regions.py
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+from .util import extract_yes_no
+
+# Label-region OCR for the DAC: find the field labels on a page, then OCR only
+# small clips next to them (with field-specific tesseract configs) instead of
+# the whole page. The recognised values are emitted as "<label lines>\n<value>"
+# blocks, the same shape the DAC field extractors already parse.
+
+# Low-resolution pass used to find label anchors on pages without a text layer
+ANCHOR_DPI = 100
+_CLIP_PAD = 2.0  # pt
+
+_YES_NO_CONFIG = "--psm 7 -c tessedit_char_whitelist=YESNOyesno"
+
+
+@dataclass(frozen=True)
+class RegionField:
+    name: str
+    stack: Tuple[str, ...]  # label lines as printed in the DAC template
+    config: str  # tesseract config for the value clip
+    kind: str  # "digits" | "yes_no" | "text"
+
+
+REGION_FIELDS: Tuple[RegionField, ...] = (
+    RegionField("cms_id", ("CMS Product ID",), "--psm 7 -c tessedit_char_whitelist=0123456789", "digits"),
+    RegionField("it_asset_id", ("IT Asset ID",), "--psm 7", "text"),
+    RegionField("it_asset_name", ("IT Asset Name",), "--psm 7", "text"),
+    RegionField("sod", ("Application is", "SoD relevant?"), _YES_NO_CONFIG, "yes_no"),
+    RegionField("fa", ("Functional Area", "relevant?"), _YES_NO_CONFIG, "yes_no"),
+    RegionField("upload", ("Do you want to", "upload the", "entitlement", "composition?"), _YES_NO_CONFIG, "yes_no"),
+    RegionField("cif", ("Is Application a", "critical and", "important function?"), _YES_NO_CONFIG, "yes_no"),
+)
+
+_WORD_STRIP_RE = re.compile(r"^[^\w?]+|[^\w?]+$")
+
+
+@dataclass
+class RegionJob:
+    """
+    Everything the OCR stage needs for one page; built on the render thread.
+    """
+
+    page: int
+    # (field, clips) with clips in preference order: right of the label block, then below it
+    fields: List[Tuple[RegionField, List[Any]]] = field(default_factory=list)
+    # Full-page image when no anchor was found on a page without a text layer
+    full_page: Any = None
+    anchor_source: Optional[str] = None  # "text_layer" | "low_dpi_ocr"
+    anchor_sec: float = 0.0
+    page_pixels: int = 0  # full page at the OCR DPI, for comparison
+    # Filled by recognize_region_job()
+    pixels_ocred: int = 0
+    fields_found: List[str] = field(default_factory=list)
+
+
+def _norm(word: str) -> str:
+    return _WORD_STRIP_RE.sub("", word).lower()
+
+
+def _words_from_text_layer(page: "fitz.Page") -> List[Tuple[str, fitz.Rect, Tuple[int, int]]]:
+    return [
+        (w[4], fitz.Rect(w[:4]), (int(w[5]), int(w[6])))
+        for w in page.get_text("words")
+        if str(w[4]).strip()
+    ]
+
+
+def _words_from_low_dpi_ocr(page: "fitz.Page", lang: str) -> List[Tuple[str, fitz.Rect, Tuple[int, int]]]:
+    import pytesseract  # type: ignore
+    from PIL import Image  # type: ignore
+
+    pix = page.get_pixmap(dpi=ANCHOR_DPI, colorspace=fitz.csGRAY, alpha=False)
+    img = Image.frombytes("L", [pix.width, pix.height], pix.samples)
+    data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
+    scale = 72.0 / ANCHOR_DPI
+    out: List[Tuple[str, fitz.Rect, Tuple[int, int]]] = []
+    for k, text in enumerate(data.get("text") or []):
+        if not str(text).strip():
+            continue
+        x, y, w, h = (float(data[c][k]) * scale for c in ("left", "top", "width", "height"))
+        line_id = (int(data["block_num"][k]) * 1000 + int(data["par_num"][k]), int(data["line_num"][k]))
+        out.append((str(text), fitz.Rect(x, y, x + w, y + h), line_id))
+    return out
+
+
+def _find_phrase(words: List[Tuple[str, fitz.Rect, Tuple[int, int]]], phrase: str) -> Optional[fitz.Rect]:
+    """
+    First run of consecutive words on one line matching `phrase`
+    (case/punctuation-insensitive), extended over any label text that directly
+    follows it on the line, so a value clip never starts inside the label.
+    """
+    target = [_norm(t) for t in phrase.split()]
+    n = len(target)
+    for k in range(len(words) - n + 1):
+        run = words[k : k + n]
+        if any(run[j][2] != run[0][2] for j in range(n)):
+            continue
+        if not all(_norm(run[j][0]) == target[j] for j in range(n)):
+            continue
+        r = fitz.Rect(run[0][1])
+        for _, wr, _ in run[1:]:
+            r |= wr
+        j = k + n
+        while j < len(words) and words[j][2] == run[0][2] and words[j][1].x0 - r.x1 < r.height:
+            r |= words[j][1]
+            j += 1
+        return r
+    return None
+
+
+def _label_block(words: List[Tuple[str, fitz.Rect, Tuple[int, int]]], f: RegionField) -> Optional[Tuple[fitz.Rect, float]]:
+    """
+    Union of the label lines found in order below the first one; (rect, line height).
+    """
+    first = _find_phrase(words, f.stack[0])
+    if first is None:
+        return None
+    block = fitz.Rect(first)
+    found = 1
+    for line in f.stack[1:]:
+        r = _find_phrase([w for w in words if w[1].y0 >= block.y1 - 1], line)
+        # Only follow lines that continue the stack (directly below, same column)
+        if r is None or r.y0 - block.y1 > 2.0 * first.height or abs(r.x0 - first.x0) > 4 * first.height:
+            break
+        block |= r
+        found += 1
+    return block, block.height / found
+
+
+def value_clips(block: fitz.Rect, line_h: float, page_rect: fitz.Rect) -> List[fitz.Rect]:
+    """
+    Candidate value areas for a label block: to its right on the same rows, then
+    a short band right below it.
+    """
+    pad = _CLIP_PAD
+    right = fitz.Rect(block.x1 + pad, block.y0 - pad, page_rect.x1 - pad, block.y1 + pad) & page_rect
+    below = fitz.Rect(block.x0 - pad, block.y1 + pad / 2, page_rect.x1 - pad, block.y1 + 2.5 * line_h) & page_rect
+    return [r for r in (right, below) if r.width > 4 and r.height > 4]
+
+
+def _clip_image(page: "fitz.Page", clip: Optional[fitz.Rect], dpi: int, grayscale: bool) -> Any:
+    from PIL import Image  # type: ignore
+
+    if grayscale:
+        pix = page.get_pixmap(dpi=int(dpi), colorspace=fitz.csGRAY, alpha=False, clip=clip)
+        return Image.frombytes("L", [pix.width, pix.height], pix.samples)
+    pix = page.get_pixmap(dpi=int(dpi), alpha=False, clip=clip)
+    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+
+
+def render_region_job(doc: "fitz.Document", i: int, *, dpi: int, grayscale: bool, lang: str) -> RegionJob:
+    """
+    Locates label anchors (text layer first, else a low-DPI tesseract pass) and
+    renders the value clips at full DPI. Runs on the render thread.
+    """
+    page = doc.load_page(int(i))
+    job = RegionJob(page=int(i))
+    job.page_pixels = int(round(page.rect.width * dpi / 72.0) * round(page.rect.height * dpi / 72.0))
+    t0 = time.perf_counter()
+
+    words = _words_from_text_layer(page)
+    has_text_layer = bool(words)
+    blocks = {f.name: _label_block(words, f) for f in REGION_FIELDS} if words else {}
+    if any(blocks.values()):
+        job.anchor_source = "text_layer"
+    else:
+        words = _words_from_low_dpi_ocr(page, lang)
+        blocks = {f.name: _label_block(words, f) for f in REGION_FIELDS}
+        if any(blocks.values()):
+            job.anchor_source = "low_dpi_ocr"
+    job.anchor_sec = time.perf_counter() - t0
+
+    for f in REGION_FIELDS:
+        hit = blocks.get(f.name)
+        if hit is None:
+            continue
+        clips = value_clips(hit[0], hit[1], page.rect)
+        if clips:
+            job.fields.append((f, [_clip_image(page, c, dpi, grayscale) for c in clips]))
+
+    # A page without a text layer and without recognisable labels gets full-page
+    # OCR (as in page mode); on text-layer pages the text layer already covers it
+    if not job.fields and not has_text_layer:
+        job.full_page = _clip_image(page, None, dpi, grayscale)
+    return job
+
+
+def _accept(f: RegionField, value: str) -> Optional[str]:
+    v = " ".join(value.split())
+    if not v:
+        return None
+    if f.kind == "digits":
+        m = re.search(r"\d{3,}", v)
+        return m.group(0) if m else None
+    if f.kind == "yes_no":
+        return v if extract_yes_no(v) else None
+    return v
+
+
+def recognize_region_job(job: RegionJob, lang: str) -> Tuple[str, float, Optional[str]]:
+    """
+    OCRs the clips of a RegionJob; never raises. Returns (text, sec, error) like a
+    full-page OCR call and records pixels_ocred / fields_found on the job.
+    """
+    import pytesseract  # type: ignore
+
+    t0 = time.perf_counter()
+    try:
+        if job.full_page is not None:
+            job.pixels_ocred += int(job.full_page.width * job.full_page.height)
+            text = pytesseract.image_to_string(job.full_page, lang=lang) or ""
+            return text, time.perf_counter() - t0, None
+
+        blocks: List[str] = []
+        for f, clips in job.fields:
+            for img in clips:
+                job.pixels_ocred += int(img.width * img.height)
+                v = _accept(f, pytesseract.image_to_string(img, lang=lang, config=f.config) or "")
+                if v:
+                    blocks.append("\n".join(f.stack + (v,)))
+                    job.fields_found.append(f.name)
+                    break
+        return "\n".join(blocks), time.perf_counter() - t0, None
+    except Exception as e:
+        return "", time.perf_counter() - t0, f"{type(e).__name__}: {e}"
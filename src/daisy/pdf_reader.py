@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import logging
+import os
 import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import fitz  # PyMuPDF
 
@@ -13,35 +19,502 @@ XLSX_IN_QUOTES_RE = re.compile(r'\(\s*"([^"]+?\.xlsx)"\s*\)', re.IGNORECASE)
 XLSX_ANY_RE = re.compile(r"([A-Za-z0-9_\-\. ]{3,240}\.xlsx)", re.IGNORECASE)
 
 
+@dataclass(frozen=True)
+class PageText:
+    """
+    Everything validate() needs from one page, extracted once.
+    """
+    text: str
+    lines: List[str]
+    lower: str
+
+    @classmethod
+    def from_text(cls, text: str, lines: Optional[List[str]] = None) -> "PageText":
+        return cls(
+            text=text,
+            lines=list(lines) if lines is not None else [l.rstrip() for l in text.splitlines()],
+            lower=text.lower(),
+        )
+
+
+def _extract_page_text(page) -> str:
+    tp = page.get_textpage()
+    return page.get_text("text", textpage=tp) or ""
+
+
+# Below this page count a process pool costs more than it saves.
+PARALLEL_MIN_PAGES = 64
+
+
+def _split_ranges(n: int, parts: int) -> List[Tuple[int, int]]:
+    parts = max(1, min(int(parts), n))
+    size, rem = divmod(n, parts)
+    out: List[Tuple[int, int]] = []
+    start = 0
+    for k in range(parts):
+        stop = start + size + (1 if k < rem else 0)
+        out.append((start, stop))
+        start = stop
+    return out
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> Tuple[int, List[str], float, int]:
+    """
+    Process-pool worker: open its own fitz handle and extract pages [start, stop).
+    Returns (start, texts, seconds, pid).
+    """
+    t0 = time.perf_counter()
+    doc = fitz.open(path)
+    try:
+        texts = [_extract_page_text(doc[i]) for i in range(start, stop)]
+    finally:
+        doc.close()
+    return start, texts, time.perf_counter() - t0, os.getpid()
+
+
+def find_pages_containing_any(doc, needles: Sequence[str], case_insensitive: bool = True) -> Dict[str, List[int]]:
+    """
+    needle -> sorted 0-based pages containing it, from a single pass over the pages.
+
+    `doc` is anything exposing page_count() and page(i) -> PageText (PdfDoc,
+    the agent's OCR overlay view). Empty needles map to [].
+
+    Cost is pages x needles C-level substring searches: it grows with the
+    label count. A cost linear in document size alone would need an
+    Aho-Corasick automaton in C; without one, both a pure-Python automaton
+    and a compiled alternation regex per page were slower at every label
+    count measured (benchmarks/bench_needle_scan.py: 0.39 s vs 3.5 s for
+    1,000 labels over 200 pages).
+    """
+    keys = list(dict.fromkeys(str(n) for n in needles or []))
+    res: Dict[str, List[int]] = {k: [] for k in keys}
+    live = [k for k in keys if k]
+    if not live:
+        return res
+
+    pats = [(k, k.lower() if case_insensitive else k) for k in live]
+    for i in range(doc.page_count()):
+        entry = doc.page(i)
+        # One pass over the pages; each needle is a C-level substring search
+        # on the cached lowercase text
+        text = entry.lower if case_insensitive else entry.text
+        for k, p in pats:
+            if p in text:
+                res[k].append(i)
+    return res
+
+
 class PdfDoc:
-    def __init__(self, path: Path):
+    """
+    Thin PyMuPDF wrapper with a per-document page text store.
+
+    Each page is parsed at most once (one TextPage per page); every accessor
+    reads from the store afterwards. `stats` counts real extractions vs. store hits.
+
+    With workers > 1, whole-document accessors (all_text, find_pages_*) fill the
+    store from a process pool first, one page range per worker; the text is
+    identical to serial extraction. Per-worker timings land in `worker_timings`.
+    """
+
+    def __init__(self, path: Path, workers: int = 1):
         self.path = Path(path)
         self.doc = fitz.open(self.path)
+        self.workers = max(1, int(workers or 1))
+        self._pages: Dict[int, PageText] = {}
+        self._needle_hits: Dict[Tuple[Tuple[str, ...], bool], Dict[str, List[int]]] = {}
+        self._prefetched = False
+        self.worker_timings: List[Dict[str, Any]] = []
+        self.stats: Dict[str, int] = {"page_extract_calls": 0, "page_store_hits": 0, "needle_scans": 0}
+
+    @classmethod
+    def from_page_texts(cls, path: Path, pages: Sequence[Dict[str, Any]]) -> "PdfDoc":
+        """
+        Rebuild a PdfDoc from stored pages ({"text": ..., optional "lines": [...]})
+        without opening the PDF.
+        """
+        self = cls.__new__(cls)
+        self.path = Path(path)
+        self.doc = None
+        self.workers = 1
+        self._pages = {}
+        for i, pg in enumerate(pages):
+            lines = pg.get("lines")
+            self._pages[i] = PageText.from_text(str(pg.get("text") or ""), [str(l) for l in lines] if lines is not None else None)
+        self._needle_hits = {}
+        self._prefetched = True
+        self.worker_timings = []
+        self.stats = {"page_extract_calls": 0, "page_store_hits": 0, "needle_scans": 0}
+        return self
 
     def page_count(self) -> int:
-        return len(self.doc)
+        return len(self.doc) if self.doc is not None else len(self._pages)
+
+    def page(self, index0: int) -> PageText:
+        i = int(index0)
+        if i < 0:
+            i += self.page_count()
+        entry = self._pages.get(i)
+        if entry is not None:
+            self.stats["page_store_hits"] += 1
+            return entry
+
+        entry = PageText.from_text(_extract_page_text(self.doc[i]))
+        self._pages[i] = entry
+        self.stats["page_extract_calls"] += 1
+        return entry
+
+    def _prefetch_all(self) -> None:
+        """
+        Fill the store for the whole document from a process pool (workers > 1
+        and large documents only). Any pool failure falls back to serial page().
+        """
+        if self._prefetched:
+            return
+        self._prefetched = True
+        n = self.page_count()
+        if self.workers <= 1 or n - len(self._pages) < PARALLEL_MIN_PAGES:
+            return
+
+        ranges = _split_ranges(n, self.workers)
+        try:
+            with ProcessPoolExecutor(max_workers=len(ranges)) as ex:
+                futs = [ex.submit(_extract_page_range, str(self.path), a, b) for a, b in ranges]
+                for (a, b), fut in zip(ranges, futs):
+                    start, texts, sec, pid = fut.result()
+                    for i, text in enumerate(texts, start=start):
+                        if i not in self._pages:
+                            self._pages[i] = PageText.from_text(text)
+                            self.stats["page_extract_calls"] += 1
+                    self.worker_timings.append({"pages": [a, b], "sec": round(sec, 4), "pid": pid})
+        except Exception as e:
+            logging.warning("Parallel page extraction failed for %s (%s); continuing serially", self.path.name, e)
+            self.worker_timings.append({"error": f"{type(e).__name__}: {e}"})
 
     def page_text(self, index0: int) -> str:
-        return self.doc[index0].get_text("text") or ""
+        return self.page(index0).text
 
     def page_lines(self, index0: int) -> List[str]:
-        return [l.rstrip() for l in self.page_text(index0).splitlines()]
+        return list(self.page(index0).lines)
 
     def all_text(self) -> str:
-        out = []
-        for p in self.doc:
-            out.append(p.get_text("text") or "")
-        return "\n".join(out)
+        self._prefetch_all()
+        return "\n".join(self.page(i).text for i in range(self.page_count()))
 
     def find_pages_containing(self, needle: str, case_insensitive: bool = True) -> List[int]:
+        self._prefetch_all()
         n = needle.lower() if case_insensitive else needle
         hits = []
-        for i in range(len(self.doc)):
-            t = self.page_text(i)
-            if (t.lower() if case_insensitive else t).find(n) != -1:
+        for i in range(self.page_count()):
+            entry = self.page(i)
+            if (entry.lower if case_insensitive else entry.text).find(n) != -1:
                 hits.append(i)
         return hits
 
+    def find_pages_containing_any(self, needles: Sequence[str], case_insensitive: bool = True) -> Dict[str, List[int]]:
+        """
+        Multi-needle variant of find_pages_containing(): one pass over the
+        document for all needles. Results are memoized per needle set.
+        """
+        key = (tuple(needles or []), bool(case_insensitive))
+        hit = self._needle_hits.get(key)
+        if hit is None:
+            self._prefetch_all()
+            self.stats["needle_scans"] += 1
+            hit = find_pages_containing_any(self, key[0], case_insensitive)
+            self._needle_hits[key] = hit
+        return {k: list(v) for k, v in hit.items()}
+
+    def store_stats(self) -> Dict[str, int]:
+        return {
+            "page_count": self.page_count(),
+            "pages_extracted": len(self._pages),
+            **self.stats,
+        }
+
+
+# Per-page scan classification thresholds
+PAGE_TEXT_MIN_CHARS = 20
+PAGE_IMAGE_COVERAGE_MIN = 0.5
+PAGE_VECTOR_MIN = 50
+
+
+@dataclass
+class PdfProbe:
+    """
+    Result of probe_pdf(): enough to decide text-based vs. scanned.
+    """
+    page_count: int
+    # complete: len of all page texts joined with "\n" and stripped (same as
+    # PdfDoc.all_text()); else a lower bound already >= min_text_chars
+    text_chars: int
+    # complete: sum of per-page image references (page.get_images(full=True));
+    # else distinct image XObjects in the xref table
+    image_count: int
+    complete: bool  # every page was read
+    pages: List[Dict[str, Any]]  # per read page: page, text_chars, image_count, image_coverage, vector_count
+
+
+def _xref_image_count(doc) -> int:
+    n = 0
+    for xref in range(1, doc.xref_length()):
+        try:
+            if doc.xref_get_key(xref, "Subtype")[1] == "/Image":
+                n += 1
+        except Exception:
+            continue
+    return n
+
+
+def _image_coverage(page) -> float:
+    """Fraction of the page area covered by placed images (overlaps not merged; capped at 1.0)."""
+    area = abs(page.rect)
+    if area <= 0:
+        return 0.0
+    covered = 0.0
+    for info in page.get_image_info():
+        r = fitz.Rect(info["bbox"]) & page.rect
+        if not r.is_empty:
+            covered += abs(r)
+    return min(1.0, covered / area)
+
+
+def probe_pdf(path: Path, min_text_chars: int) -> PdfProbe:
+    """
+    Single-open text/scan probe for evidence PDFs.
+
+    Pages are read in order until min_text_chars is reached, so a text-based
+    PDF usually costs one page load; its image count then comes from the xref
+    table (no page loads) and both counts are partial (complete=False). A PDF
+    that never reaches the minimum, the only kind that can need OCR, is read
+    whole: exact counts (same values as PdfDoc.all_text() plus a per-page
+    get_images() loop) and the per-page data for classify_probe_pages().
+    Image coverage and vector paths are only measured on low-text pages, the
+    only ones the classification looks at.
+    """
+    doc = fitz.open(str(path))
+    try:
+        n = len(doc)
+        texts: List[str] = []
+        pages: List[Dict[str, Any]] = []
+        page_images = 0
+        seen = 0
+        complete = True
+        for i in range(n):
+            page = doc.load_page(i)
+            t = _extract_page_text(page)
+            texts.append(t)
+            chars = len(t.strip())
+            try:
+                imgs = len(page.get_images(full=True))
+            except Exception:
+                imgs = 0
+            page_images += imgs
+            coverage, vectors = 0.0, 0
+            if chars < PAGE_TEXT_MIN_CHARS:
+                try:
+                    coverage = _image_coverage(page) if imgs else 0.0
+                except Exception:
+                    coverage = 0.0
+                try:
+                    vectors = len(page.get_cdrawings())
+                except Exception:
+                    vectors = 0
+            pages.append({
+                "page": i,
+                "text_chars": chars,
+                "image_count": imgs,
+                "image_coverage": round(coverage, 4),
+                "vector_count": vectors,
+            })
+            # Stripped page lengths never exceed the joined text's length
+            seen += chars
+            if seen >= max(0, int(min_text_chars)) and i < n - 1:
+                complete = False
+                break
+        image_count = page_images if complete else _xref_image_count(doc)
+    finally:
+        doc.close()
+
+    return PdfProbe(
+        page_count=n,
+        text_chars=len("\n".join(texts).strip()),
+        image_count=image_count,
+        complete=complete,
+        pages=pages,
+    )
+
+
+def classify_probe_page(page: Dict[str, Any]) -> str:
+    """
+    One of: "text", "image_only", "vector", "blank".
+
+    "image_only" (the OCR candidates) = almost no extractable text and images
+    covering at least half the page. Low-text pages made of many vector paths
+    (diagrams, outlined fonts) are "vector" and are not OCR'd.
+    """
+    if int(page.get("text_chars") or 0) >= PAGE_TEXT_MIN_CHARS:
+        return "text"
+    if float(page.get("image_coverage") or 0.0) >= PAGE_IMAGE_COVERAGE_MIN:
+        return "image_only"
+    if int(page.get("vector_count") or 0) >= PAGE_VECTOR_MIN:
+        return "vector"
+    return "blank"
+
+
+def classify_probe_pages(probe: PdfProbe) -> Dict[str, List[int]]:
+    """
+    class -> 0-based pages, for the pages the probe looked at.
+    """
+    out: Dict[str, List[int]] = {}
+    for pg in probe.pages:
+        out.setdefault(classify_probe_page(pg), []).append(int(pg["page"]))
+    return out
+
+
+# Linear-time scanner (same results as the two regex passes above, anchored on ".xlsx")
+_XLSX_EXT_RE = re.compile(r"\.xlsx", re.IGNORECASE)
+_XLSX_NON_NAME_RE = re.compile(r"[^A-Za-z0-9_\-\. ]", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+_XLSX_NAME_MIN = 3
+_XLSX_NAME_MAX = 240
+# Streaming mode keeps at most this much text behind a hit for the quoted pass.
+_XLSX_QUOTED_MAX = 4096
+
+
+class XlsxNameScanner:
+    """
+    Streaming scanner for referenced .xlsx filenames.
+
+    feed() raw text chunks (e.g. one page at a time), then call names().
+    Whitespace is collapsed across chunk boundaries, so names wrapped across
+    lines/pages are still found, without building the full normalized text.
+
+    Every ".xlsx" hit is resolved by walking backwards (at most 240 chars for
+    the fallback pass, up to the opening quote for the quoted pass), so the cost
+    is linear in the text size. Results match XLSX_IN_QUOTES_RE (first) and
+    XLSX_ANY_RE (second) on the whitespace-normalized text.
+    """
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._base = 0  # absolute offset of _buf[0] in the normalized stream
+        self._ends_ws = False
+        self._scan_from = 0
+        self._pending: Deque[int] = deque()
+        self._fallback_end = 0  # finditer cursor of the fallback pass
+        self._quoted: List[str] = []
+        self._fallback: List[str] = []
+
+    def feed(self, chunk: str) -> None:
+        chunk = _WS_RE.sub(" ", chunk or "")
+        if not chunk:
+            return
+        if self._ends_ws and chunk[0] == " ":
+            chunk = chunk[1:]
+            if not chunk:
+                return
+        self._ends_ws = chunk[-1] == " "
+        self._buf += chunk
+
+        end = self._base + len(self._buf)
+        pos = self._scan_from - self._base
+        for m in _XLSX_EXT_RE.finditer(self._buf, pos):
+            self._pending.append(self._base + m.start())
+            pos = m.end()
+        self._scan_from = max(self._base + pos, end - 4)
+
+        # A hit is final once the longest possible fallback match around it is buffered
+        self._resolve(until=end - (_XLSX_NAME_MAX + 5))
+        self._trim()
+
+    def names(self) -> List[str]:
+        self._resolve(until=None)
+        out: List[str] = []
+        seen = set()
+        for name in self._quoted + self._fallback:
+            low = name.lower()
+            if low not in seen:
+                seen.add(low)
+                out.append(name)
+        return out
+
+    def _at(self, absolute: int, n: int = 1) -> str:
+        i = absolute - self._base
+        return self._buf[i:i + n] if i >= 0 else ""
+
+    def _resolve(self, until: Optional[int]) -> None:
+        while self._pending and (until is None or self._pending[0] <= until):
+            x = self._pending.popleft()
+            self._quoted_hit(x)
+            self._fallback_hit(x)
+
+    def _quoted_hit(self, x: int) -> None:
+        # ("<no quotes>.xlsx") with optional single spaces around the quotes
+        q2 = x + 5
+        if self._at(q2) != '"':
+            return
+        if not (self._at(q2 + 1) == ")" or self._at(q2 + 1, 2) == " )"):
+            return
+        lo = max(self._base, x - _XLSX_QUOTED_MAX)
+        q = self._buf.rfind('"', lo - self._base, x - self._base)
+        if q < 0:
+            return
+        q += self._base
+        if x - (q + 1) < 1:
+            return
+        if not (self._at(q - 1) == "(" or self._at(q - 2, 2) == "( "):
+            return
+        name = Path(self._at(q + 1, q2 - q - 1)).name
+        name = _WS_RE.sub(" ", name).strip()
+        self._quoted.append(name)
+
+    def _fallback_hit(self, x: int) -> None:
+        if x < self._fallback_end:
+            return
+        lo = max(self._fallback_end, x - _XLSX_NAME_MAX)
+        start = lo
+        for m in _XLSX_NON_NAME_RE.finditer(self._buf, lo - self._base, x - self._base):
+            start = self._base + m.end()
+        if x - start < _XLSX_NAME_MIN:
+            return
+
+        # Greedy: extend to the last hit within 240 chars of the start in the same run
+        limit = start + _XLSX_NAME_MAX
+        stop = _XLSX_NON_NAME_RE.search(self._buf, x - self._base, limit + 5 - self._base)
+        stop_abs = (self._base + stop.start()) if stop else None
+        end_x = x
+        while self._pending and self._pending[0] <= limit and (stop_abs is None or self._pending[0] < stop_abs):
+            y = self._pending.popleft()
+            self._quoted_hit(y)
+            end_x = y
+
+        name = Path(self._at(start, end_x + 5 - start)).name
+        name = _WS_RE.sub(" ", name).strip()
+        self._fallback_end = end_x + 5
+        if name.lower().endswith(".xlsx"):
+            self._fallback.append(name)
+
+    def _trim(self) -> None:
+        keep_from = self._pending[0] if self._pending else self._scan_from
+        keep_from -= _XLSX_QUOTED_MAX + 2
+        cut = keep_from - self._base
+        if cut > 0:
+            self._buf = self._buf[cut:]
+            self._base += cut
+
+
+def scan_referenced_xlsx_filenames(chunks: Iterable[str], sep: str = "\n") -> List[str]:
+    """
+    Streaming form of find_referenced_xlsx_filenames() over page texts
+    (equivalent to calling it on sep.join(chunks)).
+    """
+    sc = XlsxNameScanner()
+    for k, chunk in enumerate(chunks):
+        if k:
+            sc.feed(sep)
+        sc.feed(chunk)
+    return sc.names()
+
 
 def find_referenced_xlsx_filenames(text: str) -> List[str]:
     """
@@ -50,34 +523,8 @@ def find_referenced_xlsx_filenames(text: str) -> List[str]:
     IMPORTANT:
     DAC PDFs often wrap long filenames across lines.
     We normalize whitespace first so we don't get junk matches like "Services.xlsx".
+    Quoted names ("file.xlsx") come first, then any .xlsx-like token.
     """
     if not text:
         return []
-
-    # Normalize whitespace (fixes line-wrapped names)
-    text = re.sub(r"\s+", " ", text)
-
-    out: List[str] = []
-    seen = set()
-
-    # Prefer quoted ones: ("file.xlsx")
-    for m in XLSX_IN_QUOTES_RE.finditer(text):
-        name = Path(m.group(1)).name
-        name = re.sub(r"\s+", " ", name).strip()
-        low = name.lower()
-        if low not in seen:
-            seen.add(low)
-            out.append(name)
-
-    # Fallback: any .xlsx-like token
-    for m in XLSX_ANY_RE.finditer(text):
-        name = Path(m.group(1)).name
-        name = re.sub(r"\s+", " ", name).strip()
-        if not name.lower().endswith(".xlsx"):
-            continue
-        low = name.lower()
-        if low not in seen:
-            seen.add(low)
-            out.append(name)
-
-    return out
+    return scan_referenced_xlsx_filenames([text])
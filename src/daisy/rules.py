@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Pattern
 import logging
+import re
 import yaml
 
 
@@ -16,6 +17,52 @@ DEFAULT_REQUIRED_PDFS = [
 ]
 
 
+# Built-in column rules per Excel export (the only copy of the defaults).
+# rules.yaml `excel_checks` entries replace an export's list; same shape.
+DEFAULT_EXCEL_CHECKS: Dict[str, List[Dict[str, Any]]] = {
+    "Entitlement Services.xlsx": [
+        {
+            "id": "S4.1-EX-01",
+            "name": "Entitlement Services: required master data filled",
+            "type": "non_empty",
+            "columns": ["Display name", "Description", "SoD Area", "Tier Level"],
+            "id_column": "Display name",
+            "threshold": "entitlements_required",
+        },
+        {
+            "id": "S4.1-EX-02",
+            "name": "Entitlement Services: descriptions are meaningful",
+            "type": "meaningful_description",
+            "columns": ["Description"],
+            "display_column": "Display name",
+            "threshold": "entitlements_descriptions",
+        },
+    ],
+    "IT Role Services.xlsx": [
+        {
+            "id": "S4.2-EX-01",
+            "name": "IT Role Services: required master data filled (base + owner fallback)",
+            "missing_name": "IT Role Services: required master data filled",
+            "type": "non_empty",
+            "columns": ["Display name", "Description"],
+            "not_null": ["Tier Level"],
+            "any_of": ["IT Role Owner", "cust_owner", "Application Owner"],
+            "threshold": "itroles_required",
+            "missing_columns": "not_met",
+        },
+        {
+            "id": "S4.2-EX-02",
+            "name": "IT Role Services: descriptions are meaningful",
+            "type": "meaningful_description",
+            "columns": ["Description"],
+            "display_column": "Display name",
+            "threshold": "itroles_descriptions",
+        },
+    ],
+}
+
+EXCEL_CHECK_TYPES = ("non_empty", "meaningful_description", "allowed_values", "regex")
+
 
 @dataclass
 class PdfContentRule:
@@ -44,6 +91,54 @@ class ExcelThresholdRule:
     non_mvp_severity: Optional[str] = None
 
 
+@dataclass
+class ExcelColumnRule:
+    """
+    One row check over an export's columns. A row passes when every one of
+    `columns` passes the type's test, every `not_null` cell is set (any value,
+    even blank text) and, if any `any_of` column exists in the sheet, at least
+    one of those is filled. Cells are compared as stripped text.
+    """
+    id: str
+    name: str
+    type: str = "non_empty"  # see EXCEL_CHECK_TYPES
+    columns: List[str] = field(default_factory=list)
+    not_null: List[str] = field(default_factory=list)
+    any_of: List[str] = field(default_factory=list)
+    display_column: str = "Display name"  # meaningful_description: the row's name
+    values: List[str] = field(default_factory=list)  # allowed_values
+    pattern: str = ""  # regex: must match the whole cell
+    allow_empty: bool = True  # allowed_values / regex: empty cells pass
+    id_column: Optional[str] = None  # leads the failing-row samples
+    threshold: str = ""  # name of an excel_thresholds entry
+    missing_columns: str = "fail_rows"  # "fail_rows" | "not_met" (no row count, check NOT_MET)
+    missing_name: str = ""  # name of the SKIPPED / missing-columns result ("" = name)
+    regex: Optional[Pattern[str]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def required(self) -> List[str]:
+        # Columns the check cannot run without (any_of columns are optional)
+        lead = [self.display_column] if self.type == "meaningful_description" else []
+        return list(dict.fromkeys(lead + self.columns + self.not_null))
+
+    @property
+    def sample_columns(self) -> List[str]:
+        lead = [self.id_column] if self.id_column else []
+        return list(dict.fromkeys(lead + self.required + self.any_of))
+
+
+@dataclass
+class ExcelCheckPlan:
+    """
+    Compiled column rules of one export: `columns` is every column any check
+    reads (the projection to load), in first-use order. excel_checks
+    evaluates all checks of a plan in one pass, normalizing each column once.
+    """
+    export: str
+    checks: List[ExcelColumnRule]
+    columns: List[str]
+
+
 @dataclass
 class Rules:
     pdf_evidence: PdfEvidenceRules
@@ -54,6 +149,10 @@ class Rules:
     itroles_required: ExcelThresholdRule
     itroles_descriptions: ExcelThresholdRule
 
+    # All excel_thresholds entries by name, and the column checks per export
+    excel_thresholds: Dict[str, ExcelThresholdRule] = field(default_factory=dict)
+    excel_checks: Dict[str, ExcelCheckPlan] = field(default_factory=dict)
+
 
 def _excel_rule(block: dict, *, default_ratio: float, default_abs: int, default_sev: str = "major") -> ExcelThresholdRule:
     block = block or {}
@@ -66,6 +165,83 @@ def _excel_rule(block: dict, *, default_ratio: float, default_abs: int, default_
     )
 
 
+def _str_list(v: Any) -> List[str]:
+    if v is None:
+        return []
+    if isinstance(v, (list, tuple)):
+        return [str(x) for x in v if x is not None]
+    return [str(v)]
+
+
+def _excel_column_rule(export: str, r: Any, thresholds: Dict[str, ExcelThresholdRule]) -> Optional[ExcelColumnRule]:
+    if not isinstance(r, dict):
+        return None
+    rid = str(r.get("id") or "").strip()
+    if not rid:
+        return None
+    rtype = str(r.get("type") or "non_empty").strip().lower()
+    if rtype not in EXCEL_CHECK_TYPES:
+        logging.warning("excel_checks[%s] %s: unknown type %r -> skipped", export, rid, rtype)
+        return None
+    rule = ExcelColumnRule(
+        id=rid,
+        name=str(r.get("name") or rid).strip(),
+        type=rtype,
+        columns=_str_list(r.get("columns", r.get("column"))),
+        not_null=_str_list(r.get("not_null")),
+        any_of=_str_list(r.get("any_of")),
+        display_column=str(r.get("display_column") or "Display name"),
+        values=[v.strip() for v in _str_list(r.get("values"))],
+        pattern=str(r.get("pattern") or ""),
+        allow_empty=bool(r.get("allow_empty", True)),
+        id_column=(str(r["id_column"]) if r.get("id_column") else None),
+        threshold=str(r.get("threshold") or ""),
+        missing_columns=str(r.get("missing_columns") or "fail_rows").strip().lower(),
+        missing_name=str(r.get("missing_name") or "").strip(),
+    )
+    if rule.missing_columns not in ("fail_rows", "not_met"):
+        logging.warning("excel_checks[%s] %s: unknown missing_columns %r -> fail_rows", export, rid, rule.missing_columns)
+        rule.missing_columns = "fail_rows"
+    if rule.type == "regex":
+        try:
+            rule.regex = re.compile(rule.pattern)
+        except re.error as e:
+            logging.warning("excel_checks[%s] %s: bad pattern (%s) -> skipped", export, rid, e)
+            return None
+    if not rule.required and not rule.any_of:
+        logging.warning("excel_checks[%s] %s: no columns -> skipped", export, rid)
+        return None
+    if rule.threshold not in thresholds:
+        logging.warning("excel_checks[%s] %s: unknown threshold %r -> defaults", export, rid, rule.threshold)
+        thresholds[rule.threshold] = _excel_rule({}, default_ratio=0.10, default_abs=50)
+    return rule
+
+
+def compile_excel_checks(raw: Any, thresholds: Dict[str, ExcelThresholdRule]) -> Dict[str, ExcelCheckPlan]:
+    """
+    `excel_checks` block (export file name -> list of column rules) compiled
+    into one ExcelCheckPlan per export. Exports the block does not mention
+    keep DEFAULT_EXCEL_CHECKS; an empty list disables an export's checks.
+    Malformed rules are skipped with a warning, as content_rules are.
+    """
+    merged: Dict[str, Any] = dict(DEFAULT_EXCEL_CHECKS)
+    if isinstance(raw, dict):
+        merged.update({str(k): v for k, v in raw.items()})
+
+    plans: Dict[str, ExcelCheckPlan] = {}
+    for export, rules_list in merged.items():
+        checks: List[ExcelColumnRule] = []
+        for r in rules_list if isinstance(rules_list, list) else []:
+            rule = _excel_column_rule(export, r, thresholds)
+            if rule is not None:
+                checks.append(rule)
+        columns: List[str] = []
+        for c in checks:
+            columns += c.sample_columns
+        plans[export] = ExcelCheckPlan(export=export, checks=checks, columns=list(dict.fromkeys(columns)))
+    return plans
+
+
 def load_rules(rules_path: Optional[Path]) -> Rules:
     path = Path(rules_path) if rules_path else (Path("config") / "rules.yaml")
 
@@ -131,10 +307,25 @@ def load_rules(rules_path: Optional[Path]) -> Rules:
     it_req = _excel_rule(ex.get("itroles_required", {}), default_ratio=0.01, default_abs=5)
     it_desc = _excel_rule(ex.get("itroles_descriptions", {}), default_ratio=0.01, default_abs=5, default_sev="major")
 
+    thresholds: Dict[str, ExcelThresholdRule] = {
+        str(k): _excel_rule(v, default_ratio=0.10, default_abs=50) for k, v in ex.items() if isinstance(v, dict)
+    }
+    thresholds.update(
+        {
+            "entitlements_required": ent_req,
+            "entitlements_descriptions": ent_desc,
+            "itroles_required": it_req,
+            "itroles_descriptions": it_desc,
+        }
+    )
+    excel_checks = compile_excel_checks(data.get("excel_checks"), thresholds)
+
     return Rules(
         pdf_evidence=pdf_rules,
         entitlements_required=ent_req,
         entitlements_descriptions=ent_desc,
         itroles_required=it_req,
         itroles_descriptions=it_desc,
+        excel_thresholds=thresholds,
+        excel_checks=excel_checks,
     )
@@ -0,0 +1,287 @@
+# src/daisy/workbook_cache.py
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache_store import atomic_write_bytes, decode_record_bytes, encode_record, touch_entry
+from .digest import file_sha256
+from .excel_checks import read_excel_columns, read_excel_first_sheet
+
+# Bump whenever the loader changes what ends up in the DataFrame; old sidecars
+# then simply stop matching.
+WORKBOOK_CACHE_VERSION = "3"
+
+_StatKey = Tuple[int, int]  # (size, mtime_ns)
+
+
+def _json_cell(v: Any) -> Any:
+    # Cell values as JSON; dates/times are tagged so they come back typed
+    if isinstance(v, (np.generic,)):
+        v = v.item()
+    if v is None or isinstance(v, (bool, int, float, str)):
+        return v
+    if v is pd.NaT:
+        return {"t": "nat"}
+    if isinstance(v, dt.datetime):
+        return {"t": "datetime", "v": pd.Timestamp(v).isoformat()}
+    if isinstance(v, dt.date):
+        return {"t": "date", "v": v.isoformat()}
+    if isinstance(v, dt.time):
+        return {"t": "time", "v": v.isoformat()}
+    if isinstance(v, dt.timedelta):
+        return {"t": "timedelta", "v": pd.Timedelta(v).isoformat()}
+    raise TypeError(f"unsupported cell type {type(v).__name__}")
+
+
+def _cell_from_json(v: Any) -> Any:
+    if not isinstance(v, dict):
+        return v
+    t = v["t"]
+    if t == "nat":
+        return pd.NaT
+    if t == "datetime":
+        return pd.Timestamp(v["v"])
+    if t == "date":
+        return dt.date.fromisoformat(v["v"])
+    if t == "time":
+        return dt.time.fromisoformat(v["v"])
+    if t == "timedelta":
+        return pd.Timedelta(v["v"])
+    raise ValueError(f"unknown cell tag {t!r}")
+
+
+def _frame_to_json(df: pd.DataFrame) -> bytes:
+    """
+    Sidecar body: column names, dtypes and values as plain JSON (categoricals
+    as categories + codes). Unlike a pickle, loading it cannot run code.
+    """
+    if not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1:
+        raise TypeError("only frames with a default RangeIndex are stored")
+    columns: List[Dict[str, Any]] = []
+    for k in range(df.shape[1]):
+        s = df.iloc[:, k]
+        col: Dict[str, Any] = {"name": _json_cell(df.columns[k]), "dtype": str(s.dtype)}
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            cats = s.cat.categories
+            col["categories_dtype"] = str(cats.dtype)
+            col["categories"] = [_json_cell(v) for v in cats.tolist()]
+            col["codes"] = s.cat.codes.tolist()
+        else:
+            col["values"] = [_json_cell(v) for v in s.tolist()]
+        columns.append(col)
+    return json.dumps({"rows": int(len(df)), "columns": columns}, ensure_ascii=False).encode("utf-8")
+
+
+def _frame_from_json(body: bytes) -> pd.DataFrame:
+    doc = json.loads(body.decode("utf-8"))
+    series: Dict[int, pd.Series] = {}
+    for k, col in enumerate(doc["columns"]):
+        if "codes" in col:
+            cats = pd.Index([_cell_from_json(v) for v in col["categories"]], dtype=col["categories_dtype"])
+            series[k] = pd.Series(pd.Categorical.from_codes(col["codes"], categories=cats))
+        else:
+            series[k] = pd.Series([_cell_from_json(v) for v in col["values"]], dtype=col["dtype"])
+    df = pd.DataFrame(series, index=pd.RangeIndex(int(doc["rows"])))
+    df.columns = [_cell_from_json(c["name"]) for c in doc["columns"]]
+    return df
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the process RSS high-water mark (Linux); False where unsupported,
+    in which case peak_rss_bytes() stays the lifetime peak. For benchmarks
+    only: it resets the mark for the whole process, under any other caller
+    measuring it (library code uses peak_rss_growth()).
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_growth(before: Optional[int], after: Optional[int]) -> Dict[str, Any]:
+    """
+    peak_rss_mb (process high-water mark after a load) and peak_rss_growth_mb
+    (how far the load raised it: 0 when it stayed under an earlier peak, so a
+    lower bound of the load's own footprint) from peak_rss_bytes() taken
+    around it.
+    """
+    if before is None or after is None:
+        return {"peak_rss_mb": None, "peak_rss_growth_mb": None}
+    return {
+        "peak_rss_mb": round(after / (1 << 20), 1),
+        "peak_rss_growth_mb": round(max(0, after - before) / (1 << 20), 1),
+    }
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Process RSS high-water mark: VmHWM on Linux, else ru_maxrss.
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        import sys
+
+        rss = int(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+        return rss if sys.platform == "darwin" else rss * 1024
+    except Exception:
+        return None
+
+
+class WorkbookCache:
+    """
+    First-sheet DataFrames of evidence workbooks, parsed once per run.
+
+    Memoized on (path, size, mtime_ns, columns), so every section asking for
+    the same export shares one parse. With `columns`, only those columns are
+    streamed out of the sheet (see excel_checks.read_excel_columns). With a
+    sidecar dir the parsed frame is also stored as JSON keyed by the file's
+    sha256 (through the digest registry), and a repeat run on an unchanged
+    export skips openpyxl entirely.
+
+    With `compact`, column loads keep repeating text columns as categoricals
+    (read_excel_columns(compact=True)): same values, a fraction of the memory.
+
+    Per file, parse_sec and the process peak RSS around the load
+    (peak_rss_growth()) are recorded.
+
+    The returned DataFrame is shared between callers: treat it as read-only.
+    """
+
+    def __init__(
+        self,
+        sidecar_dir: Optional[Path] = None,
+        loader: Callable[[Path], pd.DataFrame] = read_excel_first_sheet,
+        column_loader: Callable[..., pd.DataFrame] = read_excel_columns,
+        compact: bool = False,
+    ):
+        self.sidecar_dir = Path(sidecar_dir) if sidecar_dir else None
+        self.compact = bool(compact)
+        self._loader = loader
+        self._column_loader = column_loader
+        self._frames: Dict[str, Tuple[_StatKey, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "parsed": 0, "sidecar_hits": 0, "sidecar_writes": 0}
+
+    def _sidecar_path(self, sha: str, cols: Optional[Tuple[str, ...]]) -> Path:
+        assert self.sidecar_dir is not None
+        raw = f"{sha}|v{WORKBOOK_CACHE_VERSION}|pandas={pd.__version__}|cols={list(cols) if cols is not None else '*'}"
+        if self.compact and cols is not None:
+            raw += "|compact"
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+        return self.sidecar_dir / f"{key}.json"
+
+    def _load_sidecar(self, p: Path) -> Optional[pd.DataFrame]:
+        if not p.exists():
+            return None
+        try:
+            rec = decode_record_bytes(p.read_bytes())
+            if rec is None:
+                logging.warning("Workbook sidecar failed checksum, re-parsing: %s", p.name)
+                return None
+            df = _frame_from_json(rec[0])
+        except Exception as e:
+            logging.warning("Workbook sidecar unreadable (%s): %s", p.name, e)
+            return None
+        if not isinstance(df, pd.DataFrame):
+            return None
+        touch_entry(p)
+        return df
+
+    def _store_sidecar(self, p: Path, df: pd.DataFrame) -> None:
+        try:
+            atomic_write_bytes(p, encode_record(_frame_to_json(df), v=WORKBOOK_CACHE_VERSION))
+            self.stats["sidecar_writes"] += 1
+        except Exception as e:
+            logging.warning("Workbook sidecar write failed (%s): %s", p.name, e)
+
+    def read(self, path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        First sheet of `path`; only `columns` (when given) that exist in it.
+        """
+        p = Path(path).resolve()
+        st = p.stat()
+        key = (int(st.st_size), int(st.st_mtime_ns))
+        cols = tuple(dict.fromkeys(columns)) if columns is not None else None
+        name = f"{p}|{cols}"
+
+        with self._lock:
+            hit = self._frames.get(name)
+            if hit is not None and hit[0] == key:
+                self.stats["hits"] += 1
+                self.files[p.name]["hits"] += 1
+                return hit[1]
+
+            t0 = time.perf_counter()
+            source = "parse"
+            rss = peak_rss_growth(None, None)
+            df: Optional[pd.DataFrame] = None
+            sidecar: Optional[Path] = None
+            if self.sidecar_dir is not None:
+                try:
+                    sidecar = self._sidecar_path(file_sha256(p), cols)
+                    df = self._load_sidecar(sidecar)
+                except OSError as e:
+                    logging.warning("Workbook sidecar lookup failed for %s: %s", p.name, e)
+            if df is not None:
+                source = "sidecar"
+                self.stats["sidecar_hits"] += 1
+            else:
+                peak_before = peak_rss_bytes()
+                if cols is None:
+                    df = self._loader(p)
+                elif self.compact:
+                    df = self._column_loader(p, cols, compact=True)
+                else:
+                    df = self._column_loader(p, cols)
+                rss = peak_rss_growth(peak_before, peak_rss_bytes())
+                self.stats["parsed"] += 1
+            sec = time.perf_counter() - t0
+
+            # Only remember (and persist) frames of files that did not change while parsing
+            st2 = os.stat(p)
+            if (int(st2.st_size), int(st2.st_mtime_ns)) == key:
+                self._frames[name] = (key, df)
+                if source == "parse" and sidecar is not None:
+                    self._store_sidecar(sidecar, df)
+
+            self.files[p.name] = {
+                "source": source,
+                "parse_sec": round(sec, 4),
+                **rss,
+                "columns_requested": list(cols) if cols is not None else None,
+                "rows": int(len(df)),
+                "columns": int(len(df.columns)),
+                "bytes": int(st.st_size),
+                "hits": 0,
+            }
+            return df
+
+    def stats_dict(self) -> Dict[str, Any]:
+        return {
+            "sidecar_dir": str(self.sidecar_dir) if self.sidecar_dir else None,
+            "compact": self.compact,
+            **self.stats,
+            "files": {k: dict(v) for k, v in self.files.items()},
+        }
@@ -1,7 +1,27 @@
 import sys
+import types
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if SRC.exists():
     sys.path.insert(0, str(SRC))
+
+
+@pytest.fixture
+def fake_pytesseract(monkeypatch):
+    """
+    Installs a stand-in pytesseract module whose image_to_string is the given
+    callable, for OCR tests that run without tesseract. Returns the module.
+    """
+
+    def install(image_to_string):
+        mod = types.ModuleType("pytesseract")
+        mod.image_to_string = image_to_string
+        mod.pytesseract = types.SimpleNamespace(tesseract_cmd=None)
+        monkeypatch.setitem(sys.modules, "pytesseract", mod)
+        return mod
+
+    return install
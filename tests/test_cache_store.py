@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+import daisy.cache_store as cache_store
+from daisy.cache_store import (
+    CacheLock,
+    atomic_write_bytes,
+    cache_stats,
+    decode_record,
+    encode_record,
+    parse_size,
+    prune_cache,
+    resolve_cache_dir,
+    touch_entry,
+)
+from daisy.cli import main
+
+
+def _entry(root: Path, rel: str, size: int, age: int) -> Path:
+    p = root / rel
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(b"x" * size)
+    os.utime(p, (1_000_000 + age, 1_000_000 + age))
+    return p
+
+
+def test_prune_evicts_least_recently_used_first(tmp_path: Path):
+    old = _entry(tmp_path, "ocr/pages/aaaa/p00001.x.txt", 100, 1)
+    mid = _entry(tmp_path, "ocr/pages/bbbb/p00001.x.txt", 100, 2)
+    new = _entry(tmp_path, "dac/dac.k.json", 100, 3)
+    _entry(tmp_path, "digests.json", 10_000, 0)  # outside the managed sections
+
+    touch_entry(old)  # a cache hit makes it the most recent one
+    res = prune_cache(tmp_path, max_bytes=250, max_entries=10)
+
+    assert res["evicted_entries"] == 1
+    assert old.exists() and new.exists() and not mid.exists()
+    assert not mid.parent.exists()
+    assert (tmp_path / "digests.json").exists()
+
+    prune_cache(tmp_path, max_bytes=10_000, max_entries=1)
+    assert [p.exists() for p in (old, new)] == [True, False]
+
+
+def test_cache_stats_and_cli(tmp_path: Path, monkeypatch, capsys):
+    _entry(tmp_path, "ocr/pages/aaaa/p00001.x.txt", 40, 1)
+    _entry(tmp_path, "dac/dac.k.json", 60, 2)
+
+    st = cache_stats(tmp_path)
+    assert (st["entries"], st["bytes"]) == (2, 100)
+    assert st["sections"]["ocr"] == {"entries": 1, "bytes": 40}
+
+    monkeypatch.setenv("DAISY_CACHE_DIR", str(tmp_path))
+    assert resolve_cache_dir(None) == tmp_path
+    assert main(["cache", "prune", "--max-bytes", "60"]) == 0
+    assert '"evicted_entries": 1' in capsys.readouterr().out
+    assert main(["cache", "prune", "--max-bytes", "10XB"]) == 4
+    assert "Bad --max-bytes" in capsys.readouterr().err
+    assert cache_stats(tmp_path)["sections"]["dac"]["entries"] == 1
+
+
+def test_parse_size():
+    assert parse_size("1048576") == 1 << 20
+    assert parse_size("500M") == 500 << 20
+    assert parse_size("2GiB") == 2 << 30
+    with pytest.raises(ValueError):
+        parse_size("lots")
+
+
+def test_records_detect_torn_writes(tmp_path: Path):
+    rec = encode_record("Seite 1\nÄnderung")
+    assert decode_record(rec) == "Seite 1\nÄnderung"
+    assert decode_record(rec[:-1]) is None
+    assert decode_record(rec.replace(b"Seite", b"Seitx")) is None
+    assert decode_record(b"plain text without header") is None
+
+    p = tmp_path / "ocr" / "x.txt"
+    atomic_write_bytes(p, rec)
+    atomic_write_bytes(p, encode_record("v2"))
+    assert decode_record(p.read_bytes()) == "v2"
+    assert [f.name for f in p.parent.iterdir()] == ["x.txt"]
+
+
+def test_lock_release_and_stale_break_respect_ownership(tmp_path: Path, monkeypatch):
+    entry = tmp_path / "ocr" / "x.txt"
+    mine, peer = CacheLock(entry), CacheLock(entry)
+    assert mine.acquire() and not peer.acquire()
+    assert mine.refresh()
+
+    # Our lock went stale and a peer broke it and took over
+    os.utime(mine.path, (1_000_000, 1_000_000))
+    assert peer.acquire()
+    mine.release()  # must not remove the peer's lock
+    assert peer.owned() and not mine.refresh()
+
+    # A lock that is fresh again by the time it is renamed aside is put back
+    monkeypatch.setattr(cache_store, "LOCK_STALE_SEC", -1.0)
+    real_rename = os.rename
+
+    def rename_after_refresh(src, dst):
+        real_rename(src, dst)
+        monkeypatch.setattr(cache_store, "LOCK_STALE_SEC", 600.0)
+
+    monkeypatch.setattr(cache_store.os, "rename", rename_after_refresh)
+    assert not CacheLock(entry).acquire()
+    assert peer.owned()
+    peer.release()
+    assert [f.name for f in entry.parent.iterdir()] == []
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz
+
+from daisy.agent import validate
+
+DAC_TEXT = (
+    "CMS Product ID\n1513344\nIT Asset ID\nAID551\nIT Asset Name\nMICROSOFT OFFICE 365\n"
+    "Application is\nSoD relevant?\ny\n"
+    "Is Application a\ncritical and\nimportant function?\nn\n"
+)
+
+
+def _make_dac(path: Path) -> Path:
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 72), DAC_TEXT, fontsize=10)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_repeat_validate_hits_dac_cache(tmp_path: Path):
+    dac = _make_dac(tmp_path / "dac.pdf")
+    out = tmp_path / "out"
+
+    first = validate(dac, tmp_path, out_dir=out, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+    second = validate(dac, tmp_path, out_dir=out, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+
+    assert first.stats["dac_cache"]["hit"] is False
+    assert first.stats["dac_cache"]["stored"] is True
+    assert second.stats["dac_cache"]["hit"] is True
+    assert second.stats["dac_text_store"]["page_extract_calls"] == 0
+    assert [s.to_dict() for s in second.sections] == [s.to_dict() for s in first.sections]
+
+    values = {c.check_id: c.evidence.get("value") for s in second.sections for c in s.checks}
+    assert values["S1.1-01"] == "1513344"
+    assert values["S4.1-01"] == "yes"
+    assert values["S4.2-01"] == "no"
+
+
+def test_cache_hit_marks_replayed_ocr_meta(tmp_path: Path):
+    dac = _make_dac(tmp_path / "dac.pdf")
+    out = tmp_path / "out"
+
+    first = validate(dac, tmp_path, out_dir=out, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+    second = validate(dac, tmp_path, out_dir=out, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+
+    assert "from_cache" not in first.stats["dac_ocr"]
+    assert second.stats["dac_ocr"]["from_cache"] is True
+    assert second.stats["dac_ocr"]["base_text_chars"] == first.stats["dac_ocr"]["base_text_chars"]
+    assert not [k for k in second.stats["dac_ocr"] if k.endswith("_sec") or k == "ocr_page_timings"]
+
+
+def test_debug_extract_skips_dac_cache(tmp_path: Path):
+    dac = _make_dac(tmp_path / "dac.pdf")
+    out = tmp_path / "out"
+
+    validate(dac, tmp_path, out_dir=out, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+    debug = validate(dac, tmp_path, out_dir=out, lenient=True, mvp=True, debug_extract=True, rules_path=Path("config/rules.yaml"))
+
+    assert debug.stats["dac_cache"] == {"enabled": True, "hit": False, "skipped": "debug_extract"}
+    assert debug.stats["dac_text_store"]["page_extract_calls"] > 0
+    assert "from_cache" not in debug.stats["dac_ocr"]
+
+
+def test_dac_cache_disabled_without_out_dir(tmp_path: Path):
+    dac = _make_dac(tmp_path / "dac.pdf")
+    res = validate(dac, tmp_path, out_dir=None, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+    assert res.stats["dac_cache"] == {"enabled": False, "hit": False}
+
+
+def test_shared_cache_dir_is_reused_across_out_dirs(tmp_path: Path):
+    dac = _make_dac(tmp_path / "dac.pdf")
+    shared = tmp_path / "cache"
+
+    first = validate(dac, tmp_path, out_dir=tmp_path / "run1", cache_dir=shared, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+    second = validate(dac, tmp_path, out_dir=tmp_path / "run2", cache_dir=shared, lenient=True, mvp=True, rules_path=Path("config/rules.yaml"))
+
+    assert first.stats["dac_cache"]["hit"] is False
+    assert second.stats["dac_cache"]["hit"] is True
+    assert list((shared / "dac").glob("dac.*.json"))
+    assert not (tmp_path / "run1" / "dac_cache").exists()
+
+
+def test_failed_or_empty_ocr_pages_are_not_cached(tmp_path: Path):
+    from daisy.agent import _PdfOverlayView, _dac_ocr_cacheable
+    from daisy.pdf_reader import PdfDoc
+
+    base = PdfDoc(_make_dac(tmp_path / "dac.pdf"))
+    assert _dac_ocr_cacheable({"ocr_attempted": False}, base)
+    assert not _dac_ocr_cacheable({"error": "TesseractNotFoundError"}, base)
+    assert not _dac_ocr_cacheable({"ocr_page_errors": [{"page": 0, "error": "boom"}], "ocr_pages_used": []}, base)
+    # OCR ran on page 0 but returned nothing
+    assert not _dac_ocr_cacheable({"ocr_pages_used": [0]}, base)
+    assert not _dac_ocr_cacheable({"ocr_pages_used": [0]}, _PdfOverlayView(base, {0: "  "}))
+    assert _dac_ocr_cacheable({"ocr_pages_used": [0]}, _PdfOverlayView(base, {0: "CMS Product ID 1"}))
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from daisy.digest import DigestRegistry
+
+
+def test_registry_memoizes_and_persists_across_instances(tmp_path: Path):
+    a = tmp_path / "a.bin"
+    b = tmp_path / "b.bin"
+    a.write_bytes(b"x" * 3_000_000)
+    b.write_bytes(b"y" * 10)
+    store = tmp_path / "digest_cache.json"
+
+    reg = DigestRegistry(store)
+    got = reg.digest_many([a, b], workers=2)
+    assert got[str(a)] == hashlib.sha256(a.read_bytes()).hexdigest()
+    assert reg.digest(a) == got[str(a)]
+    assert reg.stats == {"hits": 1, "hashed": 2, "bytes_hashed": 3_000_010}
+    reg.save()
+
+    reg2 = DigestRegistry(store)
+    assert reg2.digest(b) == got[str(b)]
+    assert reg2.stats["hashed"] == 0
+
+    # content change (new size/mtime) forces a re-hash
+    b.write_bytes(b"changed")
+    os.utime(b, ns=(1, 1))
+    assert reg2.digest(b) == hashlib.sha256(b"changed").hexdigest()
+    assert reg2.stats["hashed"] == 1
+
+
+def test_digest_many_reports_unreadable_files_as_none(tmp_path: Path):
+    reg = DigestRegistry()
+    assert reg.digest_many([tmp_path / "missing.pdf"]) == {str(tmp_path / "missing.pdf"): None}
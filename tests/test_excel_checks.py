@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from daisy.excel_checks import (
+    check_meaningful_descriptions,
+    check_required_columns_non_empty,
+    meaningful_descriptions_check,
+    open_column_stream,
+    read_excel_columns,
+    required_non_empty_check,
+    run_row_checks,
+)
+
+COLS = ["Display name", "Description", "Tier Level"]
+
+
+def _write(p: Path, rows) -> None:
+    wb = Workbook()
+    ws = wb.active
+    ws.append(COLS + ["Unused"])
+    for r in rows:
+        ws.append(list(r))
+    wb.save(p)
+
+
+def _rows(n: int, bad_every: int):
+    for i in range(n):
+        desc = "tbd" if i % bad_every == 0 else f"Grants access to resource {i}"
+        yield (f"E{i}", desc, None if i % bad_every == 0 else i % 4, "x")
+
+
+def test_streamed_checks_match_frame_checks(tmp_path: Path):
+    x = tmp_path / "Entitlement Services.xlsx"
+    _write(x, _rows(95, bad_every=7))
+    df = read_excel_columns(x, COLS)
+    want_req = check_required_columns_non_empty(df, required_cols=COLS, id_col="Display name")
+    want_desc = check_meaningful_descriptions(df, "Display name", "Description")
+
+    # no settle thresholds: read to the end, 10 rows at a time
+    with open_column_stream(x, COLS, chunk_rows=10) as st:
+        res = run_row_checks(
+            st,
+            {
+                "req": required_non_empty_check(COLS, id_col="Display name"),
+                "desc": meaningful_descriptions_check("Display name", "Description"),
+                "missing": required_non_empty_check(["SoD Area"]),
+            },
+        )
+    assert res.complete and res.rows_scanned == 95 and res.chunks == 10
+    for got, want in ((res.findings["req"], want_req), (res.findings["desc"], want_desc)):
+        assert (got.total_rows, got.failing_rows, got.complete) == (want.total_rows, want.failing_rows, True)
+        assert str(got.sample_rows) == str(want.sample_rows)  # NaN-safe
+    assert res.findings["missing"].failing_rows == 95
+    assert res.findings["missing"].sample_rows == [{"error": "Missing columns: ['SoD Area']"}]
+
+
+def test_stream_stops_once_outcome_is_settled(tmp_path: Path):
+    x = tmp_path / "IT Role Services.xlsx"
+    _write(x, _rows(1000, bad_every=2))
+
+    with open_column_stream(x, COLS, chunk_rows=10) as st:
+        assert st.row_estimate == 1000
+        res = run_row_checks(
+            st,
+            {
+                # non-MVP: NOT_MET after the first failure; keep going for 5 samples
+                "req": required_non_empty_check(COLS, settle_failing_above=0),
+                # MVP tolerance of 40 failures
+                "desc": meaningful_descriptions_check("Display name", "Description", settle_failing_above=40),
+            },
+        )
+    assert not res.complete
+    assert res.rows_scanned == 90  # 45 bad rows > 40
+    f = res.findings["desc"]
+    assert (f.total_rows, f.failing_rows, f.rows_scanned, f.complete) == (1000, 45, 90, False)
+    assert len(res.findings["req"].sample_rows) == 5
+
+
+def test_settling_in_the_last_chunk_is_not_an_early_stop(tmp_path: Path):
+    x = tmp_path / "All Entitlements.xlsx"
+    _write(x, _rows(50, bad_every=1))
+
+    with open_column_stream(x, COLS, chunk_rows=10) as st:
+        assert st.row_estimate == 50
+        res = run_row_checks(
+            st, {"desc": meaningful_descriptions_check("Display name", "Description", settle_failing_above=45)}
+        )
+    assert res.complete and res.rows_scanned == 50
+    f = res.findings["desc"]
+    assert (f.total_rows, f.failing_rows, f.complete) == (50, 50, True)
+
+
+def test_vectorized_masks_match_row_wise_checks():
+    import numpy as np
+    import pandas as pd
+
+    from daisy.excel_checks import any_non_empty, meaningful_description, meaningful_description_mask
+
+    display = ["Role A", "ROLE_B", "İstanbul ops", "x", None, "  ", "Role G", "Role H", 12345678, "Role J"]
+    desc = ["role a", " role_b ", "i̇stanbul ops", "tbd", "A proper description", "        ", None, 123456789, "12345678", "Ｆｕｌｌ width text"]
+    df = pd.DataFrame({"Display name": display, "Description": desc})
+    want = [meaningful_description(str(d), str(n)) for n, d in zip(df["Display name"].fillna(""), df["Description"].fillna(""))]
+    assert meaningful_description_mask(df["Display name"], df["Description"]).tolist() == want
+
+    owners = pd.DataFrame({"a": ["", " ", None, "x", np.nan], "b": [None, "\t", "y", "", 0]})
+    want_owner = owners.fillna("").astype(str).apply(lambda r: any(v.strip() for v in r), axis=1)
+    assert any_non_empty(owners, ["a", "b"]).tolist() == want_owner.tolist()
+    assert any_non_empty(owners, []).all()
+
+
+def test_check_plan_matches_single_checks_in_one_pass(tmp_path: Path):
+    import daisy.excel_checks as ec
+    from daisy.excel_checks import check_plan_masks, check_plan_row_checks, evaluate_check_plan
+    from daisy.rules import compile_excel_checks, load_rules
+
+    thresholds = dict(load_rules(Path("config/rules.yaml")).excel_thresholds)
+    plan = compile_excel_checks(
+        {
+            "Entitlement Services.xlsx": [
+                {"id": "req", "columns": COLS, "id_column": "Display name", "threshold": "entitlements_required"},
+                {"id": "desc", "type": "meaningful_description", "column": "Description", "threshold": "entitlements_descriptions"},
+                {"id": "tier", "type": "allowed_values", "column": "Tier Level", "values": [0, 1, 2], "threshold": "entitlements_required"},
+                {"id": "name", "type": "regex", "column": "Display name", "pattern": "E[0-9]*[05]", "allow_empty": False, "threshold": "entitlements_required"},
+                {"id": "gone", "columns": ["SoD Area"], "missing_columns": "not_met", "threshold": "entitlements_required"},
+            ]
+        },
+        thresholds,
+    )["Entitlement Services.xlsx"]
+    assert plan.columns == ["Display name", "Description", "Tier Level", "SoD Area"]
+
+    x = tmp_path / "Entitlement Services.xlsx"
+    _write(x, _rows(95, bad_every=7))
+    df = read_excel_columns(x, plan.columns)
+    got = evaluate_check_plan(plan, df)
+    assert "gone" not in got and "gone" not in check_plan_masks(plan, df)
+    for rid, want in (
+        ("req", check_required_columns_non_empty(df, required_cols=COLS, id_col="Display name")),
+        ("desc", check_meaningful_descriptions(df, "Display name", "Description")),
+    ):
+        assert (got[rid].failing_rows, str(got[rid].sample_rows)) == (want.failing_rows, str(want.sample_rows))
+
+    tier = df["Tier Level"]
+    assert got["tier"].failing_rows == int((tier.notna() & ~tier.isin([0, 1, 2])).sum()) == 19  # the 3s
+    assert got["name"].failing_rows == int((~df["Display name"].str.fullmatch("E[0-9]*[05]")).sum())
+
+    # streamed: one mask computation per chunk serves every check
+    calls = []
+    real = check_plan_masks
+    ec.check_plan_masks = lambda p, ch: calls.append(len(ch)) or real(p, ch)
+    try:
+        with open_column_stream(x, plan.columns, chunk_rows=10) as st:
+            res = run_row_checks(st, check_plan_row_checks(plan, st.columns))
+    finally:
+        ec.check_plan_masks = real
+    assert len(calls) == res.chunks == 10
+    for rid, f in got.items():
+        assert res.findings[rid].failing_rows == f.failing_rows
+    for rid in ("req", "desc", "name"):  # streamed chunks keep whole numbers as int
+        assert str(res.findings[rid].sample_rows) == str(got[rid].sample_rows)
+
+
+def test_check_plan_reads_boolean_cells_alike_streamed_and_whole(tmp_path: Path):
+    from daisy.excel_checks import check_plan_row_checks, evaluate_check_plan
+    from daisy.rules import compile_excel_checks, load_rules
+
+    thresholds = dict(load_rules(Path("config/rules.yaml")).excel_thresholds)
+    plan = compile_excel_checks(
+        {
+            "Flags.xlsx": [
+                {"id": "flag", "type": "allowed_values", "column": "Privileged", "values": ["1"], "threshold": "entitlements_required"},
+                {"id": "flag_rx", "type": "regex", "column": "Privileged", "pattern": "[01]", "threshold": "entitlements_required"},
+            ]
+        },
+        thresholds,
+    )["Flags.xlsx"]
+
+    # a bool column with gaps: whole-frame reading turns it into floats
+    x = tmp_path / "Flags.xlsx"
+    wb = Workbook()
+    wb.active.append(["Display name", "Privileged"])
+    for i in range(30):
+        wb.active.append([f"E{i}", None if i % 5 == 0 else i % 3 == 0])
+    wb.save(x)
+
+    df = read_excel_columns(x, plan.columns)
+    got = evaluate_check_plan(plan, df)
+    with open_column_stream(x, plan.columns, chunk_rows=7) as st:
+        res = run_row_checks(st, check_plan_row_checks(plan, st.columns))
+    assert got["flag"].failing_rows == res.findings["flag"].failing_rows == 16  # the False cells
+    assert got["flag_rx"].failing_rows == res.findings["flag_rx"].failing_rows == 0
+
+
+def test_numeric_cells_with_gaps_read_alike_streamed_and_whole(tmp_path: Path):
+    from daisy.excel_checks import check_plan_row_checks, evaluate_check_plan
+    from daisy.rules import load_rules
+
+    plan = load_rules(Path("config/rules.yaml")).excel_checks["IT Role Services.xlsx"]
+
+    # whole-number Description and Display name columns with blanks: the
+    # whole frame reads them as floats, the streamed chunks keep the ints
+    x = tmp_path / "IT Role Services.xlsx"
+    wb = Workbook()
+    wb.active.append(["Display name", "Description", "Tier Level", "IT Role Owner"])
+    for i in range(30):
+        name = None if i % 10 == 3 else 1000 + i
+        desc = None if i == 7 else (1000 + i if i % 6 == 0 else 1234567 + i if i % 2 else 12345678 + i)
+        wb.active.append([name, desc, 1, "owner"])
+    wb.save(x)
+
+    df = read_excel_columns(x, plan.columns)
+    assert df["Description"].dtype == float and df["Display name"].dtype == float
+    got = evaluate_check_plan(plan, df)
+    with open_column_stream(x, plan.columns, chunk_rows=7) as st:
+        res = run_row_checks(st, check_plan_row_checks(plan, st.columns))
+    assert got["S4.2-EX-01"].failing_rows == res.findings["S4.2-EX-01"].failing_rows == 4  # 3 names, 1 description
+    # 7 digits (and the blank) or the display name repeated fail; 8 digits pass
+    assert got["S4.2-EX-02"].failing_rows == res.findings["S4.2-EX-02"].failing_rows == 20
+    assert check_meaningful_descriptions(df, "Display name", "Description").failing_rows == 20
+    with open_column_stream(x, ["Display name", "Description"], chunk_rows=7) as st:
+        res = run_row_checks(st, {"req": required_non_empty_check(["Display name", "Description"])})
+    assert res.findings["req"].failing_rows == 4
+
+
+def test_itrs_not_run_results_keep_names_and_severities(tmp_path: Path):
+    from daisy.agent import _excel_export_checks
+    from daisy.rules import load_rules
+    from daisy.workbook_cache import WorkbookCache
+
+    rules = load_rules(Path("config/rules.yaml"))
+    x = tmp_path / "IT Role Services.xlsx"
+    wb = Workbook()
+    wb.active.append(["Display name", "Description"])  # no Tier Level
+    wb.active.append(["R1", "A proper description"])
+    wb.save(x)
+
+    for path, status in ((None, "SKIPPED"), (x, "NOT_MET")):
+        for mvp, severity in ((True, "major"), (False, "critical")):
+            out = []
+            _excel_export_checks(
+                out, "IT Role Services.xlsx", path, rules=rules, mvp=mvp,
+                workbooks=WorkbookCache(), excel_stream=False, stream_stats={},
+            )
+            first = out[0]
+            assert first.check_id == "S4.2-EX-01"
+            assert first.name == "IT Role Services: required master data filled"
+            assert first.severity == severity
+            assert first.status == (status if path is None or not mvp else "MET")
@@ -15,6 +15,9 @@ from daisy.agent import validate
 ROOT = Path(__file__).resolve().parents[1]
 GOLDEN = ROOT / "tests" / "golden" / "review_result.golden.json"
 
+# Instrumentation counters under stats; not part of the review outcome.
+_INSTRUMENTATION_STATS = {"dac_text_store", "dac_cache", "page_extract", "workbook_cache"}
+
 
 def _normalize(d: Dict[str, Any]) -> Dict[str, Any]:
     # Make comparisons stable across runs
@@ -24,6 +27,10 @@ def _normalize(d: Dict[str, Any]) -> Dict[str, Any]:
 
     # Some runs may include extra keys under stats; keep stats but normalize ordering
     # (JSON dump with sort_keys handles ordering differences)
+    stats = dict(d.get("stats") or {})
+    for k in _INSTRUMENTATION_STATS:
+        stats.pop(k, None)
+    d["stats"] = stats
 
     return d
 
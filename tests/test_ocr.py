@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import hashlib
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import fitz
+
+from daisy.agent import _dac_page_readable, validate
+from daisy.cache_store import CacheLock
+import daisy.ocr as ocr_mod
+from daisy.ocr import (
+    _doc_sha256,
+    _legacy_cache_keys,
+    _page_cache_path,
+    _render_ocr_pipeline,
+    _write_cached_page,
+    add_startup_estimate,
+    ocr_pdf_pages_best_effort,
+)
+
+
+def _make_sized_pdf(path: Path, n: int) -> Path:
+    # Page i is (100 + 10*i) pt tall, so the fake tesseract can tell pages apart
+    doc = fitz.open()
+    for i in range(n):
+        doc.new_page(width=100, height=100 + 10 * i)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _fake_tesseract(fake_pytesseract, fail_page: int = -1) -> list:
+    calls = []
+
+    def image_to_string(img, lang="eng"):
+        page = (img.height - 100) // 10
+        calls.append(page)
+        # Early pages finish last, so completion order != page order
+        time.sleep(0.02 * (6 - page))
+        if page == fail_page:
+            raise RuntimeError("tesseract crashed")
+        return f"page {page}"
+
+    fake_pytesseract(image_to_string)
+    return calls
+
+
+def test_ocr_workers_keep_page_order_and_isolate_failures(tmp_path: Path, fake_pytesseract):
+    _fake_tesseract(fake_pytesseract, fail_page=2)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 6)
+
+    pages, meta = ocr_pdf_pages_best_effort(
+        pdf, tmp_path / "ocr_cache", dpi=72, pages=list(range(6)), workers=4
+    )
+
+    assert list(pages) == [0, 1, 2, 3, 4, 5]
+    assert pages[2] == ""
+    assert pages[5] == "page 5"
+    assert meta["ocr_workers"] == 4
+    assert [t["page"] for t in meta["ocr_page_timings"]] == [0, 1, 2, 3, 4, 5]
+    assert all(t["wall_sec"] >= t["ocr_sec"] for t in meta["ocr_page_timings"])
+    assert [e["page"] for e in meta["ocr_page_errors"]] == [2]
+
+    serial, _ = ocr_pdf_pages_best_effort(
+        pdf, tmp_path / "ocr_cache_serial", dpi=72, pages=list(range(6)), workers=1
+    )
+    assert serial == pages
+
+
+def test_page_cache_serves_subsets_and_ocrs_only_missing_pages(tmp_path: Path, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract, fail_page=3)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 6)
+    cache = tmp_path / "ocr_cache"
+
+    ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[1, 3, 4])
+    assert sorted(calls) == [1, 3, 4]
+
+    calls.clear()
+    pages, meta = ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[1, 4])
+    assert calls == []
+    assert meta["ocr_cache_hit"] is True
+    assert pages == {1: "page 1", 4: "page 4"}
+
+    # page 3 failed before, so it is retried along with the new page 5
+    pages, meta = ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[1, 3, 5])
+    assert sorted(calls) == [3, 5]
+    assert meta["ocr_cache_pages_hit"] == [1]
+    assert list(pages) == [1, 3, 5]
+
+    # different settings are separate cache entries
+    calls.clear()
+    ocr_pdf_pages_best_effort(pdf, cache, dpi=72, lang="deu", pages=[1])
+    assert calls == [1]
+
+
+def test_legacy_page_set_cache_files_are_migrated(tmp_path: Path, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 6)
+    cache = tmp_path / "ocr_cache"
+    cache.mkdir()
+
+    key = sorted(_legacy_cache_keys(hashlib.sha256(pdf.read_bytes()), [2, 4], lang="eng", dpi=72))[0]
+    (cache / f"scan.{key}.txt").write_text("===PAGE 2===\nold two\n===PAGE 4===\nold four\n", encoding="utf-8")
+    # page 3 failed in the old run: stored empty, must be OCRed again
+    key3 = sorted(_legacy_cache_keys(hashlib.sha256(pdf.read_bytes()), [3], lang="eng", dpi=72))[0]
+    (cache / f"scan.{key3}.txt").write_text("===PAGE 3===\n\n", encoding="utf-8")
+    # written for other settings: must not be imported
+    (cache / "scan.deadbeef.txt").write_text("===PAGE 0===\nwrong\n", encoding="utf-8")
+
+    pages, meta = ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[0, 4])
+    assert calls == [0]
+    assert pages == {0: "page 0", 4: "old four"}
+    assert meta["ocr_cache_pages_hit"] == [4]
+
+    calls.clear()
+    pages, meta = ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[3])
+    assert calls == [3]
+    assert pages == {3: "page 3"}
+
+
+def test_torn_cache_entry_is_detected_and_recomputed(tmp_path: Path, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 2)
+    cache = tmp_path / "ocr_cache"
+
+    ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[1])
+    entry = next((cache / "pages").rglob("p00001.*.txt"))
+    entry.write_bytes(entry.read_bytes()[:-2])  # truncated write
+
+    calls.clear()
+    pages, meta = ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[1])
+    assert calls == [1]
+    assert pages == {1: "page 1"}
+    assert meta["ocr_cache_hit"] is False
+
+
+def test_second_process_waits_for_page_being_ocred(tmp_path: Path, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 3)
+    cache = tmp_path / "ocr_cache"
+
+    doc_sha = _doc_sha256(pdf)
+    peer = CacheLock(_page_cache_path(cache, doc_sha, 2, lang="eng", dpi=72))
+    assert peer.acquire()
+
+    def finish_peer():
+        time.sleep(0.3)
+        _write_cached_page(cache, doc_sha, 2, "peer text", lang="eng", dpi=72)
+        peer.release()
+
+    t = threading.Thread(target=finish_peer)
+    t.start()
+    pages, meta = ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=[0, 2])
+    t.join()
+
+    assert calls == [0]
+    assert pages == {0: "page 0", 2: "peer text"}
+    assert meta["ocr_pages_from_peer"] == [2]
+    assert not list(cache.rglob(".*.lock"))
+
+
+def test_pages_are_locked_just_before_rendering(tmp_path: Path, monkeypatch, fake_pytesseract):
+    _fake_tesseract(fake_pytesseract)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 6)
+    cache = tmp_path / "ocr_cache"
+    held = []
+    real_render = ocr_mod._render_page
+
+    def render(doc, i, dpi, grayscale):
+        held.append(len(list(cache.rglob(".*.lock"))))
+        return real_render(doc, i, dpi, grayscale)
+
+    monkeypatch.setattr(ocr_mod, "_render_page", render)
+    pages, meta = ocr_pdf_pages_best_effort(pdf, cache, dpi=72, pages=list(range(6)), queue_depth=1)
+
+    assert list(pages) == list(range(6))
+    assert meta["ocr_pages_ocred"] == list(range(6))
+    # Only pages rendered or queued so far are locked, not the whole run up front
+    assert held[0] == 1 and max(held) <= 4
+    assert not list(cache.rglob(".*.lock"))
+
+
+def test_raising_recognizer_reports_errors_instead_of_hanging(tmp_path: Path):
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 4)
+
+    def recognize(img):
+        raise RuntimeError("engine died")
+
+    def recognize_batch(imgs):
+        return [("short", 0.0, None)]  # one result for a batch of two
+
+    doc = fitz.open(str(pdf))
+    try:
+        got = []
+        _render_ocr_pipeline(
+            doc, list(range(4)), lambda i, text, t, err: got.append((i, text, err)),
+            lang="eng", dpi=72, workers=2, recognize=recognize,
+        )
+        assert sorted(got) == [(i, "", "ocr: RuntimeError: engine died") for i in range(4)]
+
+        got.clear()
+        _render_ocr_pipeline(
+            doc, [0, 1], lambda i, text, t, err: got.append((i, text, err)),
+            lang="eng", dpi=72, recognize=recognize, recognize_batch=recognize_batch, batch_size=2,
+        )
+        assert sorted(got) == [(0, "short", None), (1, "", "ocr: no result for page")]
+    finally:
+        doc.close()
+
+
+def test_render_queue_bounds_pages_in_flight(tmp_path: Path, monkeypatch, fake_pytesseract):
+    _fake_tesseract(fake_pytesseract)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 6)
+    alive = {"now": 0, "max": 0}
+    modes = set()
+    real_render = ocr_mod._render_page
+    real_ocr = ocr_mod._tesseract_page
+
+    def render(doc, i, dpi, grayscale):
+        alive["now"] += 1
+        alive["max"] = max(alive["max"], alive["now"])
+        return real_render(doc, i, dpi, grayscale)
+
+    def tesseract(img, lang):
+        modes.add(img.mode)
+        out = real_ocr(img, lang)
+        alive["now"] -= 1
+        return out
+
+    monkeypatch.setattr(ocr_mod, "_render_page", render)
+    monkeypatch.setattr(ocr_mod, "_tesseract_page", tesseract)
+
+    got = []
+    doc = fitz.open(str(pdf))
+    stage = _render_ocr_pipeline(
+        doc, list(range(6)), lambda i, text, t, err: got.append((i, text, t)),
+        lang="eng", dpi=72, grayscale=True, workers=1, queue_depth=1,
+    )
+    doc.close()
+
+    # queue_depth + one page in tesseract + one the renderer holds while blocked
+    assert alive["max"] <= 3
+    assert sorted(i for i, _, _ in got) == list(range(6))
+    assert set(got[0][2]) == {"render_sec", "ocr_sec", "wall_sec"}
+    assert modes == {"L"}
+    assert stage["queue_depth"] == 1 and stage["grayscale"] is True
+    assert stage["render_blocked_sec"] > 0
+
+
+
+SCANNED_DAC_PAGE = (
+    "CMS Product ID\n1513344\nIT Asset ID\nAID551\nIT Asset Name\nMICROSOFT OFFICE 365\n"
+    "Application is\nSoD relevant?\ny\nFunctional Area\nrelevant?\nn\n"
+    "Do you want to\nupload the\nentitlement\ncomposition?\ny\n"
+    "Is Application a\ncritical and\nimportant function?\nn\n"
+)
+
+
+def test_incremental_dac_ocr_stops_once_all_fields_are_found(tmp_path: Path, fake_pytesseract):
+    calls = []
+
+    def image_to_string(img, lang="eng"):
+        page = (img.height - 100) // 10
+        calls.append(page)
+        return SCANNED_DAC_PAGE if page == 3 else f"page {page}"
+
+    fake_pytesseract(image_to_string)
+    dac = _make_sized_pdf(tmp_path / "dac.pdf", 20)
+
+    res = validate(
+        dac, tmp_path, out_dir=tmp_path / "out", lenient=True, mvp=True, rules_path=Path("config/rules.yaml"),
+        ocr=True, ocr_dpi=72, ocr_max_pages=20, ocr_workers=2, ocr_incremental=True,
+    )
+
+    meta = res.stats["dac_ocr"]
+    assert sorted(calls) == [0, 1, 2, 3]
+    assert meta["ocr_pages_used"] == [0, 1, 2, 3]
+    assert meta["ocr_incremental"]["stopped"] == "all_fields_found"
+    assert meta["ocr_incremental"]["pages_skipped"] == 16
+    assert [r["pages"] for r in meta["ocr_incremental"]["rounds"]] == [[0, 1], [2, 3]]
+    values = {c.check_id: c.evidence.get("value") for s in res.sections for c in s.checks}
+    assert values["S1.1-01"] == "1513344"
+    assert values["S4.2-01"] == "no"
+
+
+def test_adaptive_dpi_escalates_only_weak_pages_and_caches_the_dpi(tmp_path: Path, fake_pytesseract):
+    calls = []
+
+    def image_to_string(img, lang="eng"):
+        dpi = 72 if img.width == 100 else 144
+        page = (img.height * 72 // dpi - 100) // 10
+        calls.append((page, dpi))
+        if page == 1 and dpi == 72:
+            return "p1"  # too short
+        if page == 2 and dpi == 72:
+            return "page two at low resolution, value unreadable"
+        return f"page {page} at {dpi} dpi, all fields readable: YES"
+
+    fake_pytesseract(image_to_string)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 3)
+    kw = dict(pages=[0, 1, 2], dpi_ladder=[144, 72], accept=lambda t: "YES" in t, accept_id="t1")
+
+    pages, meta = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", **kw)
+
+    assert sorted(calls) == [(0, 72), (1, 72), (1, 144), (2, 72), (2, 144)]
+    assert meta["ocr_page_dpi"] == {"0": 72, "1": 144, "2": 144}
+    assert meta["ocr_pages_escalated"] == [1, 2]
+    assert pages[1] == "page 1 at 144 dpi, all fields readable: YES"
+
+    calls.clear()
+    again, meta2 = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", **kw)
+    assert calls == []
+    assert again == pages
+    assert meta2["ocr_page_dpi"] == meta["ocr_page_dpi"]
+    assert meta2["ocr_dpi_cache_pages_hit"] == [0, 1, 2]
+
+
+def test_dac_page_is_escalated_when_a_labelled_field_has_no_value():
+    assert _dac_page_readable(SCANNED_DAC_PAGE)
+    assert not _dac_page_readable("CMS Product ID\n\nIT Asset ID\nAID551\n")
+    assert _dac_page_readable("Annex: screenshots of the role model")
+
+
+def test_batch_backend_ocrs_many_pages_per_tesseract_call(tmp_path: Path, fake_pytesseract):
+    from PIL import Image
+
+    invocations = []
+
+    def image_to_string(img, lang="eng"):
+        invocations.append(img)
+        if isinstance(img, str):  # file list
+            names = Path(img).read_text(encoding="utf-8").split()
+            heights = [Image.open(n).height for n in names]
+            return "".join(f"page {(h - 100) // 10}\f" for h in heights)
+        return f"page {(img.height - 100) // 10}"
+
+    mod = fake_pytesseract(image_to_string)
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 6)
+
+    pages, meta = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=72, pages=list(range(6)), backend="batch")
+
+    assert pages == {i: f"page {i}" for i in range(6)}
+    assert len(invocations) == 1
+    st = meta["ocr_backend"]
+    assert st["backend"] == "batch" and st["invocations"] == 1 and st["pages"] == 6
+    assert "startup_sec" not in st  # not measured for process backends
+
+    # Unusable batch output: the batch is redone page by page
+    mod.image_to_string = lambda img, lang="eng": "garbled" if isinstance(img, str) else image_to_string(img)
+    pages, meta = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache2", dpi=72, pages=list(range(6)), backend="batch")
+    assert pages == {i: f"page {i}" for i in range(6)}
+    assert meta["ocr_backend"]["fallback_pages"] == 6
+
+
+def test_api_backend_reuses_engines_across_documents(tmp_path: Path, monkeypatch, fake_pytesseract):
+    _fake_tesseract(fake_pytesseract)
+    created = []
+
+    class FakeApi:
+        def __init__(self, lang="eng"):
+            created.append(lang)
+
+        def SetImage(self, img):
+            self.page = (img.height - 100) // 10
+
+        def GetUTF8Text(self):
+            return f"api page {self.page}"
+
+        def End(self):
+            pass
+
+    monkeypatch.setitem(sys.modules, "tesserocr", types.SimpleNamespace(PyTessBaseAPI=FakeApi))
+    monkeypatch.setattr(ocr_mod, "_api_engines", {})
+    a = _make_sized_pdf(tmp_path / "a.pdf", 3)
+    b = _make_sized_pdf(tmp_path / "b.pdf", 4)
+
+    pages_a, meta_a = ocr_pdf_pages_best_effort(a, tmp_path / "cache", dpi=72, pages=[0, 1, 2], backend="auto")
+    pages_b, meta_b = ocr_pdf_pages_best_effort(b, tmp_path / "cache", dpi=72, pages=[3], backend="auto")
+
+    assert pages_a[2] == "api page 2" and pages_b[3] == "api page 3"
+    assert created == ["eng"]
+    assert meta_a["ocr_backend"]["engines_created"] == 1
+    assert meta_b["ocr_backend"]["engines_created"] == 0
+    assert meta_b["ocr_backend"]["invocations"] == 0
+    assert meta_a["ocr_backend"]["startup_sec"] >= 0.0
+
+
+def test_startup_estimate_probes_tesseract_once(monkeypatch):
+    probes = []
+
+    def fake_probe(lang):
+        probes.append(lang)
+        return 0.25
+
+    monkeypatch.setattr(ocr_mod, "_startup_probe", fake_probe)
+    st = add_startup_estimate({"backend": "page", "invocations": 4, "pages": 4, "ocr_sec": 3.0}, "eng")
+    assert probes == ["eng"]
+    assert st["startup_sec_estimated"] == 1.0 and st["recognize_sec_estimated"] == 2.0
+
+    st = add_startup_estimate({"backend": "api", "invocations": 0, "pages": 4, "ocr_sec": 1.0}, "eng")
+    assert probes == ["eng"]  # no tesseract process ran: nothing to probe
+    assert st["startup_sec_estimated"] == 0.0
+
+
+def test_api_backend_falls_back_to_per_page_tesseract(tmp_path: Path, monkeypatch, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract)
+    monkeypatch.setitem(sys.modules, "tesserocr", None)  # not installed
+    pdf = _make_sized_pdf(tmp_path / "scan.pdf", 2)
+
+    pages, meta = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=72, pages=[0, 1], backend="api")
+
+    assert pages == {0: "page 0", 1: "page 1"}
+    assert sorted(calls) == [0, 1]
+    assert meta["ocr_backend"]["backend"] == "page"
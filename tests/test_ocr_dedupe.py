@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import fitz
+import numpy as np
+
+import daisy.ocr_dedupe as dedupe_mod
+from daisy.ocr import ocr_pdf_pages_best_effort
+from daisy.ocr_dedupe import gray_signature, hamming, ink_matches, page_signature, phash_gray
+
+LAYOUTS = {
+    "form": [fitz.Rect(40, 40, 300, 120), fitz.Rect(40, 400, 550, 420)],
+    "letter": [fitz.Rect(300, 600, 560, 800), fitz.Rect(40, 200, 200, 260)],
+}
+
+
+def _make(path: Path, layouts) -> Path:
+    doc = fitz.open()
+    for name in layouts:
+        page = doc.new_page()
+        for r in LAYOUTS[name]:
+            page.draw_rect(r, color=(0, 0, 0), fill=(0, 0, 0))
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _fake_tesseract(fake_pytesseract) -> list:
+    calls = []
+
+    def image_to_string(img, lang="eng"):
+        a = np.asarray(img.convert("L"))
+        h, w = a.shape
+        name = "form" if a[: h // 5, : w // 2].mean() < 200 else "letter"
+        calls.append(name)
+        return f"{name} text"
+
+    fake_pytesseract(image_to_string)
+    return calls
+
+
+def test_phash_tolerates_noise_but_separates_layouts():
+    rng = np.random.default_rng(0)
+    page = np.full((280, 200), 240, dtype=np.uint8)
+    page[20:60, 10:120] = 10
+    noisy = np.clip(page.astype(int) + rng.integers(-20, 20, page.shape), 0, 255).astype(np.uint8)
+    other = np.full((280, 200), 240, dtype=np.uint8)
+    other[200:260, 100:190] = 10
+
+    assert hamming(phash_gray(page), phash_gray(noisy)) <= dedupe_mod.PHASH_MAX_DISTANCE
+    assert hamming(phash_gray(page), phash_gray(other)) > dedupe_mod.PHASH_MAX_DISTANCE
+
+    shifted = np.roll(page, 1, axis=1)
+    assert ink_matches(gray_signature(page), gray_signature(shifted))
+    assert not ink_matches(gray_signature(page), gray_signature(other))
+
+
+def _make_text_pages(path: Path, n: int) -> Path:
+    rng = random.Random(0)
+    words = ["access", "review", "role", "entitlement", "owner", "approval", "system", "manager", "audit"]
+    doc = fitz.open()
+    for _ in range(n):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36), " ".join(rng.choice(words) for _ in range(900)), fontsize=9)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_different_text_pages_are_not_deduped(tmp_path: Path, monkeypatch, fake_pytesseract):
+    calls = []
+
+    def image_to_string(img, lang="eng"):
+        calls.append(img.size)
+        return f"text {len(calls)}"
+
+    fake_pytesseract(image_to_string)
+    monkeypatch.setattr(dedupe_mod, "_run_index", {})
+    pdf = _make_text_pages(tmp_path / "Chapter1.pdf", 2)
+
+    doc = fitz.open(str(pdf))
+    a, b = page_signature(doc, 0), page_signature(doc, 1)
+    doc.close()
+    assert not ink_matches(a, b)
+
+    pages, meta = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=72, pages=[0, 1], dedupe=True)
+    assert len(calls) == 2
+    assert pages[0] != pages[1]
+    assert meta["ocr_dedupe_hits"] == 0
+
+
+def test_duplicate_pages_reuse_text_within_run_and_from_cache(tmp_path: Path, monkeypatch, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract)
+    monkeypatch.setattr(dedupe_mod, "_run_index", {})
+    cache = tmp_path / "cache"
+    a = _make(tmp_path / "Chapter2.pdf", ["form", "letter", "form"])
+    b = _make(tmp_path / "Chapter2-new.pdf", ["letter", "form"])
+
+    pages_a, meta_a = ocr_pdf_pages_best_effort(a, cache, dpi=72, pages=[0, 1, 2], dedupe=True)
+    assert pages_a == {0: "form text", 1: "letter text", 2: "form text"}
+    assert sorted(calls) == ["form", "letter"]
+    assert meta_a["ocr_dedupe_hits"] == 1
+    assert meta_a["ocr_dedupe"]["pages"][0]["source"] == "page 0"
+
+    pages_b, meta_b = ocr_pdf_pages_best_effort(b, cache, dpi=72, pages=[0, 1], dedupe=True)
+    assert pages_b == {0: "letter text", 1: "form text"}
+    assert len(calls) == 2
+    assert meta_b["ocr_dedupe_hits"] == 2
+    assert {p["source"] for p in meta_b["ocr_dedupe"]["pages"]} == {"run"}
+    # The in-process index keeps hashes and record names, not ink masks or text
+    [run] = dedupe_mod._run_index.values()
+    assert len(run) == 2 and all(type(h) is int and name.endswith(".rec") for name, h in run.items())
+
+    # A later process only has the on-disk index
+    monkeypatch.setattr(dedupe_mod, "_run_index", {})
+    c = _make(tmp_path / "Chapter2-3.pdf", ["letter"])
+    pages_c, meta_c = ocr_pdf_pages_best_effort(c, cache, dpi=72, pages=[0], dedupe=True)
+    assert pages_c == {0: "letter text"}
+    assert len(calls) == 2
+    assert meta_c["ocr_dedupe"]["pages"][0]["source"] == "cache"
+
+    # Reused text is never written to the per-page OCR cache: only the two pages tesseract read
+    assert len(list((cache / "pages").rglob("*.txt"))) == 2
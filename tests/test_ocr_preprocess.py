@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz
+import numpy as np
+
+from daisy.ocr import ocr_pdf_pages_best_effort
+from daisy.ocr_preprocess import PreprocessConfig, estimate_skew, pixmap_gray_view, render_preprocessed
+
+
+def _make_scan(path: Path, skew_deg: float = 0.0) -> Path:
+    # Page 0: 30 lines of text, rotated by skew_deg around the line start; page 1: blank
+    doc = fitz.open()
+    page = doc.new_page()
+    for k in range(30):
+        y = 80 + 20 * k
+        page.insert_text((60, y), "The quick brown fox jumps over the lazy dog " * 2, fontsize=10,
+                         morph=(fitz.Point(60, y), fitz.Matrix(-skew_deg)))
+    doc.new_page()
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_gray_view_shares_the_pixmap_buffer(tmp_path: Path):
+    doc = fitz.open(str(_make_scan(tmp_path / "scan.pdf")))
+    pix = doc[0].get_pixmap(dpi=72, colorspace=fitz.csGRAY, alpha=False)
+    view = pixmap_gray_view(pix)
+    assert view.shape == (pix.height, pix.width)
+    assert np.shares_memory(view, np.frombuffer(pix.samples_mv, dtype=np.uint8))
+
+
+def test_skewed_page_is_levelled_cropped_and_binarized(tmp_path: Path):
+    doc = fitz.open(str(_make_scan(tmp_path / "scan.pdf", skew_deg=3)))
+    cfg = PreprocessConfig()
+
+    img, info = render_preprocessed(doc, 0, 150, cfg)
+
+    assert img.mode == "1"
+    assert abs(info["skew_deg"] - 3) <= cfg.skew_step_deg
+    assert estimate_skew(~np.asarray(img)) == 0.0
+    assert info["pixels_out"] < 0.7 * info["pixels_in"]
+
+    blank, info = render_preprocessed(doc, 1, 150, cfg)
+    assert blank is None and info["blank"] is True
+
+
+def test_preprocessed_pages_are_cached_apart_and_timed(tmp_path: Path, fake_pytesseract):
+    seen = []
+
+    def image_to_string(img, lang="eng"):
+        seen.append(img.mode)
+        return "text"
+
+    fake_pytesseract(image_to_string)
+    pdf = _make_scan(tmp_path / "scan.pdf")
+
+    pages, meta = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=100, pages=[0, 1], preprocess=PreprocessConfig())
+
+    assert seen == ["1"]  # the blank page never reaches tesseract
+    assert pages == {0: "text", 1: ""}
+    assert meta["ocr_preprocess"]["blank_pages"] == [1]
+    assert all("preprocess_sec" in t for t in meta["ocr_page_timings"])
+
+    _, plain = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=100, pages=[0, 1])
+    assert plain["ocr_cache_hit"] is False
+    _, again = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=100, pages=[0, 1], preprocess=PreprocessConfig())
+    assert again["ocr_cache_hit"] is True
+    _, other = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=100, pages=[0, 1], preprocess=PreprocessConfig(offset=20))
+    assert other["ocr_cache_hit"] is False
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import sys
+import types
+from pathlib import Path
+
+import fitz
+
+from daisy.agent import validate
+from daisy.ocr import ocr_pdf_pages_best_effort
+from daisy.ocr_regions import REGION_FIELDS, _label_block, _words_from_text_layer
+
+LABELS = [
+    "CMS Product ID",
+    "IT Asset ID",
+    "IT Asset Name",
+    "Application is",
+    "SoD relevant?",
+    "Is Application a",
+    "critical and",
+    "important function?",
+]
+
+
+def _make_form(path: Path) -> Path:
+    # Labels in the text layer, values missing (e.g. handwritten / scanned in)
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 80
+    for label in LABELS:
+        page.insert_text((50, y), label, fontsize=10)
+        y += 14 if label in {"Application is", "Is Application a", "critical and"} else 40
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _fake_tesseract(fake_pytesseract) -> list:
+    calls = []
+
+    def image_to_string(img, lang="eng", config=""):
+        calls.append((config, img.width * img.height))
+        if "0123456789" in config:
+            return "1513344\n"
+        if "YESNO" in config:
+            return "Y"
+        return "AID551"
+
+    fake_pytesseract(image_to_string)
+    return calls
+
+
+def test_label_blocks_follow_stacked_labels(tmp_path: Path):
+    doc = fitz.open(str(_make_form(tmp_path / "dac.pdf")))
+    words = _words_from_text_layer(doc[0])
+    blocks = {f.name: _label_block(words, f) for f in REGION_FIELDS}
+
+    sod_block, line_h = blocks["sod"]
+    assert sod_block.height > 1.5 * line_h  # "Application is" + "SoD relevant?"
+    assert blocks["cif"][0].height > 2.5 * line_h
+    assert blocks["fa"] is None
+
+
+def test_region_mode_ocrs_only_label_clips(tmp_path: Path, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract)
+    pdf = _make_form(tmp_path / "dac.pdf")
+
+    pages, meta = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=200, pages=[0], mode="region")
+
+    assert pages[0].splitlines()[:2] == ["CMS Product ID", "1513344"]
+    assert "Application is\nSoD relevant?\nY" in pages[0]
+    region = meta["ocr_region"]
+    assert region["pages"][0]["anchor_source"] == "text_layer"
+    assert set(region["pages"][0]["fields"]) == {"cms_id", "it_asset_id", "it_asset_name", "sod", "cif"}
+    assert region["pixel_ratio"] < 0.2
+    assert all(cfg.startswith("--psm 7") for cfg, _ in calls)
+
+    # region results are cached apart from full-page OCR
+    _, meta_page = ocr_pdf_pages_best_effort(pdf, tmp_path / "cache", dpi=200, pages=[0])
+    assert meta_page["ocr_cache_hit"] is False
+
+
+def test_validate_region_mode_fills_dac_fields(tmp_path: Path, fake_pytesseract):
+    _fake_tesseract(fake_pytesseract)
+    dac = _make_form(tmp_path / "dac.pdf")
+
+    res = validate(
+        dac, tmp_path, out_dir=tmp_path / "out", lenient=True, mvp=True,
+        rules_path=Path("config/rules.yaml"), ocr=True, ocr_pages=[0], ocr_mode="region",
+    )
+    values = {c.check_id: c.evidence.get("value") for s in res.sections for c in s.checks}
+    assert values["S1.1-01"] == "1513344"
+    assert values["S4.2-01"] == "yes"
+
+
+def test_image_page_anchors_come_from_low_dpi_pass(tmp_path: Path, fake_pytesseract):
+    calls = _fake_tesseract(fake_pytesseract)
+    seen_dpi_width = []
+
+    def image_to_data(img, lang="eng", output_type=None):
+        seen_dpi_width.append(img.width)
+        # "CMS Product ID" at (50, 70)-(130, 80) pt, scaled to the 100 DPI anchor pass
+        k = 100 / 72
+        words = [("CMS", 50, 27), ("Product", 80, 38), ("ID", 120, 12)]
+        return {
+            "text": [w for w, _, _ in words],
+            "left": [int(x * k) for _, x, _ in words],
+            "top": [int(70 * k)] * 3,
+            "width": [int(w * k) for _, _, w in words],
+            "height": [int(10 * k)] * 3,
+            "block_num": [1] * 3,
+            "par_num": [1] * 3,
+            "line_num": [1] * 3,
+        }
+
+    sys.modules["pytesseract"].image_to_data = image_to_data
+    sys.modules["pytesseract"].Output = types.SimpleNamespace(DICT="dict")
+
+    doc = fitz.open()
+    doc.new_page()  # no text layer
+    doc.save(str(tmp_path / "scan.pdf"))
+
+    pages, meta = ocr_pdf_pages_best_effort(tmp_path / "scan.pdf", tmp_path / "cache", dpi=300, pages=[0], mode="region")
+
+    assert abs(seen_dpi_width[0] - 595 * 100 / 72) < 2
+    assert pages[0] == "CMS Product ID\n1513344"
+    assert meta["ocr_region"]["pages"][0]["anchor_source"] == "low_dpi_ocr"
+    assert len(calls) == 1
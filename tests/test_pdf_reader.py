@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import fitz
+
+from daisy.pdf_reader import (
+    PdfDoc,
+    classify_probe_pages,
+    find_referenced_xlsx_filenames,
+    probe_pdf,
+    scan_referenced_xlsx_filenames,
+)
+from daisy.agent import _PdfOverlayView
+
+
+def _make_pdf(path: Path, pages) -> Path:
+    doc = fitz.open()
+    for t in pages:
+        p = doc.new_page()
+        if t:
+            p.insert_text((50, 72), t, fontsize=10)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_page_store_extracts_each_page_once(tmp_path: Path):
+    pdf = PdfDoc(_make_pdf(tmp_path / "a.pdf", ["CMS Product ID\n1513344", "IT Asset ID\nAID551", ""]))
+
+    pdf.all_text()
+    assert pdf.find_pages_containing("cms product id", True) == [0]
+    assert pdf.find_pages_containing("IT Asset", False) == [1]
+    assert pdf.page_lines(0)[:2] == ["CMS Product ID", "1513344"]
+
+    st = pdf.store_stats()
+    assert st["page_extract_calls"] == 3
+    assert st["pages_extracted"] == 3
+    assert st["page_store_hits"] > 0
+
+
+def test_overlay_reads_from_store_and_fills_empty_pages(tmp_path: Path):
+    pdf = PdfDoc(_make_pdf(tmp_path / "b.pdf", ["Chapter one", ""]))
+    view = _PdfOverlayView(pdf, {1: "IT Asset Name\n\nOFFICE 365\n"})
+
+    assert view.page_lines(1) == ["IT Asset Name", "OFFICE 365"]
+    assert view.find_pages_containing("office 365") == [1]
+    assert view.all_text() == "Chapter one\nIT Asset Name\nOFFICE 365"
+    assert pdf.stats["page_extract_calls"] == 2
+
+
+def test_find_pages_containing_any_matches_single_needle_scans(tmp_path: Path):
+    pdf = PdfDoc(_make_pdf(tmp_path / "c.pdf", [
+        "Application is\nSoD relevant?\ny",
+        "Is Application a\ncritical and\nimportant function?",
+        "Functional Area relevant?",
+    ]))
+    needles = ["Application is", "application", "important", "Functional Area", "missing label", ""]
+
+    hits = pdf.find_pages_containing_any(needles, True)
+    for n in needles[:-1]:
+        assert hits[n] == pdf.find_pages_containing(n, True)
+    assert hits[""] == []
+    assert pdf.find_pages_containing_any(["application"], False) == {"application": []}
+
+    view = _PdfOverlayView(pdf, {})
+    assert view.find_pages_containing_any(needles[:-1]) == {n: hits[n] for n in needles[:-1]}
+
+
+def test_referenced_xlsx_quoted_first_then_fallback():
+    t = 'Exports: APP_All my Roles.xlsx, see ("APP_Entitlement\n  Services.xlsx") and ("dir/APP_IT Role Services.xlsx")'
+    assert find_referenced_xlsx_filenames(t) == [
+        "APP_Entitlement Services.xlsx",
+        "APP_IT Role Services.xlsx",
+        "APP_All my Roles.xlsx",
+    ]
+    assert find_referenced_xlsx_filenames("ab.xlsx x.xlsx") == ["ab.xlsx x.xlsx"]
+    assert find_referenced_xlsx_filenames("(a.xlsx)") == []
+
+
+def test_referenced_xlsx_streaming_finds_names_wrapped_across_pages():
+    pages = ["intro text\nAPP_All", "  Entitlements.xlsx\nmore", ""]
+    assert scan_referenced_xlsx_filenames(pages) == find_referenced_xlsx_filenames("\n".join(pages))
+    assert scan_referenced_xlsx_filenames(pages) == ["intro text APP_All Entitlements.xlsx"]
+
+
+def test_parallel_extraction_is_identical_to_serial(tmp_path: Path, monkeypatch):
+    import daisy.pdf_reader as pdf_reader
+
+    monkeypatch.setattr(pdf_reader, "PARALLEL_MIN_PAGES", 4)
+    path = _make_pdf(tmp_path / "big.pdf", [f"Page {i}\nIT Asset ID  \nAID{i}" if i % 3 else "" for i in range(9)])
+
+    serial = PdfDoc(path)
+    parallel = PdfDoc(path, workers=3)
+
+    assert parallel.all_text() == serial.all_text()
+    assert [parallel.page_lines(i) for i in range(9)] == [serial.page_lines(i) for i in range(9)]
+    assert [t["pages"] for t in parallel.worker_timings] == [[0, 3], [3, 6], [6, 9]]
+    assert serial.worker_timings == []
+
+
+def _make_scanned_pdf(path: Path, n_pages: int) -> Path:
+    src = fitz.open()
+    src.new_page().insert_text((50, 72), "scanned chapter", fontsize=10)
+    pix = src[0].get_pixmap(dpi=36)
+    doc = fitz.open()
+    for _ in range(n_pages):
+        p = doc.new_page()
+        p.insert_image(p.rect, pixmap=pix)
+    doc.save(str(path))
+    return path
+
+
+def test_probe_stops_once_min_text_chars_is_reached(tmp_path: Path):
+    path = _make_pdf(tmp_path / "text.pdf", ["Chapter text\n" * 30] * 20)
+    probe = probe_pdf(path, min_text_chars=200)
+    assert probe.page_count == 20
+    assert probe.complete is False
+    assert len(probe.pages) == 1
+    assert 200 <= probe.text_chars < len(PdfDoc(path).all_text().strip())
+
+    full = probe_pdf(path, min_text_chars=10**9)
+    assert full.complete is True and len(full.pages) == 20
+    assert full.text_chars == len(PdfDoc(path).all_text().strip())
+
+
+def test_probe_scanned_pdf_counts_image_references_per_page(tmp_path: Path):
+    path = _make_scanned_pdf(tmp_path / "scan.pdf", 3)
+    probe = probe_pdf(path, min_text_chars=200)
+    assert probe.complete is True
+    assert probe.text_chars == 0
+    assert [p["image_count"] for p in probe.pages] == [1, 1, 1]
+    assert probe.image_count == 3
+
+
+def test_text_pdf_evidence_reports_the_partial_probe_counts(tmp_path: Path):
+    from daisy.agent import _pdf_text_and_ocr_meta
+
+    logo = fitz.open()
+    logo.new_page().insert_text((50, 72), "logo", fontsize=10)
+    pix = logo[0].get_pixmap(dpi=36)
+    doc = fitz.open()
+    for k in range(3):
+        p = doc.new_page()
+        p.insert_text((50, 72), f"Provisioning of access, step {k}\n" * 25, fontsize=8)
+        p.insert_image(fitz.Rect(400, 700, 500, 780), pixmap=pix)  # same image on every page
+    doc.save(str(tmp_path / "text.pdf"))
+    first_page = len(doc[0].get_text().strip())
+
+    ok, meta = _pdf_text_and_ocr_meta(
+        tmp_path / "text.pdf", 200, 1,
+        ocr=False, ocr_cache_dir=tmp_path / "ocr", tesseract_cmd=None, ocr_lang="eng", ocr_dpi=200, ocr_max_pages=2,
+    )
+    assert ok is True
+    # The probe stops after page 0: its text only, and distinct xref images
+    assert meta == {
+        "page_count": 3,
+        "text_chars": first_page,
+        "image_count": 1,
+        "text_chars_complete": False,
+        "ocr_enabled": False,
+        "ocr_required": False,
+        "ocr_available": False,
+        "ocr_attempted": False,
+    }
+
+
+def test_classify_probe_pages_picks_image_only_pages(tmp_path: Path):
+    scan = fitz.open(str(_make_scanned_pdf(tmp_path / "scan.pdf", 1)))
+    doc = fitz.open()
+    doc.new_page().insert_text((50, 72), "A page with a real text layer", fontsize=10)
+    doc.insert_pdf(scan)
+    doc.new_page()
+    doc.save(str(tmp_path / "mixed.pdf"))
+
+    probe = probe_pdf(tmp_path / "mixed.pdf", min_text_chars=200)
+    assert probe.pages[1]["image_coverage"] > 0.9
+    assert classify_probe_pages(probe) == {"text": [0], "image_only": [1], "blank": [2]}
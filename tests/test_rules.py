@@ -13,3 +13,32 @@ def test_load_rules_from_config():
     r = load_rules(Path("config/rules.yaml"))
     assert "Chapter1.pdf" in r.pdf_evidence.required_files
     assert isinstance(r.pdf_evidence.min_text_chars, int)
+
+
+def test_excel_checks_defaults_and_yaml_overrides(tmp_path: Path):
+    r = load_rules(Path("config/rules.yaml"))
+    es = r.excel_checks["Entitlement Services.xlsx"]
+    assert [c.id for c in es.checks] == ["S4.1-EX-01", "S4.1-EX-02"]
+    assert es.columns == ["Display name", "Description", "SoD Area", "Tier Level"]
+    itrs = r.excel_checks["IT Role Services.xlsx"].checks[0]
+    assert itrs.required == ["Display name", "Description", "Tier Level"] and itrs.missing_columns == "not_met"
+
+    p = tmp_path / "rules.yaml"
+    p.write_text(
+        """
+excel_thresholds:
+  tier_values: {ratio_tol: 0.0, abs_tol: 0, severity: minor}
+excel_checks:
+  "IT Role Services.xlsx": []
+  "Entitlement Services.xlsx":
+    - {id: T-1, name: Tier known, type: allowed_values, column: Tier Level, values: [1, 2, " 3 "], threshold: tier_values}
+    - {id: T-2, type: regex, columns: [SoD Area], pattern: "SOD[0-9]+(", threshold: tier_values}
+    - {id: T-3, type: bogus, columns: [SoD Area]}
+""",
+        encoding="utf-8",
+    )
+    r = load_rules(p)
+    assert r.excel_checks["IT Role Services.xlsx"].checks == []
+    (t1,) = r.excel_checks["Entitlement Services.xlsx"].checks  # bad regex and unknown type skipped
+    assert (t1.values, t1.threshold, r.excel_thresholds["tier_values"].severity) == (["1", "2", "3"], "tier_values", "minor")
+    assert r.itroles_required.abs_tol == 5
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from daisy.excel_checks import read_excel_columns, read_excel_first_sheet
+from daisy.workbook_cache import WorkbookCache
+
+
+def _write_xlsx(p: Path, rows: int) -> None:
+    pd.DataFrame(
+        {"Display name": [f"E{i}" for i in range(rows)], "Description": ["Grants read access"] * rows}
+    ).to_excel(p, index=False, engine="openpyxl")
+
+
+def test_workbook_parsed_once_per_run_and_reused_from_sidecar(tmp_path: Path):
+    x = tmp_path / "Entitlement Services.xlsx"
+    _write_xlsx(x, 3)
+    sidecar = tmp_path / "xlsx"
+
+    wb = WorkbookCache(sidecar)
+    df = wb.read(x)
+    assert wb.read(x) is df
+    assert list(df["Display name"]) == ["E0", "E1", "E2"]
+    st = wb.stats_dict()
+    assert (st["parsed"], st["hits"], st["sidecar_hits"], st["sidecar_writes"]) == (1, 1, 0, 1)
+    assert st["files"][x.name]["source"] == "parse"
+    assert st["files"][x.name]["hits"] == 1
+
+    # next run: unchanged export comes from the sidecar, no openpyxl parse
+    def no_parse(*a) -> pd.DataFrame:
+        raise AssertionError("parsed again")
+
+    wb2 = WorkbookCache(sidecar, loader=no_parse, column_loader=no_parse)
+    pd.testing.assert_frame_equal(wb2.read(x), df)
+    assert wb2.stats_dict()["files"][x.name]["source"] == "sidecar"
+
+    # changed export (new size/mtime) is parsed again
+    _write_xlsx(x, 5)
+    os.utime(x, ns=(1, 1))
+    wb3 = WorkbookCache(sidecar)
+    assert len(wb3.read(x)) == 5
+    assert wb3.stats["parsed"] == 1
+
+
+def test_corrupt_sidecar_falls_back_to_parse(tmp_path: Path):
+    x = tmp_path / "All Entitlements.xlsx"
+    _write_xlsx(x, 2)
+    sidecar = tmp_path / "xlsx"
+    WorkbookCache(sidecar).read(x)
+    (entry,) = sidecar.glob("*.json")
+    entry.write_bytes(entry.read_bytes()[:-4])
+
+    wb = WorkbookCache(sidecar)
+    assert len(wb.read(x)) == 2
+    assert wb.stats["parsed"] == 1 and wb.stats["sidecar_hits"] == 0
+
+
+def test_projected_load_matches_full_sheet(tmp_path: Path):
+    from openpyxl import Workbook
+
+    x = tmp_path / "IT Role Services.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Display name", "Other", "Description", "Tier Level", "Display name", "IT Role Owner"])
+    ws.append(["R1", "x", "N/A", 1, "dup", None])
+    ws.append([None, None, None, None, None, None])
+    ws.append(["R2", None, "00123", 2.0, None, "owner"])
+    ws.append([None, "only a column we do not load"])
+    ws.append([None, None])  # trailing empty row
+    wb.save(x)
+
+    cols = ["Display name", "Description", "Tier Level", "IT Role Owner", "cust_owner"]
+    full = read_excel_first_sheet(x)
+    proj = read_excel_columns(x, cols)
+    assert list(proj.columns) == ["Display name", "Description", "Tier Level", "IT Role Owner"]
+    pd.testing.assert_frame_equal(proj, full[list(proj.columns)], check_column_type=False)
+    assert len(read_excel_columns(x, ["nope"])) == len(full) == 4
+
+    cache = WorkbookCache()
+    cache.read(x, columns=cols)
+    info = cache.stats_dict()["files"][x.name]
+    assert info["columns"] == 4 and info["columns_requested"] == cols
+    assert info["peak_rss_mb"] is None or info["peak_rss_mb"] > 0
+    assert info["peak_rss_growth_mb"] is None or info["peak_rss_growth_mb"] >= 0
+
+
+def test_compact_load_keeps_values_and_findings(tmp_path: Path):
+    from openpyxl import Workbook
+
+    from daisy.excel_checks import evaluate_check_plan, non_empty_series
+    from daisy.rules import load_rules
+
+    x = tmp_path / "Entitlement Services.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Display name", "Description", "SoD Area", "Tier Level", "Mixed"])
+    for i in range(40):
+        ws.append([f"E{i}", "tbd" if i % 9 == 0 else "Grants read access", ["SOD1", " ", None, "NA"][i % 4], i % 3 or None, [1, "1", True, "x"][i % 4]])
+    wb.save(x)
+
+    plan = load_rules(None).excel_checks["Entitlement Services.xlsx"]
+    cols = plan.columns + ["Mixed"]
+    plain = read_excel_columns(x, cols)
+    compact = read_excel_columns(x, cols, compact=True)
+    assert [c for c in compact.columns if isinstance(compact[c].dtype, pd.CategoricalDtype)] == ["Description", "SoD Area"]
+    assert compact["Mixed"].tolist() == plain["Mixed"].tolist()  # 1 == True: not categorical
+    pd.testing.assert_frame_equal(
+        compact.astype({"Description": object, "SoD Area": object}),
+        plain.astype({"Description": object, "SoD Area": object}),
+        check_column_type=False,
+    )
+    for c in cols:
+        assert non_empty_series(compact[c]).tolist() == non_empty_series(plain[c]).tolist()
+    got, want = evaluate_check_plan(plan, compact), evaluate_check_plan(plan, plain)
+    assert {k: (f.failing_rows, str(f.sample_rows)) for k, f in got.items()} == {
+        k: (f.failing_rows, str(f.sample_rows)) for k, f in want.items()
+    }
+
+    cache = WorkbookCache(tmp_path / "xlsx", compact=True)
+    assert isinstance(cache.read(x, columns=cols)["SoD Area"].dtype, pd.CategoricalDtype)
+    assert cache.stats_dict()["compact"] is True
+
+
+def test_sidecar_is_json_and_round_trips_dtypes(tmp_path: Path):
+    import datetime as dt
+    import json
+
+    from openpyxl import Workbook
+
+    from daisy.cache_store import decode_record_bytes
+
+    x = tmp_path / "Entitlement Services.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Display name", "Description", "Tier Level", "Score", "Created", "Mixed", 2024])
+    for i in range(12):
+        ws.append([f"E{i}", "tbd" if i % 5 == 0 else None, i % 3, 0.5 * i if i % 4 else None,
+                   dt.datetime(2024, 1, 1 + i, 8, 30), [1, "1", True, dt.date(2024, 2, 1)][i % 4], "x"])
+    wb.save(x)
+
+    for compact in (False, True):
+        sidecar = tmp_path / f"xlsx{int(compact)}"
+        cols = ["Display name", "Description", "Tier Level", "Score", "Created", "Mixed"]
+        for columns in (None, cols):
+            df = WorkbookCache(sidecar, compact=compact).read(x, columns=columns)
+            again = WorkbookCache(sidecar, compact=compact)
+            pd.testing.assert_frame_equal(again.read(x, columns=columns), df)
+            assert again.stats["sidecar_hits"] == 1
+        for entry in sidecar.glob("*"):
+            assert entry.suffix == ".json"
+            json.loads(decode_record_bytes(entry.read_bytes())[0])